@@ -0,0 +1,6 @@
+"""Headless benchmarks of the helpers, run against :mod:`benchmarks.stub`.
+
+Run them from the root of the repository, for instance::
+
+    python -m benchmarks.draw --nodes 100 --frames 20 --output draw.json
+"""
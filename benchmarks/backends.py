@@ -0,0 +1,167 @@
+"""Benchmark of the viewport 2.0 backends of the helpers.
+
+Draws ``--nodes`` helpers of each type with both backends, over ``--frames``
+frames with idle and animated inputs, and writes the results as JSON:
+
+- ``frame_ms``: mean time spent in the overrides per frame, for all helpers
+- ``uploaded_bytes``: mean bytes sent to the GPU per frame, through the draw
+  manager or through vertex and index buffers
+
+Like viewport 2.0, both backends only update the helpers dirtied since the
+previous frame, the draw override being created not always dirty. The field
+helpers have ``--field-size`` items, run them alone with ``--helper``, eg
+``--helper vector_field_helper --nodes 1 --field-size 10000`` for a single
+field of ten thousand arrows.
+"""
+from __future__ import division, print_function
+
+import argparse
+import importlib
+import json
+import platform
+import sys
+import timeit
+
+from benchmarks import draw, stub
+
+import maya.api.OpenMaya as om  # noqa: E402
+import maya.api.OpenMayaRender as omr  # noqa: E402
+from mrh.plugins import DRAW_OVERRIDE, GEOMETRY_OVERRIDE  # noqa: E402
+
+
+class BackendScene(object):
+    """Nodes of one helper type with the overrides of a backend.
+
+    Args:
+        helper(tuple): entry of draw.HELPERS
+        nodes(int): number of nodes to create
+        backend(str): DRAW_OVERRIDE or GEOMETRY_OVERRIDE
+        field_size(int): number of items of the field helpers
+    """
+
+    def __init__(self, helper, nodes, backend, field_size=100):
+        module_name, node_name, override_name, setup, animate = helper
+        module = importlib.import_module("mrh.plugins." + module_name)
+        self.node = getattr(module, node_name)
+        self.node.initialize()
+        if backend == GEOMETRY_OVERRIDE:
+            override_name = override_name.replace("Draw", "Geometry")
+        override_class = getattr(module, override_name)
+
+        self.name = self.node.TYPE_NAME
+        self.backend = backend
+        self.field = "Field" in node_name
+        self.field_size = field_size
+        self._animate = animate
+
+        self.frame_context = omr.MFrameContext()
+        self.draw_manager = omr.MUIDrawManager()
+        self.requirements = omr.MGeometryRequirements()
+        self.helpers = []
+        for index in range(nodes):
+            obj = stub.create_node(self.node)
+            self._call(setup, obj, index)
+            override = override_class.creator(obj)
+            state = None if backend == DRAW_OVERRIDE else omr.MRenderItemList()
+            self.helpers.append([obj, om.MDagPath(obj), override, state])
+        omr.MRenderer.dirty.clear()
+
+    def _call(self, function, *args):
+        if self.field:
+            args += (self.field_size,)
+        return function(self.node, *args)
+
+    def animate(self, frame):
+        for index, helper in enumerate(self.helpers):
+            self._call(self._animate, helper[0], index, frame)
+
+    def draw(self, everything=False):
+        """Update the dirty helpers, or all of them."""
+        dirty = omr.MRenderer.dirty
+        for helper in self.helpers:
+            obj, path, override, state = helper
+            if not dirty.pop(id(obj), everything):
+                continue
+            if self.backend == DRAW_OVERRIDE:
+                state = override.prepareForDraw(path, None, self.frame_context, state)
+                override.addUIDrawables(
+                    path, self.draw_manager, self.frame_context, state
+                )
+                helper[3] = state
+            else:
+                override.updateDG()
+                override.updateRenderItems(path, state)
+                geometry = omr.MGeometryData()
+                override.populateGeometry(self.requirements, state, geometry)
+                if override.hasUIDrawables():
+                    override.addUIDrawables(
+                        path, self.draw_manager, self.frame_context
+                    )
+        dirty.clear()
+
+
+def run_scene(scene, frames, animated):
+    """Return the measures of drawing a scene over a number of frames."""
+    scene.draw(everything=True)
+
+    total = 0.0
+    stub.reset_counters()
+    for frame in range(1, frames + 1):
+        if animated:
+            scene.animate(frame)
+        total += timeit.timeit(scene.draw, number=1)
+    return {
+        "frame_ms": total / frames * 1e3,
+        "uploaded_bytes": omr.draw_calls["bytes"] / frames,
+    }
+
+
+def run(nodes=2000, frames=10, field_size=100, helpers=None):
+    """Run the benchmark and return its results as a dictionary.
+
+    Args:
+        nodes(int): number of nodes of each helper type
+        frames(int): number of frames drawn
+        field_size(int): number of items of the field helpers
+        helpers(list of str): module names of the helpers to run, like
+            "angle_helper", all of them by default
+    """
+    results = {
+        "nodes": nodes,
+        "frames": frames,
+        "field_size": field_size,
+        "python": platform.python_version(),
+        "helpers": {},
+    }
+    for helper in draw.HELPERS:
+        if helpers and helper[0] not in helpers:
+            continue
+        for backend in (DRAW_OVERRIDE, GEOMETRY_OVERRIDE):
+            scene = BackendScene(helper, nodes, backend, field_size)
+            results["helpers"].setdefault(scene.name, {})[backend] = {
+                "idle": run_scene(scene, frames, animated=False),
+                "animated": run_scene(scene, frames, animated=True),
+            }
+    return results
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--nodes", type=int, default=2000)
+    parser.add_argument("--frames", type=int, default=10)
+    parser.add_argument("--field-size", type=int, default=100)
+    parser.add_argument("--helper", action="append", dest="helpers")
+    parser.add_argument("--output", help="file to write to instead of stdout")
+    args = parser.parse_args(args)
+
+    results = run(args.nodes, args.frames, args.field_size, args.helpers)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
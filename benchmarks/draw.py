@@ -0,0 +1,359 @@
+"""Benchmark of the draw overrides of the helpers.
+
+Every helper type is drawn for ``--nodes`` nodes over ``--frames`` frames, once
+with idle inputs and once with an input changing every frame, and the results
+are written as JSON:
+
+- ``frame_ms``: mean time spent in the overrides per frame, for all helpers
+- ``prepare_us`` and ``draw_us``: mean time of prepareForDraw and
+  addUIDrawables per helper and per frame, in microseconds
+- ``plug_calls`` and ``vertices``: plug API calls and vertices drawn per helper
+  and per frame
+- ``retained_bytes`` and ``retained_blocks``: memory allocated while drawing
+  a frame and still held after it, per helper and per frame, as traced by
+  tracemalloc
+- ``peak_bytes``: peak of the memory allocated while drawing a frame
+- ``max_rss_kb``: peak resident memory of the whole process
+- ``profile``: stats of :mod:`mrh.profiling`, with ``--profile`` only
+
+Like viewport 2.0, only the helpers dirtied since the previous frame are
+prepared and drawn, unless their override is always dirty. With
+``--always-dirty`` every helper is rebuilt from scratch every frame instead,
+as when the overrides were always dirty, to compare the idle frame times.
+With ``--evaluation-manager`` the inputs dirty the helpers through
+preEvaluation rather than setDependentsDirty.
+
+The times include the overhead of the stand-in of the Maya API, they are only
+meant to be compared between runs on the same machine.
+"""
+from __future__ import division, print_function
+
+import argparse
+import importlib
+import json
+import math
+import platform
+import sys
+import timeit
+import tracemalloc
+
+from benchmarks import stub
+
+stub.install()
+
+import maya.api.OpenMaya as om  # noqa: E402
+import maya.api.OpenMayaRender as omr  # noqa: E402
+import numpy as np  # noqa: E402
+from mrh import profiling  # noqa: E402
+from mrh.plugins import watch_draw_override  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # windows
+    resource = None
+
+
+def _setup_angle(node, obj, index):
+    stub.set_value(obj, node.radius1, 0.2 + index % 3)
+    stub.set_value(obj, node.radius2, 1.0 + index % 5)
+    stub.set_value(obj, node.angle2, math.radians(45 + index % 90))
+
+
+def _animate_angle(node, obj, index, frame):
+    stub.set_value(obj, node.angle2, math.radians(45 + (index + frame) % 90))
+
+
+def _setup_aimed(node, obj, index):
+    stub.set_value(obj, node.origin, (index, 0.0, 0.0))
+    stub.set_value(obj, node.target, (index, 1.0 + index % 3, 0.5))
+    if hasattr(node, "angle"):
+        stub.set_value(obj, node.angle, math.radians(30 + index % 30))
+
+
+def _animate_aimed(node, obj, index, frame):
+    stub.set_value(obj, node.target, (index, 1.0, 0.5 + frame * 0.1))
+
+
+def _field_points(index, count, offset=0.0):
+    points = np.zeros((count, 3))
+    points[:, 0] = np.arange(count) + index * count
+    points[:, 1] = offset
+    return points
+
+
+def _setup_aimed_field(node, obj, index, count):
+    stub.set_value(obj, node.origins, stub.point_array(_field_points(index, count)))
+    targets = _field_points(index, count, 1.0)
+    stub.set_value(obj, node.targets, stub.point_array(targets))
+    if hasattr(node, "angles"):
+        stub.set_value(obj, node.angles, stub.double_array(np.full(count, 30.0)))
+
+
+def _animate_aimed_field(node, obj, index, frame, count):
+    targets = _field_points(index, count, 1.0)
+    targets[:, 2] = frame * 0.1
+    stub.set_value(obj, node.targets, stub.point_array(targets))
+
+
+def _setup_angle_field(node, obj, index, count):
+    stub.set_value(obj, node.origins, stub.point_array(_field_points(index, count)))
+    stub.set_value(obj, node.angles2, stub.double_array(np.full(count, 90.0)))
+
+
+def _animate_angle_field(node, obj, index, frame, count):
+    angles = np.full(count, 45.0 + frame % 90)
+    stub.set_value(obj, node.angles2, stub.double_array(angles))
+
+
+#: Module, node class, draw override class, setup and animation of each helper.
+#: The setup and animation of the field helpers also take the field size.
+HELPERS = [
+    (
+        "angle_helper",
+        "AngleHelperNode",
+        "AngleHelperDrawOverride",
+        _setup_angle,
+        _animate_angle,
+    ),
+    (
+        "angle_cone_helper",
+        "AngleConeHelperNode",
+        "AngleConeHelperDrawOverride",
+        _setup_aimed,
+        _animate_aimed,
+    ),
+    (
+        "vector_helper",
+        "VectorHelperNode",
+        "VectorHelperDrawOverride",
+        _setup_aimed,
+        _animate_aimed,
+    ),
+    (
+        "vector_field_helper",
+        "VectorFieldHelperNode",
+        "VectorFieldHelperDrawOverride",
+        _setup_aimed_field,
+        _animate_aimed_field,
+    ),
+    (
+        "angle_field_helper",
+        "AngleFieldHelperNode",
+        "AngleFieldHelperDrawOverride",
+        _setup_angle_field,
+        _animate_angle_field,
+    ),
+    (
+        "angle_cone_field_helper",
+        "AngleConeFieldHelperNode",
+        "AngleConeFieldHelperDrawOverride",
+        _setup_aimed_field,
+        _animate_aimed_field,
+    ),
+]
+
+
+class Scene(object):
+    """Nodes of one helper type with their draw overrides.
+
+    Args:
+        helper(tuple): entry of HELPERS
+        nodes(int): number of nodes to create
+        field_size(int): number of items of the field helpers
+        always_dirty(bool): whether every helper is rebuilt every frame
+    """
+
+    def __init__(self, helper, nodes, field_size, always_dirty=False):
+        module_name, node_name, override_name, setup, animate = helper
+        module = importlib.import_module("mrh.plugins." + module_name)
+        self.node = getattr(module, node_name)
+        self.node.initialize()
+        override_class = getattr(module, override_name)
+        watch_draw_override(self.node.TYPE_NAME, override_class)
+
+        self.name = self.node.TYPE_NAME
+        self.field = "Field" in node_name
+        self.field_size = field_size
+        self._setup = setup
+        self._animate = animate
+        self.always_dirty = always_dirty
+
+        self.frame_context = omr.MFrameContext()
+        self.draw_manager = omr.MUIDrawManager()
+        self.helpers = []
+        for index in range(nodes):
+            obj = stub.create_node(self.node)
+            self._call(setup, obj, index)
+            override = override_class.creator(obj)
+            self.helpers.append([obj, om.MDagPath(obj), override, None, False])
+
+    def _call(self, function, *args):
+        if self.field:
+            args += (self.field_size,)
+        return function(self.node, *args)
+
+    def animate(self, frame):
+        for index, helper in enumerate(self.helpers):
+            self._call(self._animate, helper[0], index, frame)
+
+    def prepare(self, everything=False):
+        """Prepare the dirty helpers, or all of them."""
+        dirty = omr.MRenderer.dirty
+        for helper in self.helpers:
+            obj, path, override, data, _ = helper
+            helper[4] = bool(
+                everything
+                or self.always_dirty
+                or override.always_dirty
+                or dirty.pop(id(obj), 0)
+            )
+            if not helper[4]:
+                continue
+            if self.always_dirty:
+                data = None
+            helper[3] = override.prepareForDraw(path, None, self.frame_context, data)
+        dirty.clear()
+
+    def draw(self):
+        """Draw the helpers prepared for this frame."""
+        for _, path, override, data, prepared in self.helpers:
+            if prepared:
+                override.addUIDrawables(
+                    path, self.draw_manager, self.frame_context, data
+                )
+
+
+def run_scene(scene, frames, animated):
+    """Return the measures of drawing a scene over a number of frames."""
+    per_draw = 1.0 / (len(scene.helpers) * frames)
+
+    # first frame, out of the measures as everything has to be generated
+    scene.prepare(everything=True)
+    scene.draw()
+
+    prepare_time = draw_time = 0.0
+    plug_calls = 0
+    stub.reset_counters()
+    for frame in range(1, frames + 1):
+        if animated:
+            scene.animate(frame)
+        calls = sum(om.plug_calls.values())
+        prepare_time += timeit.timeit(scene.prepare, number=1)
+        draw_time += timeit.timeit(scene.draw, number=1)
+        plug_calls += sum(om.plug_calls.values()) - calls
+    vertices = omr.draw_calls["vertices"]
+
+    retained_bytes = retained_blocks = peak_bytes = 0
+    tracemalloc.start()
+    try:
+        for frame in range(frames + 1, frames * 2 + 1):
+            if animated:
+                scene.animate(frame)
+            tracemalloc.clear_traces()
+            before = tracemalloc.take_snapshot()
+            start = tracemalloc.get_traced_memory()[0]
+            scene.prepare()
+            scene.draw()
+            peak_bytes = max(peak_bytes, tracemalloc.get_traced_memory()[1] - start)
+            after = tracemalloc.take_snapshot()
+            for stat in after.compare_to(before, "filename"):
+                retained_bytes += max(stat.size_diff, 0)
+                retained_blocks += max(stat.count_diff, 0)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "frame_ms": (prepare_time + draw_time) / frames * 1e3,
+        "prepare_us": prepare_time * per_draw * 1e6,
+        "draw_us": draw_time * per_draw * 1e6,
+        "plug_calls": plug_calls * per_draw,
+        "vertices": vertices * per_draw,
+        "retained_bytes": retained_bytes * per_draw,
+        "retained_blocks": retained_blocks * per_draw,
+        "peak_bytes": peak_bytes,
+    }
+
+
+def run(
+    nodes=100,
+    frames=20,
+    field_size=100,
+    helpers=None,
+    profile=False,
+    always_dirty=False,
+    evaluation_manager=False,
+):
+    """Run the benchmark and return its results as a dictionary.
+
+    Args:
+        nodes(int): number of nodes of each helper type
+        frames(int): number of frames drawn
+        field_size(int): number of items of the field helpers
+        helpers(list of str): module names of the helpers to run, like
+            "angle_helper", all of them by default
+        profile(bool): whether to run with mrh.profiling enabled
+        always_dirty(bool): whether every helper is rebuilt every frame
+        evaluation_manager(bool): whether the helpers are dirtied as by the
+            Evaluation Manager
+    """
+    results = {
+        "nodes": nodes,
+        "frames": frames,
+        "field_size": field_size,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "always_dirty": always_dirty,
+        "evaluation_manager": evaluation_manager,
+        "helpers": {},
+    }
+    stub.evaluation_manager = evaluation_manager
+    if profile:
+        profiling.reset()
+        profiling.enable()
+    for helper in HELPERS:
+        if helpers and helper[0] not in helpers:
+            continue
+        scene = Scene(helper, nodes, field_size, always_dirty)
+        results["helpers"][scene.name] = {
+            "idle": run_scene(scene, frames, animated=False),
+            "animated": run_scene(scene, frames, animated=True),
+        }
+    if profile:
+        profiling.disable()
+        results["profile"] = profiling.report()
+    if resource is not None:
+        results["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return results
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--nodes", type=int, default=100)
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--field-size", type=int, default=100)
+    parser.add_argument("--helper", action="append", dest="helpers")
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--always-dirty", action="store_true")
+    parser.add_argument("--evaluation-manager", action="store_true")
+    parser.add_argument("--output", help="file to write to instead of stdout")
+    args = parser.parse_args(args)
+
+    results = run(
+        args.nodes,
+        args.frames,
+        args.field_size,
+        args.helpers,
+        args.profile,
+        args.always_dirty,
+        args.evaluation_manager,
+    )
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
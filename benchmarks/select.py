@@ -0,0 +1,226 @@
+"""Benchmark of the selection of the helpers.
+
+Draws ``--nodes`` helpers of each type having a draw override, at each of
+``--subdivisions``, then selects them through userSelect and writes the
+results as JSON:
+
+- ``select_us``: mean time of userSelect per helper, in microseconds
+- ``mesh_us``: mean time of testing every drawn vertex against the selection
+  region instead, for comparison, which also misses the clicks between them
+- ``selected``: number of helpers selected
+
+Each helper is selected by a click on its center, by a click on an empty
+corner of the viewport, and by a marquee over the whole viewport. The
+marquee is also made over helpers left with their default inputs, which
+flatten the aimed helpers to a point as their target is on their origin.
+"""
+from __future__ import division, print_function
+
+import argparse
+import importlib
+import json
+import platform
+import sys
+import timeit
+
+from benchmarks import draw, stub
+
+stub.install()
+
+import maya.api.OpenMaya as om  # noqa: E402
+import maya.api.OpenMayaRender as omr  # noqa: E402
+import numpy as np  # noqa: E402
+
+#: Helpers having a draw override with user selection, entries of draw.HELPERS.
+HELPERS = [
+    helper
+    for helper in draw.HELPERS
+    if helper[0] in ("angle_helper", "angle_cone_helper", "vector_helper")
+]
+
+#: Width and height of the region of a click, in pixels.
+CLICK_SIZE = 10
+
+
+def _to_array(matrix):
+    return np.array(list(matrix), dtype=float).reshape(4, 4)
+
+
+def region_matrix(draw_context, x, y, width, height):
+    """Return the alignment matrix of a region of the viewport.
+
+    The matrix maps the world to the clip space of the region, where the
+    region spans [-1, 1] along X and Y, as om.MSelectionInfo's does.
+
+    Args:
+        draw_context(omr.MDrawContext): context of the viewport
+        x(float): left of the region, in pixels
+        y(float): bottom of the region, in pixels
+        width(float): width of the region, in pixels
+        height(float): height of the region, in pixels
+    """
+    view = np.identity(4)
+    view[3, :3] = np.negative(draw_context.getTuple(omr.MFrameContext.kViewPosition))
+    projection = _to_array(draw_context.getMatrix(omr.MFrameContext.kProjectionMtx))
+
+    _, _, viewport_width, viewport_height = draw_context.getViewportDimensions()
+    size = np.array([viewport_width, viewport_height], dtype=float)
+    half = np.array([width, height]) / size
+    center = (np.array([x, y]) + (width / 2, height / 2)) / size * 2 - 1
+    region = np.identity(4)
+    region[[0, 1], [0, 1]] = 1 / half
+    region[3, :2] = -center / half
+
+    return np.dot(np.dot(view, projection), region)
+
+
+def get_pixel(draw_context, point):
+    """Return the position of a world point in the viewport, in pixels."""
+    _, _, viewport_width, viewport_height = draw_context.getViewportDimensions()
+    alignment = region_matrix(draw_context, 0, 0, viewport_width, viewport_height)
+    clip = np.dot(tuple(point) + (1,), alignment)
+    return (clip[:2] / clip[3] + 1) / 2 * (viewport_width, viewport_height)
+
+
+class SelectScene(object):
+    """Drawn nodes of one helper type, selected through their draw overrides.
+
+    Args:
+        helper(tuple): entry of HELPERS
+        nodes(int): number of nodes to create
+        subdivisions(int): subdivisions of the helpers
+        degenerate(bool): whether the nodes keep their default inputs
+    """
+
+    def __init__(self, helper, nodes, subdivisions, degenerate=False):
+        module_name, node_name, override_name, setup, _ = helper
+        module = importlib.import_module("mrh.plugins." + module_name)
+        self.node = getattr(module, node_name)
+        self.node.initialize()
+        override_class = getattr(module, override_name)
+
+        self.name = self.node.TYPE_NAME
+        self.draw_context = omr.MDrawContext()
+        self.helpers = []
+        for index in range(nodes):
+            obj = stub.create_node(self.node)
+            if not degenerate:
+                setup(self.node, obj, index)
+            stub.set_value(obj, self.node.subdivisions, subdivisions)
+            override = override_class.creator(obj)
+            path = om.MDagPath(obj)
+            data = override.prepareForDraw(path, None, self.draw_context, None)
+            self.helpers.append((path, override, data))
+
+    def click_regions(self):
+        """Return the alignment matrix of a click on the center of each helper."""
+        regions = []
+        for path, _, data in self.helpers:
+            minimum, maximum = data.inputs.bounds()
+            center = (np.add(minimum, maximum) / 2).tolist() + [1]
+            center = np.dot(center, _to_array(path.inclusiveMatrix()))[:3]
+            x, y = get_pixel(self.draw_context, center) - CLICK_SIZE / 2
+            regions.append(
+                region_matrix(self.draw_context, x, y, CLICK_SIZE, CLICK_SIZE)
+            )
+        return regions
+
+    def select(self, regions, single_selection):
+        """Select each helper in its region, return the number selected."""
+        selected = 0
+        for (path, override, data), region in zip(self.helpers, regions):
+            select_info = omr.MSelectionInfo(
+                om.MMatrix(region.ravel()), single_selection
+            )
+            selected += override.userSelect(
+                select_info,
+                self.draw_context,
+                path,
+                data,
+                om.MSelectionList(),
+                om.MPointArray(),
+            )
+        return selected
+
+    def select_mesh(self, regions):
+        """Test every drawn vertex of each helper against its region instead."""
+        selected = 0
+        for (path, _, data), region in zip(self.helpers, regions):
+            to_world = _to_array(path.inclusiveMatrix())
+            if data.inputs.selection_matrix() is not None:
+                to_world = np.dot(_to_array(data.inputs.selection_matrix()), to_world)
+            to_selection = np.dot(to_world, region)
+            projected = np.dot(data.vertices, to_selection[:3]) + to_selection[3]
+            inside = projected[:, 3] > 0
+            inside &= np.all(np.abs(projected[:, :2]) <= projected[:, 3:], axis=1)
+            selected += bool(inside.any())
+        return selected
+
+
+def run_scene(scene, regions, single_selection, repeat):
+    """Return the measures of selecting the helpers of a scene in regions."""
+    nodes = len(scene.helpers)
+    select_time = timeit.timeit(
+        lambda: scene.select(regions, single_selection), number=repeat
+    )
+    mesh_time = timeit.timeit(lambda: scene.select_mesh(regions), number=repeat)
+    return {
+        "select_us": select_time / repeat / nodes * 1e6,
+        "mesh_us": mesh_time / repeat / nodes * 1e6,
+        "selected": scene.select(regions, single_selection),
+    }
+
+
+def run(nodes=100, subdivisions=(8, 100), repeat=10):
+    """Run the benchmark and return its results as a dictionary.
+
+    Args:
+        nodes(int): number of nodes of each helper type
+        subdivisions(list): subdivisions to draw the helpers at
+        repeat(int): number of times each selection is made
+    """
+    results = {
+        "nodes": nodes,
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "helpers": {},
+    }
+    for helper in HELPERS:
+        for count in subdivisions:
+            scene = SelectScene(helper, nodes, count)
+            context = scene.draw_context
+            _, _, width, height = context.getViewportDimensions()
+            corner = region_matrix(
+                context, 0, height - CLICK_SIZE, CLICK_SIZE, CLICK_SIZE
+            )
+            screen = region_matrix(context, 0, 0, width, height)
+            degenerate = SelectScene(helper, nodes, count, degenerate=True)
+            results["helpers"].setdefault(scene.name, {})[str(count)] = {
+                "click": run_scene(scene, scene.click_regions(), True, repeat),
+                "miss": run_scene(scene, [corner] * nodes, True, repeat),
+                "marquee": run_scene(scene, [screen] * nodes, False, repeat),
+                "degenerate": run_scene(degenerate, [screen] * nodes, False, repeat),
+            }
+    return results
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--nodes", type=int, default=100)
+    parser.add_argument("--subdivisions", type=int, nargs="+", default=[8, 100])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", help="file to write to instead of stdout")
+    args = parser.parse_args(args)
+
+    text = json.dumps(
+        run(args.nodes, args.subdivisions, args.repeat), indent=2, sort_keys=True
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
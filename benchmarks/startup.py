@@ -0,0 +1,127 @@
+"""Benchmark of the time taken to load the plugin.
+
+Each run starts a new interpreter, imports the modules of the plugin one by one
+in dependency order, then initializes the plugin. The median of ``--runs`` runs
+is written as JSON:
+
+- ``imports_ms``: time to import each module, excluding the modules imported
+  before it, so ``numpy`` holds the cost of numpy alone
+- ``initialize_ms``: time of initializePlugin, with the modules imported
+- ``total_ms``: sum of the above
+
+The Maya API is the stand-in of :mod:`benchmarks.stub`, whose import isn't
+counted.
+"""
+from __future__ import division, print_function
+
+import argparse
+import json
+import os
+import platform
+import runpy
+import subprocess
+import sys
+import timeit
+
+from benchmarks import stub
+
+PLUGIN = os.path.join(
+    os.path.dirname(__file__), "..", "plug-ins", "maya_rigging_helpers.py"
+)
+
+#: Modules imported one by one, each after the modules it depends on.
+MODULES = (
+    "logging",
+    "ctypes",
+    "numpy",
+    "mrh.geometry",
+    "mrh.lod",
+    "mrh.profiling",
+    "mrh.disk_cache",
+    "mrh.labels",
+    "mrh.plugins",
+    "mrh.plugins.angle_helper",
+    "mrh.plugins.angle_cone_helper",
+    "mrh.plugins.vector_helper",
+    "mrh.plugins.vector_field_helper",
+    "mrh.plugins.angle_field_helper",
+    "mrh.plugins.angle_cone_field_helper",
+)
+
+
+def measure():
+    """Return the import and initialization times of this interpreter."""
+    stub.install()
+    import maya.api.OpenMaya as om
+
+    imports = {}
+    for name in MODULES:
+        imports[name] = timeit.timeit(
+            "importlib.import_module({!r})".format(name),
+            "import importlib",
+            number=1,
+        )
+
+    plugin = runpy.run_path(os.path.abspath(PLUGIN), run_name="maya_rigging_helpers")
+    initialize = timeit.timeit(
+        lambda: plugin["initializePlugin"](om.MObject()), number=1
+    )
+    return {"imports": imports, "initialize": initialize}
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+def run(runs=10):
+    """Run the benchmark and return its results as a dictionary.
+
+    Args:
+        runs(int): number of interpreters started
+    """
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    command = [sys.executable, "-m", "benchmarks.startup", "--measure"]
+    measures = [
+        json.loads(subprocess.check_output(command, cwd=root).decode("utf-8"))
+        for _ in range(runs)
+    ]
+
+    imports_ms = {
+        name: _median([m["imports"][name] for m in measures]) * 1e3
+        for name in MODULES
+    }
+    initialize_ms = _median([m["initialize"] for m in measures]) * 1e3
+    return {
+        "runs": runs,
+        "python": platform.python_version(),
+        "imports_ms": imports_ms,
+        "initialize_ms": initialize_ms,
+        "total_ms": sum(imports_ms.values()) + initialize_ms,
+    }
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", help="file to write to instead of stdout")
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(args)
+
+    if args.measure:
+        print(json.dumps(measure()))
+        return
+
+    text = json.dumps(run(args.runs), indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,629 @@
+"""Stand-in for the parts of maya.api.OpenMaya used by the helpers."""
+from __future__ import division
+
+import collections
+import itertools
+import math
+
+#: Number of calls made to the plug API, by method name.
+plug_calls = collections.Counter()
+
+#: Attributes dirtied by each attribute, from MPxNode.attributeAffects.
+affects = collections.defaultdict(list)
+
+
+class MObject(object):
+    kNullObj = None
+
+    def isNull(self):
+        return False
+
+
+MObject.kNullObj = MObject()
+
+
+class _Attribute(MObject):
+    def __init__(self, name, short_name, default=None, children=()):
+        self.name = name
+        self.short_name = short_name
+        self.default = default
+        self.children = list(children)
+        self.parent = None
+        self.writable = True
+        for child in self.children:
+            child.parent = self
+
+
+class _NodeObject(MObject):
+    def __init__(self, node):
+        self.node = node
+        self.values = {}
+        self.clean = set()
+
+    def dirty(self, attribute):
+        for affected in affects[attribute]:
+            self.clean.discard(affected)
+            self.clean.difference_update(affected.children)
+
+
+class _Data(MObject):
+    def __init__(self, value):
+        self.value = value
+
+
+class MTypeId(object):
+    def __init__(self, value):
+        self.value = value
+
+
+class MDistance(object):
+    def __init__(self, value=0.0):
+        self.value = value
+
+    def asCentimeters(self):
+        return self.value
+
+
+class MAngle(object):
+    def __init__(self, value=0.0):
+        self.value = value
+
+    def asRadians(self):
+        return self.value
+
+    def asDegrees(self):
+        return math.degrees(self.value)
+
+
+class MSpace(object):
+    kWorld = 4
+    kObject = 2
+
+
+class MVector(object):
+    def __init__(self, *args):
+        if len(args) == 1:
+            args = tuple(args[0])[:3]
+        self.x, self.y, self.z = (tuple(float(a) for a in args) + (0.0,) * 3)[:3]
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z)[index]
+
+    def __xor__(self, other):
+        return MVector(
+            self.y * other.z - self.z * other.y,
+            self.z * other.x - self.x * other.z,
+            self.x * other.y - self.y * other.x,
+        )
+
+    def __mul__(self, other):
+        if isinstance(other, MVector):
+            return self.x * other.x + self.y * other.y + self.z * other.z
+        return MVector(self.x * other, self.y * other, self.z * other)
+
+    def __add__(self, other):
+        return MVector(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def length(self):
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def normal(self):
+        return MVector(self).normalize()
+
+    def normalize(self):
+        length = self.length()
+        if length:
+            self.x, self.y, self.z = self.x / length, self.y / length, self.z / length
+        return self
+
+    def isParallel(self, other, tolerance=1e-10):
+        a, b = self.normal(), other.normal()
+        return 1 - abs(a * b) <= tolerance
+
+
+class MPoint(object):
+    def __init__(self, *args):
+        if len(args) == 1:
+            args = tuple(args[0])
+        values = tuple(float(a) for a in args) + (0.0, 0.0, 0.0, 1.0)[len(args) :]
+        self.x, self.y, self.z, self.w = values[:4]
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z, self.w))
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z, self.w)[index]
+
+    def __sub__(self, other):
+        if isinstance(other, MPoint):
+            return MVector(self.x - other.x, self.y - other.y, self.z - other.z)
+        return MPoint(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __add__(self, other):
+        return MPoint(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __mul__(self, other):
+        if isinstance(other, MMatrix):
+            m = other.values
+            row = (self.x, self.y, self.z, self.w)
+            return MPoint(
+                *[sum(row[i] * m[i * 4 + j] for i in range(4)) for j in range(4)]
+            )
+        return MPoint(self.x * other, self.y * other, self.z * other)
+
+    def distanceTo(self, other):
+        return (self - other).length()
+
+
+class MMatrix(object):
+    def __init__(self, values=None):
+        if values is None:
+            values = [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
+        values = list(values)
+        if values and not isinstance(values[0], (int, float)):
+            values = list(itertools.chain.from_iterable(values))
+        self.values = [float(v) for v in values]
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __len__(self):
+        return 16
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def getElement(self, row, column):
+        return self.values[row * 4 + column]
+
+    def __mul__(self, other):
+        a, b = self.values, other.values
+        return MMatrix(
+            [
+                sum(a[r * 4 + k] * b[k * 4 + c] for k in range(4))
+                for r in range(4)
+                for c in range(4)
+            ]
+        )
+
+
+class MTransformationMatrix(object):
+    def __init__(self, matrix):
+        self.matrix = matrix
+
+    def scale(self, space):
+        m = self.matrix.values
+        return [MVector(m[r * 4 : r * 4 + 3]).length() for r in range(3)]
+
+
+class MColor(object):
+    def __init__(self, values=(0.0, 0.0, 0.0)):
+        values = tuple(values) + (0.0, 0.0, 0.0, 1.0)[len(tuple(values)) :]
+        self.r, self.g, self.b, self.a = values[:4]
+
+    def __iter__(self):
+        return iter((self.r, self.g, self.b, self.a))
+
+    def __len__(self):
+        return 4
+
+
+class MBoundingBox(object):
+    def __init__(self, minimum=None, maximum=None):
+        self.min = minimum or MPoint()
+        self.max = maximum or MPoint()
+
+
+class MPointArray(list):
+    def __init__(self, values=()):
+        super(MPointArray, self).__init__(
+            value if isinstance(value, MPoint) else MPoint(value) for value in values
+        )
+
+
+class MUintArray(list):
+    pass
+
+
+class MDoubleArray(list):
+    pass
+
+
+class MUserData(object):
+    def __init__(self, delete_after_use):
+        self.delete_after_use = delete_after_use
+
+
+class MGlobal(object):
+    @staticmethod
+    def upAxis():
+        return MVector(0, 1, 0)
+
+
+class MMessage(object):
+    callbacks = {}
+    _ids = itertools.count()
+
+    @staticmethod
+    def removeCallback(callback_id):
+        MMessage.callbacks.pop(callback_id, None)
+
+
+class MEventMessage(MMessage):
+    @staticmethod
+    def addEventCallback(event, callback, client_data=None):
+        callback_id = next(MMessage._ids)
+        MMessage.callbacks[callback_id] = (event, callback, client_data)
+        return callback_id
+
+
+class MObjectHandle(object):
+    def __init__(self, obj):
+        self._obj = obj
+
+    def isValid(self):
+        return True
+
+    def object(self):
+        return self._obj
+
+
+class MSelectionMask(object):
+    kSelectLocators = 1
+
+    def __init__(self, mask=0):
+        self.mask = mask
+
+
+class MSelectionList(list):
+    def add(self, item):
+        self.append(item)
+
+
+class MDagPath(object):
+    def __init__(self, obj=None, matrix=None):
+        self._obj = obj
+        self._matrix = matrix or MMatrix()
+
+    def node(self):
+        return self._obj
+
+    def inclusiveMatrix(self):
+        return self._matrix
+
+
+class MPlug(object):
+    def __init__(self, node=None, attribute=None):
+        plug_calls["MPlug"] += 1
+        self._node = node
+        self._attribute = attribute
+
+    @property
+    def isNull(self):
+        plug_calls["isNull"] += 1
+        return self._attribute is None
+
+    @property
+    def isCompound(self):
+        plug_calls["isCompound"] += 1
+        return bool(self._attribute.children)
+
+    @property
+    def isChild(self):
+        plug_calls["isChild"] += 1
+        return self._attribute.parent is not None
+
+    def numChildren(self):
+        plug_calls["numChildren"] += 1
+        return len(self._attribute.children)
+
+    def child(self, index):
+        plug_calls["child"] += 1
+        return MPlug(self._node, self._attribute.children[index])
+
+    def parent(self):
+        plug_calls["parent"] += 1
+        return MPlug(self._node, self._attribute.parent)
+
+    def attribute(self):
+        plug_calls["attribute"] += 1
+        return self._attribute
+
+    def node(self):
+        return self._node
+
+    def _value(self):
+        attribute = self._attribute
+        output = not (attribute.parent or attribute).writable
+        if output and attribute not in self._node.clean:
+            self._node.node.compute(self, MDataBlock(self._node))
+        return self._node.values.get(attribute, attribute.default)
+
+    def asFloat(self):
+        plug_calls["asFloat"] += 1
+        return float(self._value())
+
+    def asDouble(self):
+        plug_calls["asDouble"] += 1
+        value = self._value()
+        return float(getattr(value, "value", value))
+
+    def asInt(self):
+        plug_calls["asInt"] += 1
+        return int(self._value())
+
+    def asBool(self):
+        plug_calls["asBool"] += 1
+        return bool(self._value())
+
+    def asMObject(self):
+        plug_calls["asMObject"] += 1
+        return self._value()
+
+    def asMDistance(self):
+        plug_calls["asMDistance"] += 1
+        return MDistance(self.asDouble())
+
+    def asMAngle(self):
+        plug_calls["asMAngle"] += 1
+        return MAngle(self.asDouble())
+
+
+class MDataHandle(object):
+    def __init__(self, obj, attribute):
+        self._obj = obj
+        self._attribute = attribute
+
+    def _value(self, attribute=None):
+        attribute = attribute or self._attribute
+        value = self._obj.values.get(attribute, attribute.default)
+        return getattr(value, "value", value)
+
+    def asDouble(self):
+        return float(self._value())
+
+    asFloat = asDouble
+
+    def asInt(self):
+        return int(self._value())
+
+    def asBool(self):
+        return bool(self._value())
+
+    def asAngle(self):
+        return MAngle(self._value())
+
+    def asDistance(self):
+        return MDistance(self._value())
+
+    def asFloat3(self):
+        return [float(self._value(child)) for child in self._attribute.children]
+
+    asDouble3 = asFloat3
+
+    def setDouble(self, value):
+        self._obj.values[self._attribute] = value
+
+    setFloat = setDouble
+
+    def setMDistance(self, value):
+        self._obj.values[self._attribute] = value.value
+
+    def setMAngle(self, value):
+        self._obj.values[self._attribute] = value.value
+
+    def set3Float(self, x, y, z):
+        for child, value in zip(self._attribute.children, (x, y, z)):
+            self._obj.values[child] = value
+
+    set3Double = set3Float
+
+    def setMMatrix(self, matrix):
+        self._obj.values[self._attribute] = MFnMatrixData().create(matrix)
+
+    def setClean(self):
+        MDataBlock(self._obj).setClean(self._attribute)
+
+
+class MDataBlock(object):
+    def __init__(self, obj):
+        self._obj = obj
+
+    def inputValue(self, attribute):
+        if isinstance(attribute, MPlug):
+            attribute = attribute.attribute()
+        return MDataHandle(self._obj, attribute)
+
+    outputValue = inputValue
+
+    def setClean(self, attribute):
+        if isinstance(attribute, MPlug):
+            attribute = attribute.attribute()
+        self._obj.clean.add(attribute)
+        self._obj.clean.update(attribute.children)
+
+
+class MDGContext(object):
+    def isNormal(self):
+        return True
+
+
+class MEvaluationNode(object):
+    """Node evaluated by the Evaluation Manager, with its dirty attributes."""
+
+    def __init__(self, obj, attributes):
+        self._obj = obj
+        self._attributes = attributes
+
+    def dirtyPlugExists(self, attribute):
+        return any(attribute == dirty for dirty in self._attributes)
+
+
+class MPxNode(object):
+    kLocatorNode = 2
+
+    def __init__(self):
+        self._mobject = None
+
+    def thisMObject(self):
+        return self._mobject
+
+    def postConstructor(self):
+        pass
+
+    def setDependentsDirty(self, plug, plug_array):
+        pass
+
+    def preEvaluation(self, context, evaluation_node):
+        pass
+
+    def compute(self, plug, data_block):
+        return None
+
+    @staticmethod
+    def addAttribute(attribute):
+        pass
+
+    @staticmethod
+    def attributeAffects(source, destination):
+        if destination not in affects[source]:
+            affects[source].append(destination)
+
+
+class MFnData(object):
+    kPointArray = 1
+    kDoubleArray = 2
+    kMatrix = 3
+
+
+class MFnPointArrayData(object):
+    def __init__(self, obj=None):
+        self._obj = obj
+
+    def create(self, array=None):
+        self._obj = _Data(MPointArray(array or ()))
+        return self._obj
+
+    def array(self):
+        return self._obj.value
+
+
+class MFnDoubleArrayData(object):
+    def __init__(self, obj=None):
+        self._obj = obj
+
+    def create(self, array=None):
+        self._obj = _Data(MDoubleArray(array or ()))
+        return self._obj
+
+    def array(self):
+        return self._obj.value
+
+
+class MFnMatrixData(object):
+    def __init__(self, obj=None):
+        self._obj = obj
+
+    def create(self, matrix=None):
+        self._obj = _Data(matrix or MMatrix())
+        return self._obj
+
+    def matrix(self):
+        return self._obj.value
+
+
+class MFnNumericData(object):
+    kBoolean = 1
+    kInt = 2
+    kFloat = 3
+    kDouble = 4
+    k3Double = 5
+
+
+class MFnAttribute(object):
+    def __init__(self):
+        self._attribute = None
+        self.channelBox = False
+        self.storable = True
+        self.keyable = False
+
+    @property
+    def writable(self):
+        return self._attribute.writable
+
+    @writable.setter
+    def writable(self, value):
+        self._attribute.writable = value
+
+    @property
+    def default(self):
+        return self._attribute.default
+
+    @default.setter
+    def default(self, value):
+        self._attribute.default = value
+
+    def setMin(self, value):
+        pass
+
+    def setMax(self, value):
+        pass
+
+
+class MFnNumericAttribute(MFnAttribute):
+    def create(self, name, short_name, data_type=None, default=0):
+        self._attribute = _Attribute(name, short_name, default)
+        return self._attribute
+
+    def createPoint(self, name, short_name):
+        children = [
+            _Attribute(name + axis, short_name + axis.lower(), 0.0) for axis in "XYZ"
+        ]
+        self._attribute = _Attribute(name, short_name, children=children)
+        return self._attribute
+
+
+class MFnUnitAttribute(MFnAttribute):
+    kAngle = 1
+    kDistance = 2
+
+    def create(self, name, short_name, unit_type, default=0.0):
+        self._attribute = _Attribute(name, short_name, default)
+        return self._attribute
+
+
+class MFnTypedAttribute(MFnAttribute):
+    def create(self, name, short_name, data_type, default=None):
+        self._attribute = _Attribute(name, short_name, default)
+        return self._attribute
+
+
+class MFnMatrixAttribute(MFnAttribute):
+    kDouble = 1
+
+    def create(self, name, short_name, matrix_type=kDouble):
+        self._attribute = _Attribute(name, short_name, MMatrix())
+        return self._attribute
+
+
+class MFnPlugin(object):
+    def __init__(self, plugin=None, vendor="", version="", api_version=""):
+        self.nodes = {}
+
+    def registerNode(
+        self, name, type_id, creator, initialize, node_type, classification=None
+    ):
+        initialize()
+        self.nodes[type_id.value] = name
+
+    def deregisterNode(self, type_id):
+        self.nodes.pop(type_id.value, None)
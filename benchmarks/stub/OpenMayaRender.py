@@ -0,0 +1,307 @@
+"""Stand-in for the parts of maya.api.OpenMayaRender used by the helpers."""
+from __future__ import division
+
+import collections
+import ctypes
+import math
+
+from .OpenMaya import MMatrix
+
+#: Number of calls made to the draw manager, by method name, with the number
+#: of vertices and bytes sent to the GPU through it or through buffers.
+draw_calls = collections.Counter()
+
+
+class MGeometry(object):
+    kPoints = 1
+    kLines = 2
+    kLineStrip = 3
+    kTriangles = 4
+
+    kPosition = 1
+    kNormal = 2
+
+    kFloat = 1
+    kUnsignedInt32 = 2
+
+    kWireframe = 1
+    kShaded = 2
+    kTextured = 4
+    kAll = 7
+
+
+class MShaderInstance(object):
+    def __init__(self):
+        self.parameters = {}
+        self.transparent = False
+
+    def setParameter(self, name, value):
+        self.parameters[name] = value
+
+    def setIsTransparent(self, transparent):
+        self.transparent = transparent
+
+
+class MShaderManager(object):
+    k3dSolidShader = 1
+
+    def getStockShader(self, shader):
+        return MShaderInstance()
+
+    def releaseShader(self, shader):
+        pass
+
+
+class MRenderer(object):
+    kAllDevices = 7
+    dirty = collections.Counter()
+
+    @staticmethod
+    def setGeometryDrawDirty(obj, topology_changed=True):
+        MRenderer.dirty[id(obj)] += 1
+
+    @staticmethod
+    def getShaderManager():
+        return MShaderManager()
+
+
+class _Buffer(object):
+    """GPU buffer, written through the address returned by acquire."""
+
+    width = 1
+
+    def __init__(self):
+        self._memory = None
+
+    def acquire(self, size, write_only=True):
+        self._memory = (ctypes.c_uint32 * (size * self.width))()
+        return ctypes.addressof(self._memory)
+
+    def commit(self, address):
+        draw_calls["buffers"] += 1
+        draw_calls["bytes"] += ctypes.sizeof(self._memory)
+
+
+class MVertexBuffer(_Buffer):
+    width = 3
+
+    def __init__(self, descriptor):
+        super(MVertexBuffer, self).__init__()
+        self.descriptor = descriptor
+
+
+class MIndexBuffer(_Buffer):
+    def __init__(self, data_type):
+        super(MIndexBuffer, self).__init__()
+
+
+class MVertexBufferDescriptor(object):
+    def __init__(self, name="", semantic=MGeometry.kPosition, dimension=3):
+        self.name = name
+        self.semantic = semantic
+        self.dimension = dimension
+
+
+class MGeometryRequirements(object):
+    def __init__(self):
+        self._descriptors = [MVertexBufferDescriptor()]
+
+    def vertexRequirements(self):
+        return self._descriptors
+
+
+class MGeometryData(object):
+    """Stands for the MGeometry given to MPxGeometryOverride.populateGeometry."""
+
+    def __init__(self):
+        self.vertex_buffers = []
+        self.index_buffers = []
+
+    def createVertexBuffer(self, descriptor):
+        buffer = MVertexBuffer(descriptor)
+        self.vertex_buffers.append(buffer)
+        return buffer
+
+    def createIndexBuffer(self, data_type):
+        buffer = MIndexBuffer(data_type)
+        self.index_buffers.append(buffer)
+        return buffer
+
+
+class MRenderItem(object):
+    DecorationItem = 1
+
+    def __init__(self, name, item_type, primitive):
+        self._name = name
+        self.primitive = primitive
+        self.draw_mode = MGeometry.kAll
+        self.enabled = True
+        self.shader = None
+        self.index_buffer = None
+        self.depth_priority = 0
+
+    @staticmethod
+    def create(name, item_type, primitive):
+        return MRenderItem(name, item_type, primitive)
+
+    def name(self):
+        return self._name
+
+    def setDrawMode(self, draw_mode):
+        self.draw_mode = draw_mode
+
+    def depthPriority(self):
+        return self.depth_priority
+
+    def setDepthPriority(self, priority):
+        self.depth_priority = priority
+
+    def enable(self, enabled):
+        self.enabled = enabled
+
+    def setShader(self, shader):
+        self.shader = shader
+
+    def associateWithIndexBuffer(self, buffer):
+        self.index_buffer = buffer
+
+
+class MRenderItemList(list):
+    def indexOf(self, name):
+        for index, item in enumerate(self):
+            if item.name() == name:
+                return index
+        return -1
+
+
+class MFrameContext(object):
+    kWireFrame = 1
+    kGouraudShaded = 2
+
+    kViewPosition = 1
+    kProjectionMtx = 2
+
+    def __init__(
+        self,
+        camera_position=(0.0, 0.0, 100.0),
+        field_of_view=math.radians(54.43),
+        viewport=(0, 0, 1920, 1080),
+        display_style=kWireFrame | kGouraudShaded,
+    ):
+        self.camera_position = camera_position
+        self.viewport = viewport
+        self.display_style = display_style
+
+        scale = 1 / math.tan(field_of_view / 2)
+        aspect = viewport[2] / viewport[3]
+        # fmt: off
+        self.projection = MMatrix(
+            [
+                scale / aspect, 0,     0,  0,
+                0,              scale, 0,  0,
+                0,              0,     -1, -1,
+                0,              0,     -1, 0,
+            ]
+        )
+        # fmt: on
+
+    def getDisplayStyle(self):
+        return self.display_style
+
+    def getTuple(self, tuple_type):
+        return list(self.camera_position)
+
+    def getMatrix(self, matrix_type):
+        return self.projection
+
+    def getViewportDimensions(self):
+        return self.viewport
+
+
+class MDrawContext(MFrameContext):
+    pass
+
+
+class MSelectionInfo(object):
+    """Selection of a region, mapped to [-1, 1] by the alignment matrix."""
+
+    def __init__(self, alignment_matrix, single_selection=True):
+        self.alignment_matrix = alignment_matrix
+        self.single_selection = single_selection
+
+    def getAlignmentMatrix(self):
+        return self.alignment_matrix
+
+    def singleSelection(self):
+        return self.single_selection
+
+    def selectable(self, mask):
+        return True
+
+
+class MUIDrawManager(object):
+    kPoints = 1
+    kLines = 2
+    kLineStrip = 3
+    kTriangles = 4
+
+    def beginDrawable(self, *args):
+        draw_calls["beginDrawable"] += 1
+
+    def endDrawable(self):
+        draw_calls["endDrawable"] += 1
+
+    def setColor(self, color):
+        draw_calls["setColor"] += 1
+
+    def setDepthPriority(self, priority):
+        draw_calls["setDepthPriority"] += 1
+
+    def mesh(self, primitive, position, normal=None, color=None, index=None, uvs=None):
+        draw_calls["mesh"] += 1
+        draw_calls["vertices"] += len(index) if index is not None else len(position)
+        draw_calls["bytes"] += len(position) * 12
+        if index is not None:
+            draw_calls["bytes"] += len(index) * 4
+
+    def text(self, position, text, *args):
+        draw_calls["text"] += 1
+
+
+class MPxDrawOverride(object):
+    def __init__(self, obj, callback=None, always_dirty=True):
+        self.always_dirty = always_dirty
+
+    def isBounded(self, obj_path, camera_path):
+        return False
+
+    def transform(self, obj_path, camera_path):
+        return obj_path.inclusiveMatrix()
+
+
+class MPxGeometryOverride(object):
+    def __init__(self, obj):
+        pass
+
+    def cleanUp(self):
+        pass
+
+
+class MDrawRegistry(object):
+    overrides = {}
+
+    @staticmethod
+    def registerGeometryOverrideCreator(classification, registrant_id, creator):
+        MDrawRegistry.overrides[classification] = creator
+
+    @staticmethod
+    def deregisterGeometryOverrideCreator(classification, registrant_id):
+        MDrawRegistry.overrides.pop(classification, None)
+
+    @staticmethod
+    def registerDrawOverrideCreator(classification, registrant_id, creator):
+        MDrawRegistry.overrides[classification] = creator
+
+    @staticmethod
+    def deregisterDrawOverrideCreator(classification, registrant_id):
+        MDrawRegistry.overrides.pop(classification, None)
@@ -0,0 +1,7 @@
+"""Stand-in for the parts of maya.api.OpenMayaUI used by the helpers."""
+from .OpenMaya import MPxNode
+
+
+class MPxLocatorNode(MPxNode):
+    def isBounded(self):
+        return False
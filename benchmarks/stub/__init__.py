@@ -0,0 +1,77 @@
+"""Lightweight stand-in for the Maya API, to run the helpers without Maya.
+
+Only the surface used by :mod:`mrh.plugins` is implemented, and nothing is
+drawn: the draw manager only counts its calls. :func:`install` has to be
+called before importing :mod:`mrh.plugins`.
+"""
+import os
+import sys
+import types
+
+from . import OpenMaya, OpenMayaRender, OpenMayaUI
+
+SCRIPTS = os.path.join(os.path.dirname(__file__), "..", "..", "scripts")
+
+#: Whether set_value dirties the nodes as the Evaluation Manager does, through
+#: preEvaluation, or as the dependency graph does, through setDependentsDirty.
+evaluation_manager = False
+
+
+def install():
+    """Register the stand-in as the ``maya.api`` modules and add mrh to the path."""
+    maya = sys.modules.setdefault("maya", types.ModuleType("maya"))
+    api = sys.modules.setdefault("maya.api", types.ModuleType("maya.api"))
+    maya.api = api
+    for module in (OpenMaya, OpenMayaRender, OpenMayaUI):
+        name = module.__name__.rsplit(".", 1)[-1]
+        setattr(api, name, module)
+        sys.modules["maya.api." + name] = module
+
+    scripts = os.path.abspath(SCRIPTS)
+    if scripts not in sys.path:
+        sys.path.insert(0, scripts)
+
+
+def create_node(node_class):
+    """Create a node and return its om.MObject, as createNode would."""
+    node = node_class.creator()
+    obj = OpenMaya._NodeObject(node)
+    node._mobject = obj
+    node.postConstructor()
+    return obj
+
+
+def set_value(obj, attribute, value):
+    """Set an attribute of a node and dirty its dependents, as setAttr would.
+
+    Compound attributes take a value per child, point and double arrays take
+    the data object of their om.MFnPointArrayData or om.MFnDoubleArrayData.
+    See :data:`evaluation_manager` for how the node is told.
+    """
+    if attribute.children:
+        for child, child_value in zip(attribute.children, value):
+            obj.values[child] = child_value
+    else:
+        obj.values[attribute] = value
+    obj.dirty(attribute)
+    if evaluation_manager:
+        evaluation_node = OpenMaya.MEvaluationNode(obj, [attribute])
+        obj.node.preEvaluation(OpenMaya.MDGContext(), evaluation_node)
+    else:
+        obj.node.setDependentsDirty(OpenMaya.MPlug(obj, attribute), [])
+
+
+def point_array(points):
+    """Return the data object of a point array attribute."""
+    return OpenMaya.MFnPointArrayData().create([tuple(p) + (1.0,) for p in points])
+
+
+def double_array(values):
+    """Return the data object of a double array attribute."""
+    return OpenMaya.MFnDoubleArrayData().create(list(values))
+
+
+def reset_counters():
+    OpenMaya.plug_calls.clear()
+    OpenMayaRender.draw_calls.clear()
+    OpenMayaRender.MRenderer.dirty.clear()
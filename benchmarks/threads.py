@@ -0,0 +1,148 @@
+"""Stress test of prepareForDraw called from several threads.
+
+Viewport 2.0 can prepare the draw of several nodes at once from worker
+threads. For every helper type, ``--nodes`` nodes with varied subdivisions,
+so the shared caches of :mod:`mrh.geometry` keep evicting each other's
+entries, are prepared from scratch by one thread then by a pool of
+``--threads`` threads, ``--rounds`` times each, and the results are written
+as JSON:
+
+- ``serial_ms`` and ``threaded_ms``: time taken to prepare all the nodes once
+- ``speedup``: serial time over threaded time
+- ``identical``: whether the threads built the same geometry as the serial
+  run, an error raised in a thread is raised as is
+
+The speedup only comes from the NumPy calls releasing the GIL, which they do
+on arrays of a few hundred values and more, so it mostly shows on the field
+helpers and on high subdivisions.
+"""
+from __future__ import division, print_function
+
+import argparse
+import json
+import multiprocessing.pool
+import platform
+import sys
+import timeit
+
+from benchmarks import draw, stub
+
+stub.install()
+
+import numpy as np  # noqa: E402
+
+#: Attributes of HelperData compared between the serial and threaded runs.
+COMPARED = ("vertices", "lines_indices", "triangles_indices", "label")
+
+
+def get_subdivisions(index):
+    """Return the subdivisions of a node, spread over more than the caches hold."""
+    return 3 + index * 7 % 100
+
+
+class ThreadScene(draw.Scene):
+    """Nodes of one helper type prepared from scratch, serially or in threads."""
+
+    def __init__(self, helper, nodes, field_size):
+        super(ThreadScene, self).__init__(helper, nodes, field_size)
+        for index, helper in enumerate(self.helpers):
+            stub.set_value(helper[0], self.node.subdivisions, get_subdivisions(index))
+
+    def prepare_one(self, helper):
+        _, path, override, _, _ = helper
+        return override.prepareForDraw(path, None, self.frame_context, None)
+
+    def prepare_serial(self):
+        return [self.prepare_one(helper) for helper in self.helpers]
+
+    def prepare_threaded(self, pool):
+        return pool.map(self.prepare_one, self.helpers, chunksize=1)
+
+
+def is_identical(expected, results):
+    """Return whether two lists of HelperData hold the same geometry."""
+    for a, b in zip(expected, results):
+        for name in COMPARED:
+            value_a, value_b = getattr(a, name, None), getattr(b, name, None)
+            if isinstance(value_a, np.ndarray):
+                if not np.array_equal(value_a, value_b):
+                    return False
+            elif value_a != value_b:
+                return False
+    return len(expected) == len(results)
+
+
+def run_scene(scene, pool, rounds):
+    """Return the measures of preparing a scene serially and in threads."""
+    expected = scene.prepare_serial()
+    identical = True
+    serial_time = threaded_time = 0.0
+    for _ in range(rounds):
+        start = timeit.default_timer()
+        scene.prepare_serial()
+        serial_time += timeit.default_timer() - start
+
+        start = timeit.default_timer()
+        results = scene.prepare_threaded(pool)
+        threaded_time += timeit.default_timer() - start
+        identical &= is_identical(expected, results)
+
+    return {
+        "serial_ms": serial_time / rounds * 1e3,
+        "threaded_ms": threaded_time / rounds * 1e3,
+        "speedup": serial_time / threaded_time,
+        "identical": identical,
+    }
+
+
+def run(nodes=200, threads=4, rounds=5, field_size=100):
+    """Run the stress test and return its results as a dictionary.
+
+    Args:
+        nodes(int): number of nodes of each helper type
+        threads(int): number of threads of the pool
+        rounds(int): number of times the nodes are prepared
+        field_size(int): number of items of the field helpers
+    """
+    results = {
+        "nodes": nodes,
+        "threads": threads,
+        "rounds": rounds,
+        "field_size": field_size,
+        "python": platform.python_version(),
+        "helpers": {},
+    }
+    pool = multiprocessing.pool.ThreadPool(threads)
+    try:
+        for helper in draw.HELPERS:
+            scene = ThreadScene(helper, nodes, field_size)
+            results["helpers"][scene.name] = run_scene(scene, pool, rounds)
+    finally:
+        pool.close()
+        pool.join()
+    return results
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--nodes", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--field-size", type=int, default=100)
+    parser.add_argument("--output", help="file to write to instead of stdout")
+    args = parser.parse_args(args)
+
+    text = json.dumps(
+        run(args.nodes, args.threads, args.rounds, args.field_size),
+        indent=2,
+        sort_keys=True,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,49 @@
 # -*- coding: utf-8 -*-
+"""Maya plugin registering the node types of the rigging helpers.
+
+The helper modules are imported when the plugin is initialized rather than
+when this file is sourced. Set the ``MRH_DEV_RELOAD`` environment variable to
+``1`` to reload the ``mrh`` modules each time the plugin is loaded, so that
+changes to them are picked up by unloading and reloading the plugin.
+"""
 from __future__ import print_function, unicode_literals
 
+import importlib
 import logging
+import os
+import sys
 
 import maya.api.OpenMaya as om
-import maya.api.OpenMayaRender as omr
-import maya.cmds as cmds
-from mrh.plugins import angle_helper
-import mrh.plugins.angle_helper as angle_helper
-import mrh.plugins.angle_cone_helper as angle_cone_helper
-import mrh.plugins.vector_helper as vector_helper
 
-reload(angle_helper)
-reload(angle_cone_helper)
-reload(vector_helper)
+try:
+    from importlib import reload
+except ImportError:  # python 2, reload is a builtin
+    pass
 
 logger = logging.getLogger(__name__)
 
+#: Modules registering the node types of the plugin, in registration order.
+HELPER_MODULES = (
+    "mrh.plugins.angle_helper",
+    "mrh.plugins.angle_cone_helper",
+    "mrh.plugins.vector_helper",
+    "mrh.plugins.vector_field_helper",
+    "mrh.plugins.angle_field_helper",
+    "mrh.plugins.angle_cone_field_helper",
+)
+
+#: Modules the helper modules depend on, reloaded before them in dev mode.
+SHARED_MODULES = (
+    "mrh.geometry",
+    "mrh.lod",
+    "mrh.profiling",
+    "mrh.disk_cache",
+    "mrh.labels",
+    "mrh.plugins",
+)
+
+DEV_RELOAD = os.environ.get("MRH_DEV_RELOAD") == "1"
+
 
 def maya_useNewAPI():
     """
@@ -26,23 +53,36 @@ def maya_useNewAPI():
     pass
 
 
+def get_helper_modules(dev_reload=False):
+    """Import and return the helper modules.
+
+    Args:
+        dev_reload(bool): reload the shared and helper modules that were
+            already imported, dependencies first
+    """
+    if dev_reload:
+        for name in SHARED_MODULES + HELPER_MODULES:
+            if name in sys.modules:
+                reload(sys.modules[name])
+
+    return [importlib.import_module(name) for name in HELPER_MODULES]
+
+
 def initializePlugin(plugin):
     vendor = "Loic Pinsard"
     version = "1.0.0"
     api_version = "Any"
 
     plugin_fn = om.MFnPlugin(plugin, vendor, version, api_version)
-    angle_helper.register(plugin_fn)
-    angle_cone_helper.register(plugin_fn)
-    vector_helper.register(plugin_fn)
+    for module in get_helper_modules(DEV_RELOAD):
+        module.register(plugin_fn)
 
 
 def uninitializePlugin(plugin):
 
     plugin_fn = om.MFnPlugin(plugin)
-    angle_helper.deregister(plugin_fn)
-    angle_cone_helper.deregister(plugin_fn)
-    vector_helper.deregister(plugin_fn)
+    for module in get_helper_modules():
+        module.deregister(plugin_fn)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,189 @@
+"""Optional on-disk cache of the tessellation of the helpers.
+
+Helpers sharing the same parameters, which is common in library rigs, then
+only tessellate them once across sessions. The points of each mesh are saved
+as a ``.npy`` file named after a hash of the helper type and parameters, and
+are memory-mapped back when loaded. The least recently used files are removed
+once the cache grows over :attr:`Settings.max_size`.
+
+Enable it by setting the ``MRH_DISK_CACHE`` environment variable to ``1``
+before loading the plugin. The files are written to ``MRH_DISK_CACHE_DIR``, or
+to ``mrh_cache`` in the Maya user directory by default.
+"""
+from __future__ import division
+
+import os
+import threading
+
+import numpy as np
+from mrh import geometry
+
+#: Bumped whenever the tessellation changes, to ignore the previous files.
+VERSION = 1
+
+# os.replace overwrites the destination on windows, it is missing in python 2
+_replace = getattr(os, "replace", os.rename)
+
+#: Fraction of the size limit the cache is brought back to once over it, so the
+#: following saves don't go over it again straight away.
+LOW_WATERMARK = 0.75
+
+# size of the files of each cache directory, from its last listing plus the
+# files saved since, so the directory is only listed again once over the limit
+_sizes = {}
+_sizes_lock = threading.Lock()
+
+
+def get_default_directory():
+    """Return the ``mrh_cache`` folder of the Maya user directory."""
+    maya_app_dir = os.environ.get("MAYA_APP_DIR")
+    if not maya_app_dir:
+        maya_app_dir = os.path.join(os.path.expanduser("~"), "maya")
+    return os.path.join(maya_app_dir, "mrh_cache")
+
+
+class Settings(object):
+    """Settings of the disk cache.
+
+    Args:
+        enabled(bool): whether the meshes are read from and written to disk
+        directory(str): folder of the cached files
+        max_size(int): size in bytes over which the least recently used files
+            are removed
+    """
+
+    def __init__(self, enabled=False, directory=None, max_size=64 * 1024 * 1024):
+        self.enabled = enabled
+        self.directory = directory or get_default_directory()
+        self.max_size = max_size
+
+
+settings = Settings(
+    enabled=os.environ.get("MRH_DISK_CACHE") == "1",
+    directory=os.environ.get("MRH_DISK_CACHE_DIR"),
+)
+
+
+def get_key(values):
+    """Return the file name of a mesh from its helper type and parameters.
+
+    Floats are rounded so that values differing by float noise share a file.
+
+    Args:
+        values(tuple): helper type name followed by the mesh's parameters
+    """
+    import hashlib  # only needed with the cache enabled, saves it at startup
+
+    normalized = [VERSION]
+    for value in values:
+        if isinstance(value, float):
+            value = round(value, 9) + 0.0  # drops the sign of -0.0
+        normalized.append(value)
+    return hashlib.sha1(repr(normalized).encode("utf-8")).hexdigest()
+
+
+def load(key):
+    """Return the memory-mapped, read-only array of a key, None if not cached."""
+    path = os.path.join(settings.directory, key + ".npy")
+    try:
+        array = np.load(path, mmap_mode="r")
+        os.utime(path, None)
+    except (IOError, OSError, ValueError):
+        return None
+    return array
+
+
+def save(key, array):
+    """Write the array of a key, then evict files if over the size limit.
+
+    The directory is only listed on the first save and once the files saved
+    since then put the cache over the limit, not on every save. It is then
+    brought back to LOW_WATERMARK of the limit.
+    """
+    import tempfile  # deferred like hashlib in get_key
+
+    directory = settings.directory
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        handle, temp_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+        with os.fdopen(handle, "wb") as f:
+            np.save(f, np.ascontiguousarray(array))
+            file_size = f.tell()
+        _replace(temp_path, os.path.join(directory, key + ".npy"))
+    except (IOError, OSError):
+        return
+
+    with _sizes_lock:
+        size = _sizes.get(directory)
+        if size is not None:
+            size = _sizes[directory] = size + file_size
+    if size is None:
+        evict()
+    elif size > settings.max_size:
+        evict(int(settings.max_size * LOW_WATERMARK))
+
+
+def evict(max_size=None):
+    """Remove the least recently used files until the cache fits in max_size.
+
+    Args:
+        max_size(int): size in bytes to fit in, the settings' by default
+    """
+    if max_size is None:
+        max_size = settings.max_size
+    directory = settings.directory
+    try:
+        names = [name for name in os.listdir(directory) if name.endswith(".npy")]
+    except OSError:
+        return
+
+    files = []
+    for name in names:
+        try:
+            stat = os.stat(os.path.join(directory, name))
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, name))
+
+    size = sum(file_size for _, file_size, _ in files)
+    for _, file_size, name in sorted(files):
+        if size <= max_size:
+            break
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:  # still mapped on windows
+            continue
+        size -= file_size
+
+    with _sizes_lock:
+        _sizes[directory] = size
+
+
+def clear():
+    """Remove every file of the cache."""
+    evict(0)
+
+
+def get_mesh(values, build, topology):
+    """Return a mesh from the disk cache, building and saving it if missing.
+
+    Only meshes that are fully determined by their parameters, before any
+    transform, should be cached.
+
+    Args:
+        values(tuple): helper type name followed by the mesh's parameters
+        build(callable): returns the mrh.geometry.Mesh when it isn't cached
+        topology(callable): returns the (lines, triangles) of a cached mesh
+    """
+    if not settings.enabled:
+        return build()
+
+    key = get_key(values)
+    points = load(key)
+    if points is not None:
+        return geometry.Mesh(points, *topology())
+
+    mesh = build()
+    save(key, mesh.points)
+    return mesh
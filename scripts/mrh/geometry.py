@@ -0,0 +1,824 @@
+"""Maya independent tessellation of the helpers.
+
+Every function returns a :class:`Mesh` made of a contiguous float32 ``(N, 3)``
+vertex array and uint32 line and triangle index arrays. The vertices are
+written in the first rows of the ``out`` buffer given to a function when they
+fit in it, so a helper can rebuild its mesh without allocating. Nothing in here
+imports Maya so the geometry can be tested and benchmarked headless.
+"""
+from __future__ import division
+
+import collections
+import math
+import threading
+
+import numpy as np
+
+Mesh = collections.namedtuple("Mesh", ["points", "lines", "triangles"])
+
+#: Guards the caches of this module, which viewport 2.0 can fill from several
+#: threads preparing the draw of different helpers at once.
+_cache_lock = threading.Lock()
+
+
+def _cache_get(cache, key):
+    """Return a value of an LRU cache and mark it recently used, None if missing."""
+    with _cache_lock:
+        value = cache.pop(key, None)
+        if value is not None:
+            cache[key] = value
+        return value
+
+
+def _cache_set(cache, key, value, size):
+    """Add a value to an LRU cache, dropping the least recently used past size."""
+    with _cache_lock:
+        cache[key] = value
+        while len(cache) > size:
+            cache.popitem(last=False)
+
+
+#: Maximum number of unit circle tables kept by :func:`unit_circle`.
+TRIG_CACHE_SIZE = 32
+
+_trig_cache = collections.OrderedDict()
+
+
+def unit_circle(subdivisions):
+    """Return the cos and sin tables of ``subdivisions + 1`` angles of a circle.
+
+    The angles go from 0 to 2 pi included. The tables are cached per number of
+    subdivisions, least recently used first out, and are read-only as they are
+    shared by every helper.
+
+    Args:
+        subdivisions(int): number of segments
+    """
+    tables = _cache_get(_trig_cache, subdivisions)
+    if tables is not None:
+        return tables
+
+    angles = np.arange(subdivisions + 1, dtype=np.float64)
+    angles *= math.pi * 2 / subdivisions
+    cos, sin = np.cos(angles), np.sin(angles)
+    cos.flags.writeable = False
+    sin.flags.writeable = False
+    tables = (cos, sin)
+
+    _cache_set(_trig_cache, subdivisions, tables, TRIG_CACHE_SIZE)
+    return tables
+
+
+def clear_trig_cache():
+    """Drop all the tables cached by :func:`unit_circle`."""
+    with _cache_lock:
+        _trig_cache.clear()
+
+
+def _arc(subdivisions, start, span):
+    """Return the cos and sin tables of an arc from ``start`` over ``span`` radians.
+
+    The spans of the arcs differ between helpers and frames, so the tables are
+    computed every time rather than cached like the full circles.
+    """
+    angles = np.arange(subdivisions + 1, dtype=np.float64)
+    angles *= span / subdivisions
+    angles += start
+    return np.cos(angles), np.sin(angles)
+
+
+def _empty(count, out=None):
+    """Return ``count`` float32 points to write in, the first rows of ``out``.
+
+    A new array is returned when ``out`` is None or too small.
+
+    Args:
+        count(int): number of points
+        out(np.ndarray): (N, 3) contiguous float32 buffer
+    """
+    if out is None or len(out) < count:
+        return np.empty((count, 3), dtype=np.float32)
+    return out[:count]
+
+
+def _ring(cos, sin, radius, height, out=None):
+    """Return, or write in ``out``, the (N, 3) points of a circle of height Y.
+
+    The points are computed straight into the float32 array by NumPy, without
+    temporaries, which releases the GIL on large enough arrays.
+    """
+    ring = np.empty((len(cos), 3), dtype=np.float32) if out is None else out
+    np.multiply(cos, radius, out=ring[:, 0])
+    ring[:, 1] = height
+    np.multiply(sin, radius, out=ring[:, 2])
+    return ring
+
+
+def _transform(points, matrix):
+    """Transform the points in place by a row major 4x4 matrix.
+
+    Args:
+        points(np.ndarray): (N, 3) float32 points
+        matrix: any 16 floats sequence or (4, 4) array, eg an om.MMatrix
+    """
+    if matrix is None:
+        return points
+    matrix = np.asarray(list(matrix) if not hasattr(matrix, "shape") else matrix)
+    matrix = matrix.reshape(4, 4).astype(np.float32)
+    points[:] = np.dot(points, matrix[:3, :3]) + matrix[3, :3]
+    return points
+
+
+def _indices(*columns):
+    """Interleave the given index columns into a flat uint32 array."""
+    return np.ascontiguousarray(np.stack(columns, axis=1), dtype=np.uint32).ravel()
+
+
+_topology_cache = {}
+
+#: Maximum number of index arrays kept by :func:`tiled_topology`.
+TILED_TOPOLOGY_CACHE_SIZE = 8
+
+_tiled_topology_cache = collections.OrderedDict()
+
+
+def _topology(builder):
+    """Cache the (lines, triangles) returned by ``builder`` per subdivisions.
+
+    The arrays are read-only as they are shared by every helper using the same
+    number of subdivisions.
+    """
+
+    def wrapper(subdivisions):
+        key = (builder.__name__, subdivisions)
+        topology = _topology_cache.get(key)
+        if topology is None:
+            topology = builder(subdivisions)
+            for indices in topology:
+                indices.flags.writeable = False
+            # the first one built wins, helpers compare their indices by identity
+            with _cache_lock:
+                topology = _topology_cache.setdefault(key, topology)
+        return topology
+
+    wrapper.__name__ = builder.__name__
+    wrapper.__doc__ = builder.__doc__
+    return wrapper
+
+
+def clear_topology_cache():
+    """Drop all the index arrays cached by the ``*_topology`` functions."""
+    with _cache_lock:
+        _topology_cache.clear()
+        _tiled_topology_cache.clear()
+
+
+@_topology
+def angle_arc_topology(subdivisions):
+    """Return the line and triangle indices of :func:`angle_arc`."""
+    n = subdivisions
+    i = np.arange(n, dtype=np.uint32)
+    lines = np.concatenate(
+        (
+            np.array([0, n + 1], dtype=np.uint32),
+            _indices(i, i + 1),
+            _indices(n + i + 1, n + i + 2),
+            np.array([n, n * 2 + 1], dtype=np.uint32),
+        )
+    )
+    triangles = _indices(i, i + 1, n + i + 1, n + i + 1, n + i + 2, i + 1)
+    return lines, triangles
+
+
+@_topology
+def cone_fan_topology(subdivisions):
+    """Return the line and triangle indices of :func:`cone_fan`."""
+    n = subdivisions
+    i = np.arange(n, dtype=np.uint32)
+    zeros = np.zeros(n, dtype=np.uint32)
+    lines = _indices(zeros, i + 1, i + 1, i + 2)
+    triangles = _indices(zeros, i + 1, i + 2)
+    return lines, triangles
+
+
+@_topology
+def arrow_topology(subdivisions):
+    """Return the line and triangle indices of :func:`arrow`."""
+    n = subdivisions
+    i = np.arange(n, dtype=np.uint32)
+    j = (i + 1) % n
+    ring1, ring1_next = i + 1, j + 1
+    ring2, ring2_next = n + i + 1, n + j + 1
+    ring3, ring3_next = n * 2 + i + 1, n * 2 + j + 1
+    zeros = np.zeros(n, dtype=np.uint32)
+    tip = np.full(n, n * 3 + 1, dtype=np.uint32)
+
+    lines = _indices(np.arange(n * 3 + 1), np.arange(1, n * 3 + 2))
+    triangles = np.concatenate(
+        (
+            _indices(zeros, ring1, ring1_next),
+            _indices(ring1, ring1_next, ring2, ring1_next, ring2_next, ring2),
+            _indices(ring2, ring2_next, ring3, ring2_next, ring3_next, ring3),
+            _indices(tip, ring3, ring3_next),
+        )
+    )
+    return lines, triangles
+
+
+def tiled_topology(topology, subdivisions, count, vertex_count):
+    """Return the indices of ``count`` meshes merged in a single buffer.
+
+    The indices are cached, least recently used first out, and are read-only.
+
+    Args:
+        topology(function): one of the ``*_topology`` functions
+        subdivisions(int): number of segments of each mesh
+        count(int): number of meshes
+        vertex_count(int): number of points of each mesh
+    """
+    key = (topology.__name__, subdivisions, count)
+    tiled = _cache_get(_tiled_topology_cache, key)
+    if tiled is not None:
+        return tiled
+
+    offsets = np.arange(count, dtype=np.uint32)[:, None] * vertex_count
+    tiled = tuple(
+        (indices[None, :] + offsets).ravel() for indices in topology(subdivisions)
+    )
+    for indices in tiled:
+        indices.flags.writeable = False
+
+    _cache_set(_tiled_topology_cache, key, tiled, TILED_TOPOLOGY_CACHE_SIZE)
+    return tiled
+
+
+def _normalize(vectors):
+    """Return the vectors normalized along their last axis, null ones stay null."""
+    lengths = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    lengths[lengths == 0] = 1
+    return vectors / lengths
+
+
+def aim_frames(origins, targets, up=(0.0, 1.0, 0.0)):
+    """Return the aim matrices aiming from the origins to the targets.
+
+    The aim vector is the Y axis, the Z axis is as close as possible to the up
+    vector. When the aim vector is parallel to the up vector, the up vector is
+    tilted towards X.
+
+    Args:
+        origins(np.ndarray): (N, 3) origins
+        targets(np.ndarray): (N, 3) targets
+        up(sequence): up vector
+
+    Returns:
+        np.ndarray: (N, 4, 4) float64 row major matrices
+    """
+    origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+    targets = np.asarray(targets, dtype=np.float64).reshape(-1, 3)
+    up = _normalize(np.asarray(up, dtype=np.float64)[:3])
+
+    aim = _normalize(targets - origins)
+    ups = np.empty_like(aim)
+    ups[:] = up
+    parallel = 1 - np.abs(np.dot(aim, up)) <= 1e-10
+    ups[parallel] = _normalize(up + (1.0, 0.0, 0.0))
+
+    normal = _normalize(np.cross(aim, ups))
+    new_up = _normalize(np.cross(aim, normal))
+
+    frames = np.zeros((len(aim), 4, 4), dtype=np.float64)
+    frames[:, 0, :3] = normal
+    frames[:, 1, :3] = aim
+    frames[:, 2, :3] = new_up
+    frames[:, 3, :3] = origins
+    frames[:, 3, 3] = 1
+    return frames
+
+
+#: Maximum number of matrices kept by :func:`aim_frame`.
+AIM_CACHE_SIZE = 256
+
+_aim_cache = collections.OrderedDict()
+
+
+def aim_frame(origin, target, up=(0.0, 1.0, 0.0)):
+    """Return the aim matrix of a single helper, see :func:`aim_frames`.
+
+    The matrices are cached on the origin, target and up vector, least
+    recently used first out, and are read-only as they are shared.
+
+    Args:
+        origin(sequence): origin, its first three values are used
+        target(sequence): target, its first three values are used
+        up(sequence): up vector
+
+    Returns:
+        np.ndarray: (4, 4) float64 row major matrix
+    """
+    key = (tuple(origin)[:3], tuple(target)[:3], tuple(up)[:3])
+    frame = _cache_get(_aim_cache, key)
+    if frame is not None:
+        return frame
+
+    frame = aim_frames(key[0], key[1], key[2])[0]
+    frame.flags.writeable = False
+
+    _cache_set(_aim_cache, key, frame, AIM_CACHE_SIZE)
+    return frame
+
+
+def clear_aim_cache():
+    """Drop all the matrices cached by :func:`aim_frame`."""
+    with _cache_lock:
+        _aim_cache.clear()
+
+
+def angle_arc(radius1, radius2, angle1, angle2, subdivisions, out=None):
+    """Return the band between two arcs of the angle helper.
+
+    The inner arc occupies the first ``subdivisions + 1`` points, the outer
+    arc the next ``subdivisions + 1``.
+
+    Args:
+        radius1(float): inner radius
+        radius2(float): outer radius
+        angle1(float): start angle in radians
+        angle2(float): end angle in radians
+        subdivisions(int): number of segments of each arc
+        out(np.ndarray): buffer to write the points in, see :func:`_empty`
+    """
+    n = subdivisions
+    cos, sin = _arc(n, angle1, angle2 - angle1)
+    points = _empty((n + 1) * 2, out)
+    _ring(cos, sin, radius1, 0, out=points[: n + 1])
+    _ring(cos, sin, radius2, 0, out=points[n + 1 :])
+
+    return Mesh(points, *angle_arc_topology(n))
+
+
+def cone_radius(height, angle):
+    """Return the radius of the base of a cone.
+
+    Args:
+        height(float): distance between the apex and the base
+        angle(float): opening angle of the cone in radians
+    """
+    return math.tan(angle / 2) * height
+
+
+def cone_fan(height, angle, subdivisions, matrix=None, out=None):
+    """Return a cone whose apex is at the origin and which opens along +Y.
+
+    Args:
+        height(float): distance between the apex and the base
+        angle(float): opening angle of the cone in radians
+        subdivisions(int): number of segments of the base circle
+        matrix: optional matrix applied to the points, see :func:`_transform`
+        out(np.ndarray): buffer to write the points in, see :func:`_empty`
+    """
+    n = subdivisions
+    radius = cone_radius(height, angle)
+    cos, sin = unit_circle(n)
+    points = _empty(n + 2, out)
+    points[0] = 0
+    _ring(cos, sin, radius, height, out=points[1:])
+    _transform(points, matrix)
+
+    return Mesh(points, *cone_fan_topology(n))
+
+
+#: Height of the head of the arrows, in radii of their body.
+ARROW_HEAD_HEIGHT = 5
+
+
+def arrow_cylinder_height(height, radius):
+    """Return the height of the body of an arrow, below its head.
+
+    Args:
+        height(float): length of the arrow
+        radius(float): radius of the body
+    """
+    return max(0.0, height - radius * ARROW_HEAD_HEIGHT)
+
+
+def _arrow_points(heights, radius, subdivisions, out=None):
+    """Return the (N, subdivisions * 3 + 2, 3) points of arrows along +Y."""
+    n = subdivisions
+    heights = np.asarray(heights, dtype=np.float64).reshape(-1)
+    cylinder_heights = np.maximum(0, heights - radius * ARROW_HEAD_HEIGHT)[:, None]
+    cos, sin = unit_circle(n)
+    cos, sin = cos[:n], sin[:n]
+
+    points = _empty(len(heights) * (n * 3 + 2), out).reshape(len(heights), -1, 3)
+    points.fill(0)
+    for ring, ring_radius in enumerate((radius, radius, radius * 3)):
+        start = n * ring + 1
+        np.multiply(cos, ring_radius, out=points[:, start : start + n, 0])
+        np.multiply(sin, ring_radius, out=points[:, start : start + n, 2])
+    points[:, n + 1 : n * 3 + 1, 1] = cylinder_heights
+    points[:, -1, 1] = heights
+    return points
+
+
+def arrow(height, radius, subdivisions, matrix=None, out=None):
+    """Return an arrow whose base is at the origin and which points along +Y.
+
+    The arrow is a cylinder of ``radius`` capped by a cone three times as wide
+    and ``radius * ARROW_HEAD_HEIGHT`` high.
+
+    Args:
+        height(float): length of the arrow
+        radius(float): radius of the body
+        subdivisions(int): number of segments of the circles
+        matrix: optional matrix applied to the points, see :func:`_transform`
+        out(np.ndarray): buffer to write the points in, see :func:`_empty`
+    """
+    points = _arrow_points(height, radius, subdivisions, out)[0]
+    _transform(points, matrix)
+    return Mesh(points, *arrow_topology(subdivisions))
+
+
+def _transform_batch(points, frames, out=None):
+    """Transform (N, V, 3) points by (N, 4, 4) frames into one (N * V, 3) array.
+
+    The frames are rounded to float32, as in :func:`_transform`, so the float32
+    points are transformed straight into the result.
+    """
+    frames = frames.astype(np.float32)
+    result = _empty(points.shape[0] * points.shape[1], out)
+    transformed = result.reshape(points.shape)
+    np.matmul(points, frames[:, :3, :3], out=transformed)
+    transformed += frames[:, 3, None, :3]
+    return result
+
+
+def arrows(origins, targets, radius, subdivisions, up=(0.0, 1.0, 0.0), out=None):
+    """Return many arrows, going from the origins to the targets, in one mesh.
+
+    Args:
+        origins(np.ndarray): (N, 3) bases of the arrows
+        targets(np.ndarray): (N, 3) tips of the arrows
+        radius(float): radius of the body of the arrows
+        subdivisions(int): number of segments of the circles
+        up(sequence): up vector of the arrows, see :func:`aim_frames`
+        out(np.ndarray): buffer to write the points in, see :func:`_empty`
+    """
+    frames = aim_frames(origins, targets, up)
+    heights = np.linalg.norm(frames[:, 3, :3] - targets, axis=1)
+    points = _arrow_points(heights, radius, subdivisions)
+    points = _transform_batch(points, frames, out)
+
+    vertex_count = subdivisions * 3 + 2
+    topology = tiled_topology(arrow_topology, subdivisions, len(frames), vertex_count)
+    return Mesh(points, *topology)
+
+
+def angle_arcs(origins, radius1, radius2, angles1, angles2, subdivisions, out=None):
+    """Return many angle arc bands, centered on the origins, in one mesh.
+
+    Args:
+        origins(np.ndarray): (N, 3) centers of the arcs
+        radius1(float): inner radius
+        radius2(float): outer radius
+        angles1(np.ndarray): (N,) start angles in radians
+        angles2(np.ndarray): (N,) end angles in radians
+        subdivisions(int): number of segments of each arc
+        out(np.ndarray): buffer to write the points in, see :func:`_empty`
+    """
+    n = subdivisions
+    origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+    angles1 = np.asarray(angles1, dtype=np.float64)[:, None]
+    angles2 = np.asarray(angles2, dtype=np.float64)[:, None]
+    steps = np.arange(n + 1, dtype=np.float64) / n
+    angles = angles1 + (angles2 - angles1) * steps
+    cos, sin = np.cos(angles), np.sin(angles)
+
+    points = np.zeros((len(origins), (n + 1) * 2, 3), dtype=np.float64)
+    for i, radius in enumerate((radius1, radius2)):
+        points[:, i * (n + 1) : (i + 1) * (n + 1), 0] = cos * radius
+        points[:, i * (n + 1) : (i + 1) * (n + 1), 2] = sin * radius
+    points += origins[:, None, :]
+    result = _empty(len(points) * (n + 1) * 2, out)
+    result.reshape(points.shape)[...] = points
+
+    topology = tiled_topology(angle_arc_topology, n, len(origins), (n + 1) * 2)
+    return Mesh(result, *topology)
+
+
+def cone_fans(origins, targets, angles, subdivisions, up=(0.0, 1.0, 0.0), out=None):
+    """Return many cones, with their apex on the origins, in one mesh.
+
+    Args:
+        origins(np.ndarray): (N, 3) apexes of the cones
+        targets(np.ndarray): (N, 3) centers of the bases of the cones
+        angles(np.ndarray): (N,) opening angles of the cones in radians
+        subdivisions(int): number of segments of the base circles
+        up(sequence): up vector of the cones, see :func:`aim_frames`
+        out(np.ndarray): buffer to write the points in, see :func:`_empty`
+    """
+    n = subdivisions
+    frames = aim_frames(origins, targets, up)
+    heights = np.linalg.norm(frames[:, 3, :3] - targets, axis=1)[:, None]
+    radii = np.tan(np.asarray(angles, dtype=np.float64) / 2)[:, None] * heights
+    cos, sin = unit_circle(n)
+
+    points = np.zeros((len(frames), n + 2, 3), dtype=np.float32)
+    points[:, 1:, 0] = cos * radii
+    points[:, 1:, 1] = heights
+    points[:, 1:, 2] = sin * radii
+    points = _transform_batch(points, frames, out)
+
+    topology = tiled_topology(cone_fan_topology, n, len(frames), n + 2)
+    return Mesh(points, *topology)
+
+
+def arrows_bounds(origins, targets, radius):
+    """Return the (minimum, maximum) corners of the bounding box of arrows.
+
+    The bounds are not tight, they contain the widest part of the arrows around
+    every origin and target.
+
+    Args:
+        origins(np.ndarray): (N, 3) bases of the arrows
+        targets(np.ndarray): (N, 3) tips of the arrows
+        radius(float): radius of the body of the arrows
+    """
+    if not len(origins):
+        return np.zeros(3), np.zeros(3)
+    points = np.concatenate((origins, targets))
+    return points.min(axis=0) - radius * 3, points.max(axis=0) + radius * 3
+
+
+def _union(*bounds):
+    minimums, maximums = zip(*bounds)
+    return np.min(minimums, axis=0), np.max(maximums, axis=0)
+
+
+def _direction(origin, target):
+    """Return the distance and the normalized direction from origin to target."""
+    vector = np.subtract(target, origin, dtype=np.float64)
+    length = math.sqrt(np.dot(vector, vector))
+    if not length:
+        return 0.0, np.array([0.0, 1.0, 0.0])
+    return length, vector / length
+
+
+def disk_bounds(center, normal, radius):
+    """Return the (minimum, maximum) corners of the bounding box of a disk.
+
+    Args:
+        center(sequence): center of the disk
+        normal(sequence): normalized normal of the disk
+        radius(float): radius of the disk
+    """
+    normal = np.asarray(normal, dtype=np.float64)
+    extent = radius * np.sqrt(np.maximum(0.0, 1.0 - normal * normal))
+    center = np.asarray(center, dtype=np.float64)
+    return center - extent, center + extent
+
+
+def angle_arc_bounds(radius1, radius2, angle1, angle2):
+    """Return the (minimum, maximum) corners of the bounding box of an angle_arc.
+
+    Args:
+        radius1(float): inner radius
+        radius2(float): outer radius
+        angle1(float): start angle in radians
+        angle2(float): end angle in radians
+    """
+    start, end = sorted((angle1, angle2))
+    quarter = math.pi / 2
+    first, last = int(math.ceil(start / quarter)), int(math.floor(end / quarter))
+    # the ends of the arcs and the points where they cross an axis
+    crossings = [i * quarter for i in range(first, min(last, first + 3) + 1)]
+    angles = np.array([start, end] + crossings, dtype=np.float64)
+
+    points = np.zeros((len(angles) * 2, 3), dtype=np.float64)
+    for i, radius in enumerate((radius1, radius2)):
+        points[i :: 2, 0] = np.cos(angles) * radius
+        points[i :: 2, 2] = np.sin(angles) * radius
+    return points.min(axis=0), points.max(axis=0)
+
+
+def cone_fan_bounds(origin, target, angle):
+    """Return the (minimum, maximum) corners of the bounding box of a cone.
+
+    Args:
+        origin(sequence): apex of the cone
+        target(sequence): center of the base of the cone
+        angle(float): opening angle of the cone in radians
+    """
+    height, direction = _direction(origin, target)
+    apex = np.asarray(origin, dtype=np.float64)
+    radius = cone_radius(height, angle)
+    return _union((apex, apex), disk_bounds(target, direction, radius))
+
+
+def arrow_bounds(origin, target, radius):
+    """Return the (minimum, maximum) corners of the bounding box of an arrow.
+
+    Args:
+        origin(sequence): base of the arrow
+        target(sequence): tip of the arrow
+        radius(float): radius of the body of the arrow
+    """
+    height, direction = _direction(origin, target)
+    origin = np.asarray(origin, dtype=np.float64)
+    tip = np.asarray(target, dtype=np.float64)
+    head = origin + direction * arrow_cylinder_height(height, radius)
+    return _union(
+        disk_bounds(origin, direction, radius),
+        disk_bounds(head, direction, radius * 3),
+        (tip, tip),
+    )
+
+
+def angle_arcs_bounds(origins, radius1, radius2):
+    """Return the (minimum, maximum) corners of the bounding box of angle_arcs.
+
+    The bounds are not tight, they contain the full circles of the arcs.
+
+    Args:
+        origins(np.ndarray): (N, 3) centers of the arcs
+        radius1(float): inner radius
+        radius2(float): outer radius
+    """
+    if not len(origins):
+        return np.zeros(3), np.zeros(3)
+    extent = np.array([1.0, 0.0, 1.0]) * max(radius1, radius2)
+    return origins.min(axis=0) - extent, origins.max(axis=0) + extent
+
+
+def cone_fans_bounds(origins, targets, angles):
+    """Return the (minimum, maximum) corners of the bounding box of cone_fans.
+
+    The bounds are not tight, they contain the widest base around every target.
+
+    Args:
+        origins(np.ndarray): (N, 3) apexes of the cones
+        targets(np.ndarray): (N, 3) centers of the bases of the cones
+        angles(np.ndarray): (N,) opening angles of the cones in radians
+    """
+    if not len(origins):
+        return np.zeros(3), np.zeros(3)
+    heights = np.linalg.norm(np.subtract(targets, origins), axis=1)
+    radius = np.max(np.tan(np.asarray(angles) / 2) * heights)
+    return _union(
+        (origins.min(axis=0), origins.max(axis=0)),
+        (targets.min(axis=0) - radius, targets.max(axis=0) + radius),
+    )
+
+
+# Hit testing. The rays are tested against the exact surfaces the meshes
+# approximate, so the cost doesn't depend on the subdivisions. Every function
+# returns the smallest distance along the ray, in units of the direction, at
+# which the ray hits the helper, None if it misses it.
+
+
+def _closest(*distances):
+    """Return the smallest of the distances that aren't None."""
+    distances = [distance for distance in distances if distance is not None]
+    return min(distances) if distances else None
+
+
+def _ray_plane(origin, direction, height):
+    """Return the distance to the plane at ``height`` along Y, None if parallel."""
+    if abs(direction[1]) < 1e-12:
+        return None
+    distance = (height - origin[1]) / direction[1]
+    return distance if distance >= 0 else None
+
+
+def _ray_disk(origin, direction, height, radius):
+    """Return the distance to a disk of the XZ plane centered on the Y axis."""
+    distance = _ray_plane(origin, direction, height)
+    if distance is None:
+        return None
+    x = origin[0] + direction[0] * distance
+    z = origin[2] + direction[2] * distance
+    return distance if x * x + z * z <= radius * radius else None
+
+
+def _quadratic_roots(a, b, c):
+    """Return the real roots of ``a * t**2 + b * t + c``, smallest first."""
+    if abs(a) < 1e-12:
+        return [-c / b] if abs(b) > 1e-12 else []
+    discriminant = b * b - 4 * a * c
+    if discriminant < 0:
+        return []
+    root = math.sqrt(discriminant)
+    return sorted(((-b - root) / (2 * a), (-b + root) / (2 * a)))
+
+
+def _ray_side(origin, direction, a, b, c, start, end):
+    """Return the first root at or after the origin whose height is in range."""
+    for distance in _quadratic_roots(a, b, c):
+        height = origin[1] + direction[1] * distance
+        if distance >= 0 and start <= height <= end:
+            return distance
+    return None
+
+
+def _ray_cylinder(origin, direction, radius, height):
+    """Return the distance to the side of a cylinder along Y, from 0 to height."""
+    ox, _, oz = origin
+    dx, _, dz = direction
+    return _ray_side(
+        origin,
+        direction,
+        dx * dx + dz * dz,
+        2 * (ox * dx + oz * dz),
+        ox * ox + oz * oz - radius * radius,
+        0.0,
+        height,
+    )
+
+
+def _ray_cone(origin, direction, apex, base, radius):
+    """Return the distance to the side of a cone along Y.
+
+    Args:
+        apex(float): height of the apex
+        base(float): height of the base, above or below the apex
+        radius(float): radius of the base
+    """
+    if apex == base:
+        return None
+    ox, oy, oz = origin
+    dx, dy, dz = direction
+    slope = (radius / (apex - base)) ** 2
+    offset = apex - oy
+    return _ray_side(
+        origin,
+        direction,
+        dx * dx + dz * dz - slope * dy * dy,
+        2 * (ox * dx + oz * dz + slope * offset * dy),
+        ox * ox + oz * oz - slope * offset * offset,
+        min(apex, base),
+        max(apex, base),
+    )
+
+
+def _in_sector(angle, start, end):
+    """Return whether an angle is between the start and end angles of an arc."""
+    span = end - start
+    if abs(span) >= math.pi * 2:
+        return True
+    if span >= 0:
+        return (angle - start) % (math.pi * 2) <= span
+    return (start - angle) % (math.pi * 2) <= -span
+
+
+def ray_angle_arc(origin, direction, radius1, radius2, angle1, angle2):
+    """Return the distance along a ray to the band of an angle_arc.
+
+    Args:
+        origin(sequence): start of the ray
+        direction(sequence): direction of the ray
+        radius1(float): inner radius
+        radius2(float): outer radius
+        angle1(float): start angle in radians
+        angle2(float): end angle in radians
+    """
+    distance = _ray_plane(origin, direction, 0.0)
+    if distance is None:
+        return None
+    x = origin[0] + direction[0] * distance
+    z = origin[2] + direction[2] * distance
+    radius = math.hypot(x, z)
+    if not min(radius1, radius2) <= radius <= max(radius1, radius2):
+        return None
+    if not _in_sector(math.atan2(z, x), angle1, angle2):
+        return None
+    return distance
+
+
+def ray_cone_fan(origin, direction, height, angle):
+    """Return the distance along a ray to the side of a cone_fan, which is open.
+
+    Args:
+        origin(sequence): start of the ray
+        direction(sequence): direction of the ray
+        height(float): distance between the apex and the base
+        angle(float): opening angle of the cone in radians
+    """
+    return _ray_cone(origin, direction, 0.0, height, cone_radius(height, angle))
+
+
+def ray_arrow(origin, direction, height, radius):
+    """Return the distance along a ray to an arrow, its body or its head.
+
+    Args:
+        origin(sequence): start of the ray
+        direction(sequence): direction of the ray
+        height(float): length of the arrow
+        radius(float): radius of the body
+    """
+    body = arrow_cylinder_height(height, radius)
+    return _closest(
+        _ray_cylinder(origin, direction, radius, body),
+        _ray_disk(origin, direction, 0.0, radius),
+        _ray_disk(origin, direction, body, radius * 3),
+        _ray_cone(origin, direction, height, body, radius * 3),
+    )
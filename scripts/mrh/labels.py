@@ -0,0 +1,70 @@
+"""Visibility of the text labels of the helpers.
+
+Text is one of the most expensive things the draw manager draws, so labels
+can be hidden beyond a distance from the camera, or altogether when more
+helpers than a given count draw one. Both limits are off by default and can
+be set before loading the plugin with the ``MRH_LABEL_MAX_DISTANCE`` and
+``MRH_LABEL_MAX_COUNT`` environment variables. As the helpers then need to be
+redrawn when the camera moves, the settings are read when their draw override
+is created.
+"""
+from __future__ import division
+
+import os
+import threading
+
+#: Number of helpers drawing a label, counted by their overrides.
+count = 0
+
+_lock = threading.Lock()
+
+
+class Settings(object):
+    """Settings of the labels.
+
+    Args:
+        max_distance(float): distance from the camera beyond which labels are
+            hidden, 0 to never hide them
+        max_count(int): number of labeled helpers above which labels are
+            hidden, 0 to never hide them
+    """
+
+    def __init__(self, max_distance=0.0, max_count=0):
+        self.max_distance = max_distance
+        self.max_count = max_count
+
+    @property
+    def enabled(self):
+        """Whether labels can be hidden."""
+        return bool(self.max_distance or self.max_count)
+
+
+settings = Settings(
+    max_distance=float(os.environ.get("MRH_LABEL_MAX_DISTANCE") or 0),
+    max_count=int(os.environ.get("MRH_LABEL_MAX_COUNT") or 0),
+)
+
+
+def add():
+    """Count a helper drawing a label, when its override is created."""
+    global count
+    with _lock:
+        count += 1
+
+
+def remove():
+    """Stop counting a helper, when its override is deleted."""
+    global count
+    with _lock:
+        count = max(count - 1, 0)
+
+
+def is_visible(distance=0.0):
+    """Return whether a label is drawn.
+
+    Args:
+        distance(float): distance between the camera and the label
+    """
+    if settings.max_count and count > settings.max_count:
+        return False
+    return not settings.max_distance or distance <= settings.max_distance
@@ -0,0 +1,86 @@
+"""Level of detail of the helpers, picked from their size on screen.
+
+The draw overrides only use it when :attr:`settings.enabled <Settings>` is on,
+which can be done before loading the plugin by setting the ``MRH_LOD``
+environment variable to ``1``. As the helpers then need to be redrawn when the
+camera moves, the setting is read when their draw override is created.
+"""
+from __future__ import division
+
+import math
+import os
+
+
+class Settings(object):
+    """Settings of the level of detail.
+
+    Args:
+        enabled(bool): whether the subdivisions depend on the size on screen
+        minimum(int): least number of subdivisions of a helper
+        maximum(int): most number of subdivisions of a helper
+        pixels_per_segment(float): length on screen of a segment of a circle
+        hysteresis(float): relative change of the wanted subdivisions under
+            which the previous subdivisions are kept, to avoid popping
+    """
+
+    def __init__(
+        self,
+        enabled=False,
+        minimum=8,
+        maximum=100,
+        pixels_per_segment=8.0,
+        hysteresis=0.25,
+    ):
+        self.enabled = enabled
+        self.minimum = minimum
+        self.maximum = maximum
+        self.pixels_per_segment = pixels_per_segment
+        self.hysteresis = hysteresis
+
+
+settings = Settings(enabled=os.environ.get("MRH_LOD") == "1")
+
+#: Subdivisions are rounded up to a multiple of this step so that helpers of
+#: similar sizes share their topology.
+STEP = 4
+
+
+def get_subdivisions(pixel_radius, previous=None, maximum=None):
+    """Return the subdivisions of a circle of ``pixel_radius`` on screen.
+
+    Args:
+        pixel_radius(float): radius of the helper on screen, in pixels
+        previous(int): subdivisions the helper was drawn with last time
+        maximum(int): subdivisions of the helper at full detail, overrides
+            the maximum of the settings
+    """
+    if maximum is None:
+        maximum = settings.maximum
+    minimum = min(settings.minimum, maximum)
+
+    wanted = math.pi * 2 * pixel_radius / settings.pixels_per_segment
+    wanted = min(max(wanted, minimum), maximum)
+    # the range may have changed since, eg the subdivisions attribute lowered
+    if previous is not None and minimum <= previous <= maximum:
+        if abs(wanted - previous) <= previous * settings.hysteresis:
+            return previous
+
+    subdivisions = int(math.ceil(wanted / STEP)) * STEP
+    return min(max(subdivisions, minimum), maximum)
+
+
+def get_pixel_radius(radius, distance, projection_scale, viewport_height, orthographic):
+    """Return the radius on screen, in pixels, of a sphere.
+
+    Args:
+        radius(float): world space radius of the sphere
+        distance(float): distance between the camera and the sphere's center
+        projection_scale(float): (1, 1) element of the projection matrix
+        viewport_height(int): height of the viewport in pixels
+        orthographic(bool): whether the camera is orthographic
+    """
+    if not orthographic:
+        if distance <= radius:
+            return float("inf")
+        radius /= distance
+    return radius * projection_scale * viewport_height / 2
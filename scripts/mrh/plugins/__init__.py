@@ -1,31 +1,576 @@
+import ctypes
+import logging
+import os
+
 import maya.api.OpenMaya as om
+import maya.api.OpenMayaRender as omr
+import numpy as np
+from mrh import geometry, labels, lod, profiling
+from mrh.geometry import clear_trig_cache, unit_circle  # noqa: F401 re-exported
+
+logger = logging.getLogger(__name__)
+
+#: Backends drawing the helpers in viewport 2.0, picked from the MRH_BACKEND
+#: environment variable when the plugin is loaded, or per node type otherwise.
+DRAW_OVERRIDE = "drawOverride"
+GEOMETRY_OVERRIDE = "geometryOverride"
+
+#: Subdivisions of the coarse meshes tested against marquee selections.
+OUTLINE_SUBDIVISIONS = 8
+
+_backends = {}
 
 
 class HelperData(om.MUserData):
+    """Geometry of a helper, kept between draws.
+
+    The meshes are built in place in :attr:`vertex_buffer`, which is only
+    replaced when a mesh doesn't fit in it, so rebuilding a helper with the
+    same subdivisions doesn't allocate its points again. Read-only points, like
+    the memory-mapped ones of mrh.disk_cache, are used as they are.
+    """
+
+    __slots__ = (
+        "surface_color",
+        "wire_color",
+        "vertices",
+        "triangles_indices",
+        "lines_indices",
+        "inputs",
+        "label",
+        "label_position",
+        "label_visible",
+        "_points",
+        "_vertex_buffer",
+        "_line_buffer",
+        "_triangle_buffer",
+        "_line_points",
+        "_triangle_points",
+        "_line_index_array",
+        "_triangle_index_array",
+    )
+
+    #: Draw the meshes from the points and an index array, without de-indexing
+    #: them into one point per vertex first.
+    indexed = True
+
     def __init__(self):
         super(HelperData, self).__init__(False)  ## don't delete after draw
 
         self.surface_color = om.MColor([1.0, 0.0, 0.0, 0.25])
         self.wire_color = om.MColor([1.0, 0.0, 0.0])
 
-        self.points = om.MPointArray()
-        self.triangles_indices = []
-        self.lines_indices = []
+        self._vertex_buffer = np.empty((0, 3), dtype=np.float32)
+        self._line_buffer = np.empty((0, 3), dtype=np.float32)
+        self._triangle_buffer = np.empty((0, 3), dtype=np.float32)
+
+        self.vertices = self._vertex_buffer
+        self._points = None
+        self.triangles_indices = np.empty(0, dtype=np.uint32)
+        self.lines_indices = np.empty(0, dtype=np.uint32)
+
+        self.inputs = None
+
+        self.label = None
+        self.label_position = None
+        self.label_visible = True
+
+        self._line_points = None
+        self._triangle_points = None
+        self._line_index_array = None
+        self._triangle_index_array = None
+
+    @staticmethod
+    def _reserve(buffer, count):
+        """Return ``buffer``, or a new one if it can't hold ``count`` vertices."""
+        if len(buffer) >= count:
+            return buffer
+        return np.empty((count, 3), dtype=np.float32)
+
+    @property
+    def vertex_buffer(self):
+        """(N, 3) float32 array to give as ``out`` to mrh.geometry.
+
+        It holds the current vertices, which the next build overwrites.
+        """
+        return self._vertex_buffer
+
+    def set_mesh(self, mesh):
+        """Replace the points and indices by the ones of a mrh.geometry.Mesh.
+
+        The points are used without a copy. When they were built in a new array
+        because the vertex buffer was too small, that array becomes the buffer.
+        """
+        points = mesh.points
+        if points.flags.writeable and not np.may_share_memory(
+            points, self._vertex_buffer
+        ):
+            self._vertex_buffer = points
+        self.vertices = points
+        self._points = None
+        self._line_points = None
+        self._triangle_points = None
+
+        if mesh.lines is not self.lines_indices:
+            self.lines_indices = mesh.lines
+            self._line_index_array = None
+        if mesh.triangles is not self.triangles_indices:
+            self.triangles_indices = mesh.triangles
+            self._triangle_index_array = None
+
+    @property
+    def points(self):
+        """om.MPointArray of the vertices, built on first use.
+
+        MPointArray has no bulk write, it is rebuilt from the buffer.
+        """
+        if self._points is None:
+            self._points = om.MPointArray(self.vertices.tolist())
+        return self._points
 
     def get_line_points(self):
-        array = om.MPointArray()
-        for index in self.lines_indices:
-            array.append(self.points[index])
-        return array
+        if self._line_points is None:
+            count = len(self.lines_indices)
+            self._line_buffer = self._reserve(self._line_buffer, count)
+            points = self._line_buffer[:count]
+            np.take(self.vertices, self.lines_indices, axis=0, out=points)
+            self._line_points = om.MPointArray(points.tolist())
+        return self._line_points
 
     def get_triangle_points(self):
-        array = om.MPointArray()
-        for index in self.triangles_indices:
-            array.append(self.points[index])
-        return array
+        if self._triangle_points is None:
+            count = len(self.triangles_indices)
+            self._triangle_buffer = self._reserve(self._triangle_buffer, count)
+            points = self._triangle_buffer[:count]
+            np.take(self.vertices, self.triangles_indices, axis=0, out=points)
+            self._triangle_points = om.MPointArray(points.tolist())
+        return self._triangle_points
+
+    def get_line_index_array(self):
+        if self._line_index_array is None:
+            self._line_index_array = om.MUintArray(self.lines_indices.tolist())
+        return self._line_index_array
+
+    def get_triangle_index_array(self):
+        if self._triangle_index_array is None:
+            indices = self.triangles_indices.tolist()
+            self._triangle_index_array = om.MUintArray(indices)
+        return self._triangle_index_array
+
+    def draw_lines(self, draw_manager):
+        if HelperData.indexed:
+            draw_manager.mesh(
+                omr.MUIDrawManager.kLines,
+                self.points,
+                None,
+                None,
+                self.get_line_index_array(),
+            )
+        else:
+            draw_manager.mesh(omr.MUIDrawManager.kLines, self.get_line_points())
+
+    def draw_triangles(self, draw_manager):
+        if HelperData.indexed:
+            draw_manager.mesh(
+                omr.MGeometry.kTriangles,
+                self.points,
+                None,
+                None,
+                self.get_triangle_index_array(),
+            )
+        else:
+            draw_manager.mesh(omr.MGeometry.kTriangles, self.get_triangle_points())
+
+
+def _count_vertices(data):
+    return len(data.vertices) if isinstance(data, HelperData) else 0
+
+
+# the vertices are converted to an om.MPointArray by the first of these called
+# after the mesh changed, whether it is drawn indexed or not
+profiling.watch(
+    HelperData,
+    "draw_triangles",
+    vertices=lambda data, args, result: _count_vertices(data),
+)
+profiling.watch(
+    HelperData,
+    "draw_lines",
+    vertices=lambda data, args, result: _count_vertices(data),
+)
+
+
+def watch_draw_override(type_name, override_class):
+    """Register the hot path of a draw override to mrh.profiling.
+
+    Args:
+        type_name(str): node type the calls are recorded under
+        override_class(type): omr.MPxDrawOverride subclass of the node
+    """
+    profiling.watch(
+        override_class,
+        "prepareForDraw",
+        type_name,
+        lambda override, args, data: _count_vertices(data),
+    )
+    profiling.watch(
+        override_class,
+        "addUIDrawables",
+        type_name,
+        lambda override, args, result: _count_vertices(args[3]),
+    )
+
+
+class HelperInputs(object):
+    """Snapshot of the input values of a helper, read once per draw.
+
+    Subclasses name their inputs in ``__slots__``, in the order the values are
+    given to the constructor.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def key(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def shape(self):
+        """Return the values the helper's mesh depends on, all of them by default."""
+        return self.key()
+
+    def placement(self):
+        """Return the values of the transform the mesh is drawn with."""
+        return ()
+
+    def bounds(self):
+        """Return the (minimum, maximum) corners of the helper, in object space."""
+        raise NotImplementedError
+
+    def canonical_bounds(self):
+        """Return the bounds of the mesh before the draw override's transform."""
+        return self.bounds()
+
+    def selection_matrix(self):
+        """Return the matrix from the space of hit_test and outline to object space.
+
+        None when they are in object space, as by default.
+        """
+        return None
+
+    def hit_test(self, origin, direction):
+        """Return the distance along a ray to the helper, None if it misses it."""
+        raise NotImplementedError
+
+    def outline(self):
+        """Return the (N, 3) points tested against marquee selections."""
+        raise NotImplementedError
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.key() == other.key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.key())
+
+
+def get_plugs(obj, attributes):
+    """Return the plugs of the attributes, compounds are replaced by their children.
+
+    Args:
+        obj(om.MObject): node of the plugs
+        attributes(list of om.MObject): attributes to get the plugs of
+    """
+    plugs = []
+    for attribute in attributes:
+        plug = om.MPlug(obj, attribute)
+        if plug.isCompound:
+            plugs.extend(plug.child(i) for i in range(plug.numChildren()))
+        else:
+            plugs.append(plug)
+    return plugs
+
+
+def get_doubles(plug):
+    """Return the values of a double array plug as an (N,) float64 array."""
+    values = om.MFnDoubleArrayData(plug.asMObject()).array()
+    return np.array(values, dtype=np.float64).reshape(-1)
+
+
+def get_points(plug):
+    """Return the points of a point array plug as an (N, 3) float64 array.
+
+    NumPy reads the om.MPointArray through the sequence protocol, without a
+    Python loop over the points.
+    """
+    points = om.MFnPointArrayData(plug.asMObject()).array()
+    return np.array(points, dtype=np.float64).reshape(-1, 4)[:, :3]
+
+
+def get_matrix(plug):
+    """Return the values of a matrix plug as a tuple of 16 floats."""
+    return tuple(om.MFnMatrixData(plug.asMObject()).matrix())
+
+
+def is_plug_of(plug, attributes):
+    """Return whether the plug, or its parent compound, is one of the attributes.
+
+    Args:
+        plug(om.MPlug): plug to test
+        attributes(list of om.MObject): attributes to test against
+    """
+    if plug.isChild:
+        plug = plug.parent()
+    attribute = plug.attribute()
+    return any(attribute == other for other in attributes)
+
+
+def set_draw_dirty_on_evaluation(obj, context, evaluation_node, attributes):
+    """Dirty the node's draw when one of its drawn inputs is evaluated.
+
+    setDependentsDirty isn't called while the Evaluation Manager evaluates the
+    scene, this is to be called from the node's preEvaluation instead.
+
+    Args:
+        obj(om.MObject): node to dirty
+        context(om.MDGContext): context of the evaluation
+        evaluation_node(om.MEvaluationNode): node being evaluated
+        attributes(list of om.MObject): drawn inputs of the node
+    """
+    if not context.isNormal():
+        return
+    if any(evaluation_node.dirtyPlugExists(attribute) for attribute in attributes):
+        omr.MRenderer.setGeometryDrawDirty(obj)
+
+
+def add_draw_dirty_callback(obj):
+    """Dirty the node's draw whenever a model editor changes.
+
+    Display style changes don't dirty the node so draw overrides that are not
+    always dirty would keep drawing the old style otherwise.
+
+    Args:
+        obj(om.MObject): node to dirty
+
+    Returns:
+        int: id of the callback, to remove with om.MMessage.removeCallback
+    """
+    handle = om.MObjectHandle(obj)
+
+    def callback(*args):
+        if handle.isValid():
+            omr.MRenderer.setGeometryDrawDirty(handle.object())
+
+    return om.MEventMessage.addEventCallback("modelEditorChanged", callback)
+
+
+def get_bounding_box(bounds):
+    """Return an om.MBoundingBox from (minimum, maximum) corners."""
+    minimum, maximum = bounds
+    return om.MBoundingBox(om.MPoint(*minimum), om.MPoint(*maximum))
+
+
+def get_lod_subdivisions(obj_path, frame_context, bounds, previous=None, maximum=None):
+    """Return the subdivisions of a helper from its size on screen.
+
+    Args:
+        obj_path(om.MDagPath): path of the helper
+        frame_context(omr.MFrameContext): context of the frame being drawn
+        bounds(tuple): (minimum, maximum) corners of the helper's bounding box,
+            in object space
+        previous(int): subdivisions the helper was drawn with last time
+        maximum(int): subdivisions of the helper at full detail
+    """
+    lower, upper = np.asarray(bounds[0]), np.asarray(bounds[1])
+    center = om.MPoint(*((lower + upper) / 2))
+    radius = np.linalg.norm(upper - lower) / 2
+
+    matrix = obj_path.inclusiveMatrix()
+    world_center = center * matrix
+    scale = max(om.MTransformationMatrix(matrix).scale(om.MSpace.kWorld))
+
+    camera = om.MPoint(frame_context.getTuple(omr.MFrameContext.kViewPosition))
+    projection = frame_context.getMatrix(omr.MFrameContext.kProjectionMtx)
+    viewport_height = frame_context.getViewportDimensions()[3]
+
+    pixel_radius = lod.get_pixel_radius(
+        float(radius) * scale,
+        world_center.distanceTo(camera),
+        projection.getElement(1, 1),
+        viewport_height,
+        projection.getElement(3, 3) == 1,
+    )
+    return lod.get_subdivisions(pixel_radius, previous, maximum)
+
+
+def get_camera_distance(obj_path, frame_context, point):
+    """Return the distance between the camera and a point of a helper.
+
+    Args:
+        obj_path(om.MDagPath): path of the helper
+        frame_context(omr.MFrameContext): context of the frame being drawn
+        point(om.MPoint): point in object space
+    """
+    camera = om.MPoint(frame_context.getTuple(omr.MFrameContext.kViewPosition))
+    return (point * obj_path.inclusiveMatrix()).distanceTo(camera)
+
+
+def is_label_visible(obj_path, frame_context, position):
+    """Return whether the label of a helper is drawn, see mrh.labels.
+
+    Args:
+        obj_path(om.MDagPath): path of the helper
+        frame_context(omr.MFrameContext): context of the frame being drawn
+        position(om.MPoint): position of the label in object space
+    """
+    if not labels.settings.enabled:
+        return True
+    distance = 0.0
+    if labels.settings.max_distance:
+        distance = get_camera_distance(obj_path, frame_context, position)
+    return labels.is_visible(distance)
+
+
+def _to_array(matrix):
+    """Return an om.MMatrix, or its 16 values, as a (4, 4) array."""
+    return np.array(tuple(matrix), dtype=np.float64).reshape(4, 4)
+
+
+def _apply(points, matrix):
+    """Return (N, 3) points transformed by a (4, 4) projective matrix."""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    result = np.dot(points, matrix[:3]) + matrix[3]
+    return result[:, :3] / result[:, 3:]
 
 
-def get_aim_matrix(origin, target, up_vector=om.MGlobal.upAxis()):
+def select_helper(select_info, obj_path, inputs, selection_list, world_space_hit_pts):
+    """Select a helper whose shape is in the selection region.
+
+    The ray through the center of the region is tested against the exact
+    shape of the helper, then the points of its coarse outline against the
+    whole region, so neither depends on the subdivisions of the helper. The
+    alignment matrix of the selection maps the region to [-1, 1] along X and Y.
+
+    Args:
+        select_info(omr.MSelectionInfo): selection being made
+        obj_path(om.MDagPath): path of the helper
+        inputs(HelperInputs): inputs the helper was last drawn with
+        selection_list(om.MSelectionList): list to add the helper to
+        world_space_hit_pts(om.MPointArray): array to add the hit point to
+
+    Returns:
+        bool: whether the helper was selected
+    """
+    mask = om.MSelectionMask(om.MSelectionMask.kSelectLocators)
+    if not select_info.selectable(mask):
+        return False
+
+    to_world = _to_array(obj_path.inclusiveMatrix())
+    if inputs.selection_matrix() is not None:
+        to_world = np.dot(_to_array(inputs.selection_matrix()), to_world)
+    to_selection = np.dot(to_world, _to_array(select_info.getAlignmentMatrix()))
+    try:
+        from_selection = np.linalg.inv(to_selection)
+    except np.linalg.LinAlgError:
+        # flattened to a point or a plane, like an aimed helper whose target
+        # is on its origin, there is nothing to select
+        return False
+
+    # ray through the center of the region, from the near plane towards the
+    # middle of the depth range, which stays finite with an infinite far plane
+    ends = _apply([(0, 0, -1), (0, 0, 0)], from_selection)
+    distance = inputs.hit_test(ends[0], ends[1] - ends[0])
+
+    if distance is not None:
+        hit = ends[0] + (ends[1] - ends[0]) * distance
+    else:
+        points = inputs.outline()
+        projected = np.dot(points, to_selection[:3]) + to_selection[3]
+        inside = projected[:, 3] > 0
+        inside &= np.all(np.abs(projected[:, :2]) <= projected[:, 3:], axis=1)
+        if not inside.any():
+            return False
+        hit = points[inside.argmax()]
+
+    selection_list.add(obj_path)
+    world_space_hit_pts.append(om.MPoint(*_apply(hit, to_world)[0]))
+    return True
+
+
+def compute_aim(data_block, origin, target, aim_matrix, length, direction):
+    """Compute the aim outputs of a helper and set them clean.
+
+    The aim is computed once, the outputs are all derived from it.
+
+    Args:
+        data_block(om.MDataBlock): data block of the node
+        origin(om.MObject): origin point attribute
+        target(om.MObject): target point attribute
+        aim_matrix(om.MObject): aim matrix output attribute
+        length(om.MObject): distance from the origin to the target output
+            attribute
+        direction(om.MObject): normalized direction from the origin to the
+            target output attribute
+
+    Returns:
+        float: distance from the origin to the target
+    """
+    origin = data_block.inputValue(origin).asFloat3()
+    target = data_block.inputValue(target).asFloat3()
+    up_vector = tuple(om.MGlobal.upAxis())
+    frame = geometry.aim_frame(origin, target, up_vector)
+    distance = om.MPoint(target).distanceTo(om.MPoint(origin))
+
+    data_block.outputValue(aim_matrix).setMMatrix(om.MMatrix(frame.ravel().tolist()))
+    data_block.outputValue(length).setMDistance(om.MDistance(distance))
+    data_block.outputValue(direction).set3Float(*frame[1, :3].tolist())
+    data_block.setClean(aim_matrix)
+    data_block.setClean(length)
+    data_block.setClean(direction)
+    return distance
+
+
+def get_aim_points(aim_matrix, length):
+    """Return the origin and target of an aim matrix computed by compute_aim.
+
+    Args:
+        aim_matrix(tuple): 16 floats of the row major aim matrix
+        length(float): distance from the origin to the target
+    """
+    origin = tuple(aim_matrix[12:15])
+    target = tuple(o + a * length for o, a in zip(origin, aim_matrix[4:7]))
+    return origin, target
+
+
+def get_aim_transform(obj_path, aim_matrix, scale=1.0):
+    """Return the matrix drawing a mesh built along +Y at the aim of a helper.
+
+    Args:
+        obj_path(om.MDagPath): path of the helper
+        aim_matrix(om.MPlug): aim matrix output of the helper
+        scale(float): uniform scale of the mesh, applied before the aim matrix
+    """
+    matrix = om.MFnMatrixData(aim_matrix.asMObject()).matrix()
+    if scale != 1.0:
+        # fmt: off
+        scale_matrix = om.MMatrix(
+            [
+                scale,  0,      0,      0,
+                0,      scale,  0,      0,
+                0,      0,      scale,  0,
+                0,      0,      0,      1,
+            ]
+        )
+        # fmt: on
+        matrix = scale_matrix * matrix
+    return matrix * obj_path.inclusiveMatrix()
+
+
+def get_aim_matrix(origin, target, up_vector=None):
     """Return the aim matrix aiming from the origin to the target.
 
     The aim vector will be the Y Axis
@@ -33,24 +578,422 @@ def get_aim_matrix(origin, target, up_vector=om.MGlobal.upAxis()):
     Args:
         origin(om.MPoint): origin point
         target(om.MPoint): target point
+        up_vector(om.MVector): up vector, the scene's up axis by default
     """
-    aim_vector = om.MVector(target - origin).normalize()
+    if up_vector is None:
+        up_vector = om.MGlobal.upAxis()
+    frame = geometry.aim_frame(origin, target, up_vector)
+    return om.MMatrix(frame.ravel().tolist())
 
-    if aim_vector.isParallel(up_vector):
-        up_vector.x += 1
-        up_vector.normalize()
 
-    normal_vector = (aim_vector ^ up_vector).normalize()
-    new_up_vector = (aim_vector ^ normal_vector).normalize()
+def get_backend(default=DRAW_OVERRIDE):
+    """Return the backend set by the MRH_BACKEND environment variable.
 
-    # fmt: off
-    aim_matrix = om.MMatrix(
-        [
-            normal_vector.x,    normal_vector.y,    normal_vector.z,    0,
-            aim_vector.x,       aim_vector.y,       aim_vector.z,       0,
-            new_up_vector.x,    new_up_vector.y,    new_up_vector.z,    0,
-            origin.x,           origin.y,           origin.z,           1,
-        ]
-    )
-    # fmt: on
-    return aim_matrix
+    Args:
+        default(str): backend returned when the variable isn't set
+    """
+    backend = os.environ.get("MRH_BACKEND", default)
+    if backend not in (DRAW_OVERRIDE, GEOMETRY_OVERRIDE):
+        logger.warning("Unknown MRH_BACKEND: {0}".format(backend))
+        return default
+    return backend
+
+
+def register_helper(
+    plugin_fn,
+    node_class,
+    draw_override,
+    geometry_override=None,
+    default_backend=DRAW_OVERRIDE,
+):
+    """Register a node type and its viewport 2.0 override.
+
+    Args:
+        plugin_fn(om.MFnPlugin): plugin registering the node type
+        node_class(type): locator node class, with the TYPE_NAME, TYPE_ID,
+            DRAW_CLASSIFICATION and DRAW_REGISTRANT_ID of the node type
+        draw_override(type): omr.MPxDrawOverride subclass of the node
+        geometry_override(type): HelperGeometryOverride subclass of the node
+        default_backend(str): backend used when MRH_BACKEND isn't set
+    """
+    try:
+        plugin_fn.registerNode(
+            node_class.TYPE_NAME,
+            node_class.TYPE_ID,
+            node_class.creator,
+            node_class.initialize,
+            om.MPxNode.kLocatorNode,
+            node_class.DRAW_CLASSIFICATION,
+        )
+    except Exception:
+        logger.error("Failed to register node: {0}".format(node_class.TYPE_NAME))
+
+    try:
+        register_override(
+            node_class.DRAW_CLASSIFICATION,
+            node_class.DRAW_REGISTRANT_ID,
+            draw_override,
+            geometry_override,
+            default_backend,
+        )
+    except Exception:
+        logger.error("Failed to register draw override: {0}".format(draw_override.NAME))
+
+    watch_draw_override(node_class.TYPE_NAME, draw_override)
+
+
+def deregister_helper(plugin_fn, node_class, draw_override):
+    """Deregister a node type registered by register_helper.
+
+    Args:
+        plugin_fn(om.MFnPlugin): plugin that registered the node type
+        node_class(type): locator node class
+        draw_override(type): omr.MPxDrawOverride subclass of the node
+    """
+    try:
+        deregister_override(
+            node_class.DRAW_CLASSIFICATION, node_class.DRAW_REGISTRANT_ID
+        )
+    except Exception:
+        logger.error(
+            "Failed to deregister draw override: {0}".format(draw_override.NAME)
+        )
+
+    try:
+        plugin_fn.deregisterNode(node_class.TYPE_ID)
+    except Exception:
+        logger.error("Failed to deregister node: {0}".format(node_class.TYPE_NAME))
+
+
+def register_override(
+    classification,
+    registrant_id,
+    draw_override,
+    geometry_override=None,
+    default_backend=DRAW_OVERRIDE,
+):
+    """Register the viewport 2.0 override of a node type for the current backend.
+
+    Args:
+        classification(str): draw classification of the node type
+        registrant_id(str): id of the registrant
+        draw_override(type): omr.MPxDrawOverride subclass of the node
+        geometry_override(type): HelperGeometryOverride subclass of the node,
+            the draw override is used if None
+        default_backend(str): backend used when MRH_BACKEND isn't set
+
+    Returns:
+        str: backend registered
+    """
+    backend = get_backend(default_backend)
+    if backend == GEOMETRY_OVERRIDE and geometry_override is not None:
+        omr.MDrawRegistry.registerGeometryOverrideCreator(
+            classification, registrant_id, geometry_override.creator
+        )
+    else:
+        backend = DRAW_OVERRIDE
+        omr.MDrawRegistry.registerDrawOverrideCreator(
+            classification, registrant_id, draw_override.creator
+        )
+    _backends[classification] = backend
+    return backend
+
+
+def deregister_override(classification, registrant_id):
+    """Deregister the override registered by register_override."""
+    backend = _backends.pop(classification, DRAW_OVERRIDE)
+    if backend == GEOMETRY_OVERRIDE:
+        omr.MDrawRegistry.deregisterGeometryOverrideCreator(
+            classification, registrant_id
+        )
+    else:
+        omr.MDrawRegistry.deregisterDrawOverrideCreator(classification, registrant_id)
+
+
+class HelperDrawOverrideBase(omr.MPxDrawOverride):
+    """Draw a helper through the draw manager from the mesh of its inputs.
+
+    The inputs are read once per draw and the mesh is only built again when
+    their :meth:`~HelperInputs.shape` changes, the other inputs only change
+    the colors or the transform. Subclasses implement :meth:`build_mesh`, and
+    :meth:`transform` when the mesh isn't built in object space.
+
+    Args:
+        obj(om.MObject): node drawn
+        attributes(list of om.MObject): attributes read by inputs_class
+        inputs_class(type): HelperInputs subclass of the node
+    """
+
+    #: Whether the subdivisions follow the size on screen when mrh.lod is
+    #: enabled. The field helpers opt out, as reading all their inputs on
+    #: every camera move costs more than the level of detail saves.
+    LOD = True
+
+    def __init__(self, obj, attributes, inputs_class):
+        super(HelperDrawOverrideBase, self).__init__(obj, None, self.is_always_dirty())
+        self._callback_id = add_draw_dirty_callback(obj)
+        self._plugs = get_plugs(obj, attributes)
+        self._inputs_class = inputs_class
+
+    def __del__(self):
+        om.MMessage.removeCallback(self._callback_id)
+
+    @classmethod
+    def creator(cls, obj):
+        return cls(obj)
+
+    @classmethod
+    def is_always_dirty(cls):
+        """Return whether the helpers are drawn again whenever the camera moves."""
+        return cls.LOD and lod.settings.enabled
+
+    def build_mesh(self, inputs, out=None):
+        """Return the mrh.geometry.Mesh of the helper, built in ``out`` if it fits."""
+        raise NotImplementedError
+
+    def draw_annotations(self, draw_manager, data):
+        """Draw what goes on top of the mesh, like labels, nothing by default."""
+        pass
+
+    def prepareForDraw(self, obj_path, camera_path, frame_context, old_data):
+        data = old_data
+        if not isinstance(data, HelperData):
+            data = HelperData()
+
+        inputs = self._inputs_class.from_plugs(self._plugs)
+        if self.LOD and lod.settings.enabled:
+            previous = data.inputs.subdivisions if data.inputs else None
+            inputs.subdivisions = get_lod_subdivisions(
+                obj_path,
+                frame_context,
+                inputs.bounds(),
+                previous,
+                inputs.subdivisions,
+            )
+        if data.inputs == inputs:
+            return data
+        reshape = data.inputs is None or data.inputs.shape() != inputs.shape()
+        data.inputs = inputs
+
+        data.surface_color = om.MColor(inputs.color)
+        data.surface_color.a = 0.25
+        data.wire_color = om.MColor(inputs.color)
+
+        # moving the helper only changes its transform
+        if reshape:
+            data.set_mesh(self.build_mesh(inputs, data.vertex_buffer))
+        return data
+
+    def isBounded(self, obj_path, camera_path):
+        return True
+
+    def boundingBox(self, obj_path, camera_path):
+        inputs = self._inputs_class.from_plugs(self._plugs)
+        return get_bounding_box(inputs.canonical_bounds())
+
+    def supportedDrawAPIs(self):
+        return omr.MRenderer.kAllDevices
+
+    def hasUIDrawables(self):
+        return True
+
+    def isTransparent(self):
+        return True
+
+    def wantUserSelection(self):
+        return True
+
+    def userSelect(
+        self,
+        select_info,
+        draw_context,
+        obj_path,
+        data,
+        selection_list,
+        world_space_hit_pts,
+    ):
+        if not isinstance(data, HelperData) or data.inputs is None:
+            return False
+        return select_helper(
+            select_info,
+            obj_path,
+            data.inputs,
+            selection_list,
+            world_space_hit_pts,
+        )
+
+    def addUIDrawables(self, obj_path, draw_manager, frame_context, data):
+        if not isinstance(data, HelperData) or not len(data.vertices):
+            return
+
+        draw_manager.beginDrawable()
+
+        draw_manager.setColor(data.surface_color)
+        draw_manager.setDepthPriority(5)
+
+        display_style = frame_context.getDisplayStyle()
+        if data.inputs.draw_shaded and display_style & omr.MFrameContext.kGouraudShaded:
+            data.draw_triangles(draw_manager)
+
+        if data.inputs.draw_wireframe and display_style & omr.MFrameContext.kWireFrame:
+            draw_manager.setColor(data.wire_color)
+            data.draw_lines(draw_manager)
+
+        self.draw_annotations(draw_manager, data)
+        draw_manager.endDrawable()
+
+
+def fill_buffer(buffer, array):
+    """Copy a contiguous array into an omr.MVertexBuffer or omr.MIndexBuffer.
+
+    Args:
+        buffer: buffer to fill, sized from the length of the array
+        array(np.ndarray): (N, 3) float32 points or (N,) uint32 indices
+    """
+    address = buffer.acquire(len(array), True)
+    ctypes.memmove(address, array.ctypes.data, array.nbytes)
+    buffer.commit(address)
+
+
+class HelperGeometryOverride(omr.MPxGeometryOverride):
+    """Draw a helper from vertex and index buffers kept by viewport 2.0.
+
+    The buffers are only filled again when the mesh of the helper changes,
+    so unlike the draw overrides nothing is sent to the GPU on the frames a
+    helper doesn't change. Subclasses implement :meth:`build_mesh`.
+
+    Args:
+        obj(om.MObject): node drawn
+        attributes(list of om.MObject): attributes read by inputs_class
+        inputs_class(type): HelperInputs subclass of the node
+    """
+
+    SHADED_ITEM = "shaded"
+    WIREFRAME_ITEM = "wireframe"
+
+    def __init__(self, obj, attributes, inputs_class):
+        super(HelperGeometryOverride, self).__init__(obj)
+        self._plugs = get_plugs(obj, attributes)
+        self._inputs_class = inputs_class
+        self._data = HelperData()
+        self._geometry_dirty = True
+        self._indexing_dirty = True
+
+        self._shader_manager = omr.MRenderer.getShaderManager()
+        self._shaders = {}
+
+    def __del__(self):
+        for shader in self._shaders.values():
+            self._shader_manager.releaseShader(shader)
+
+    @classmethod
+    def creator(cls, obj):
+        return cls(obj)
+
+    def build_mesh(self, inputs, out=None):
+        """Return the mrh.geometry.Mesh of the helper, in object space.
+
+        The points are built in ``out`` if they fit, see mrh.geometry.
+        """
+        raise NotImplementedError
+
+    def supportedDrawAPIs(self):
+        return omr.MRenderer.kAllDevices
+
+    def hasUIDrawables(self):
+        return False
+
+    def updateDG(self):
+        data = self._data
+        inputs = self._inputs_class.from_plugs(self._plugs)
+        previous = data.inputs
+        if previous == inputs:
+            self._geometry_dirty = self._indexing_dirty = False
+            return
+        data.inputs = inputs
+
+        self._geometry_dirty = (
+            previous is None
+            or previous.shape() != inputs.shape()
+            or previous.placement() != inputs.placement()
+        )
+        if not self._geometry_dirty:
+            self._indexing_dirty = False
+            return
+
+        lines, triangles = data.lines_indices, data.triangles_indices
+        data.set_mesh(self.build_mesh(inputs, data.vertex_buffer))
+        self._indexing_dirty = (
+            previous is None
+            or data.lines_indices is not lines
+            or data.triangles_indices is not triangles
+        )
+
+    def updateRenderItems(self, obj_path, render_items):
+        inputs = self._data.inputs
+        surface_color = list(inputs.color) + [0.25]
+        wire_color = list(inputs.color) + [1.0]
+        for name, primitive, draw_mode, enabled, color in (
+            (
+                self.SHADED_ITEM,
+                omr.MGeometry.kTriangles,
+                omr.MGeometry.kShaded | omr.MGeometry.kTextured,
+                inputs.draw_shaded,
+                surface_color,
+            ),
+            (
+                self.WIREFRAME_ITEM,
+                omr.MGeometry.kLines,
+                omr.MGeometry.kWireframe,
+                inputs.draw_wireframe,
+                wire_color,
+            ),
+        ):
+            index = render_items.indexOf(name)
+            if index < 0:
+                item = omr.MRenderItem.create(
+                    name, omr.MRenderItem.DecorationItem, primitive
+                )
+                item.setDrawMode(draw_mode)
+                item.setDepthPriority(5)
+                render_items.append(item)
+            else:
+                item = render_items[index]
+
+            shader = self._shaders.get(name)
+            if shader is None:
+                shader = self._shader_manager.getStockShader(
+                    omr.MShaderManager.k3dSolidShader
+                )
+                shader.setIsTransparent(color[3] < 1)
+                self._shaders[name] = shader
+            shader.setParameter("solidColor", color)
+            item.setShader(shader)
+            item.enable(enabled)
+
+    def isStreamDirty(self, descriptor):
+        return self._geometry_dirty
+
+    def isIndexingDirty(self, item):
+        return self._indexing_dirty
+
+    def populateGeometry(self, requirements, render_items, geometry_data):
+        data = self._data
+        for descriptor in requirements.vertexRequirements():
+            if descriptor.semantic == omr.MGeometry.kPosition:
+                buffer = geometry_data.createVertexBuffer(descriptor)
+                fill_buffer(buffer, data.vertices)
+
+        for item in render_items:
+            if item.name() == self.SHADED_ITEM:
+                indices = data.triangles_indices
+            elif item.name() == self.WIREFRAME_ITEM:
+                indices = data.lines_indices
+            else:
+                continue
+            buffer = geometry_data.createIndexBuffer(omr.MGeometry.kUnsignedInt32)
+            fill_buffer(buffer, indices)
+            item.associateWithIndexBuffer(buffer)
+
+    def cleanUp(self):
+        pass
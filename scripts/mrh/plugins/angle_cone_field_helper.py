@@ -0,0 +1,296 @@
+from __future__ import print_function
+
+import logging
+
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaRender as omr
+import maya.api.OpenMayaUI as omui
+import numpy as np
+from mrh import geometry
+from mrh.plugins import (
+    GEOMETRY_OVERRIDE,
+    HelperDrawOverrideBase,
+    HelperGeometryOverride,
+    HelperInputs,
+    deregister_helper,
+    get_bounding_box,
+    get_doubles,
+    get_plugs,
+    get_points,
+    is_plug_of,
+    register_helper,
+    set_draw_dirty_on_evaluation,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AngleConeFieldHelperNode(omui.MPxLocatorNode):
+    TYPE_NAME = "angleConeFieldHelper"
+    TYPE_ID = om.MTypeId(0x00136205)
+    DRAW_CLASSIFICATION = "drawdb/geometry/angleConeFieldHelper"
+    DRAW_REGISTRANT_ID = "AngleConeFieldHelperNode"
+
+    angles = None
+
+    origins = None
+    targets = None
+
+    colorR = None
+    colorG = None
+    colorB = None
+
+    subdivisions = None
+    drawShaded = None
+    drawWireframe = None
+
+    draw_inputs = []
+
+    def __init__(self):
+        super(AngleConeFieldHelperNode, self).__init__()
+        self._plugs = []
+
+    def postConstructor(self):
+        self._plugs = get_plugs(
+            self.thisMObject(), AngleConeFieldHelperNode.draw_inputs
+        )
+
+    def isBounded(self):
+        return True
+
+    def boundingBox(self):
+        inputs = AngleConeFieldHelperInputs.from_plugs(self._plugs)
+        return get_bounding_box(inputs.bounds())
+
+    def setDependentsDirty(self, plug, plug_array):
+        if is_plug_of(plug, AngleConeFieldHelperNode.draw_inputs):
+            omr.MRenderer.setGeometryDrawDirty(self.thisMObject())
+
+    def preEvaluation(self, context, evaluation_node):
+        set_draw_dirty_on_evaluation(
+            self.thisMObject(),
+            context,
+            evaluation_node,
+            AngleConeFieldHelperNode.draw_inputs,
+        )
+
+    @classmethod
+    def creator(cls):
+        return AngleConeFieldHelperNode()
+
+    @classmethod
+    def initialize(cls):
+        typedFn = om.MFnTypedAttribute()
+        pointArrayFn = om.MFnPointArrayData()
+
+        AngleConeFieldHelperNode.origins = typedFn.create(
+            "origins", "os", om.MFnData.kPointArray, pointArrayFn.create()
+        )
+        om.MPxNode.addAttribute(AngleConeFieldHelperNode.origins)
+
+        AngleConeFieldHelperNode.targets = typedFn.create(
+            "targets", "ts", om.MFnData.kPointArray, pointArrayFn.create()
+        )
+        om.MPxNode.addAttribute(AngleConeFieldHelperNode.targets)
+
+        doubleArrayFn = om.MFnDoubleArrayData()
+        AngleConeFieldHelperNode.angles = typedFn.create(
+            "angles", "ans", om.MFnData.kDoubleArray, doubleArrayFn.create()
+        )
+        om.MPxNode.addAttribute(AngleConeFieldHelperNode.angles)
+
+        numericFn = om.MFnNumericAttribute()
+
+        AngleConeFieldHelperNode.colorR = numericFn.create(
+            "colorR", "cr", om.MFnNumericData.kFloat, 1
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleConeFieldHelperNode.colorR)
+
+        AngleConeFieldHelperNode.colorG = numericFn.create(
+            "colorG", "cg", om.MFnNumericData.kFloat, 0
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleConeFieldHelperNode.colorG)
+
+        AngleConeFieldHelperNode.colorB = numericFn.create(
+            "colorB", "cb", om.MFnNumericData.kFloat, 0
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleConeFieldHelperNode.colorB)
+
+        AngleConeFieldHelperNode.subdivisions = numericFn.create(
+            "subdivisions", "sbd", om.MFnNumericData.kInt, 16
+        )
+        numericFn.setMin(3)
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleConeFieldHelperNode.subdivisions)
+
+        AngleConeFieldHelperNode.drawShaded = numericFn.create(
+            "drawShaded", "dsh", om.MFnNumericData.kBoolean, True
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleConeFieldHelperNode.drawShaded)
+
+        AngleConeFieldHelperNode.drawWireframe = numericFn.create(
+            "drawWireframe", "dwf", om.MFnNumericData.kBoolean, True
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleConeFieldHelperNode.drawWireframe)
+
+        AngleConeFieldHelperNode.draw_inputs = [
+            AngleConeFieldHelperNode.angles,
+            AngleConeFieldHelperNode.origins,
+            AngleConeFieldHelperNode.targets,
+            AngleConeFieldHelperNode.colorR,
+            AngleConeFieldHelperNode.colorG,
+            AngleConeFieldHelperNode.colorB,
+            AngleConeFieldHelperNode.subdivisions,
+            AngleConeFieldHelperNode.drawShaded,
+            AngleConeFieldHelperNode.drawWireframe,
+        ]
+
+
+class AngleConeFieldHelperInputs(HelperInputs):
+    __slots__ = (
+        "color",
+        "origins",
+        "targets",
+        "angles",
+        "subdivisions",
+        "draw_shaded",
+        "draw_wireframe",
+    )
+
+    @classmethod
+    def from_plugs(cls, plugs):
+        (
+            angles,
+            origins,
+            targets,
+            r,
+            g,
+            b,
+            subdivisions,
+            shaded,
+            wireframe,
+        ) = plugs
+        origins = get_points(origins)
+        targets = get_points(targets)
+        angles = np.radians(get_doubles(angles))
+        count = min(len(origins), len(targets), len(angles))
+        return cls(
+            (r.asFloat(), g.asFloat(), b.asFloat()),
+            origins[:count],
+            targets[:count],
+            angles[:count],
+            subdivisions.asInt(),
+            shaded.asBool(),
+            wireframe.asBool(),
+        )
+
+    def key(self):
+        return (
+            self.color,
+            self.origins.tobytes(),
+            self.targets.tobytes(),
+            self.angles.tobytes(),
+            self.subdivisions,
+            self.draw_shaded,
+            self.draw_wireframe,
+        )
+
+    def shape(self):
+        return (
+            self.origins.tobytes(),
+            self.targets.tobytes(),
+            self.angles.tobytes(),
+            self.subdivisions,
+        )
+
+    def bounds(self):
+        return geometry.cone_fans_bounds(self.origins, self.targets, self.angles)
+
+
+class AngleConeFieldHelperDrawOverride(HelperDrawOverrideBase):
+    NAME = "AngleConeFieldHelperDrawOverride"
+    LOD = False
+
+    def __init__(self, obj):
+        super(AngleConeFieldHelperDrawOverride, self).__init__(
+            obj, AngleConeFieldHelperNode.draw_inputs, AngleConeFieldHelperInputs
+        )
+
+    def build_mesh(self, inputs, out=None):
+        return build_mesh(inputs, out)
+
+    def wantUserSelection(self):
+        return False
+
+
+class AngleConeFieldHelperGeometryOverride(HelperGeometryOverride):
+    NAME = "AngleConeFieldHelperGeometryOverride"
+
+    def __init__(self, obj):
+        super(AngleConeFieldHelperGeometryOverride, self).__init__(
+            obj, AngleConeFieldHelperNode.draw_inputs, AngleConeFieldHelperInputs
+        )
+
+    def build_mesh(self, inputs, out=None):
+        return build_mesh(inputs, out)
+
+
+def build_mesh(inputs, out=None):
+    """Return the mrh.geometry.Mesh of all the cones of the inputs, in one buffer."""
+    return geometry.cone_fans(
+        inputs.origins,
+        inputs.targets,
+        inputs.angles,
+        inputs.subdivisions,
+        tuple(om.MGlobal.upAxis()),
+        out=out,
+    )
+
+
+def register(plugin_fn):
+    # building the points of thousands of items for the draw manager on every
+    # change is too slow, the geometry override fills its buffers in one copy
+    register_helper(
+        plugin_fn,
+        AngleConeFieldHelperNode,
+        AngleConeFieldHelperDrawOverride,
+        AngleConeFieldHelperGeometryOverride,
+        GEOMETRY_OVERRIDE,
+    )
+
+
+def deregister(plugin_fn):
+    deregister_helper(
+        plugin_fn, AngleConeFieldHelperNode, AngleConeFieldHelperDrawOverride
+    )
+
+
+if __name__ == "__main__":
+    import maya.cmds as cmds
+
+    cmds.file(new=True, force=True)
+
+    plugin_name = "maya_rigging_helpers.py"
+
+    if cmds.pluginInfo(plugin_name, q=True, loaded=True):
+        cmds.unloadPlugin(plugin_name)
+    if not cmds.pluginInfo(plugin_name, q=True, loaded=True):
+        cmds.loadPlugin(plugin_name)
+
+    origins = [(i, 0, 0, 1) for i in range(10)]
+    targets = [(i, 1, 0, 1) for i in range(10)]
+    angles = [(i + 1) * 10 for i in range(10)]
+
+    angle_cone_field_helper = cmds.createNode("angleConeFieldHelper")
+    cmds.setAttr(
+        angle_cone_field_helper + ".origins", len(origins), *origins, type="pointArray"
+    )
+    cmds.setAttr(
+        angle_cone_field_helper + ".targets", len(targets), *targets, type="pointArray"
+    )
+    cmds.setAttr(angle_cone_field_helper + ".angles", angles, type="doubleArray")
@@ -6,7 +6,23 @@ import math
 import maya.api.OpenMaya as om
 import maya.api.OpenMayaRender as omr
 import maya.api.OpenMayaUI as omui
-from mrh.plugins import HelperData, get_aim_matrix
+from mrh import geometry
+from mrh.plugins import (
+    OUTLINE_SUBDIVISIONS,
+    HelperDrawOverrideBase,
+    HelperGeometryOverride,
+    HelperInputs,
+    compute_aim,
+    deregister_helper,
+    get_aim_points,
+    get_aim_transform,
+    get_bounding_box,
+    get_matrix,
+    get_plugs,
+    is_plug_of,
+    register_helper,
+    set_draw_dirty_on_evaluation,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +42,63 @@ class AngleConeHelperNode(omui.MPxLocatorNode):
     colorG = None
     colorB = None
 
+    subdivisions = None
+    drawShaded = None
+    drawWireframe = None
+
+    aimMatrix = None
+    length = None
+    direction = None
+    coneRadius = None
+
+    draw_inputs = []
+    draw_outputs = []
+    #: Attributes read by the draw override, the aim comes from the outputs.
+    draw_attributes = []
+
     def __init__(self):
         super(AngleConeHelperNode, self).__init__()
+        self._plugs = []
+
+    def postConstructor(self):
+        self._plugs = get_plugs(self.thisMObject(), AngleConeHelperNode.draw_attributes)
+
+    def isBounded(self):
+        return True
+
+    def boundingBox(self):
+        return get_bounding_box(AngleConeHelperInputs.from_plugs(self._plugs).bounds())
+
+    def setDependentsDirty(self, plug, plug_array):
+        if is_plug_of(plug, AngleConeHelperNode.draw_inputs):
+            omr.MRenderer.setGeometryDrawDirty(self.thisMObject())
+
+    def preEvaluation(self, context, evaluation_node):
+        set_draw_dirty_on_evaluation(
+            self.thisMObject(),
+            context,
+            evaluation_node,
+            AngleConeHelperNode.draw_inputs,
+        )
+
+    def compute(self, plug, data_block):
+        if not is_plug_of(plug, AngleConeHelperNode.draw_outputs):
+            return None
+
+        length = compute_aim(
+            data_block,
+            AngleConeHelperNode.origin,
+            AngleConeHelperNode.target,
+            AngleConeHelperNode.aimMatrix,
+            AngleConeHelperNode.length,
+            AngleConeHelperNode.direction,
+        )
+
+        angle = data_block.inputValue(AngleConeHelperNode.angle).asDouble()
+        radius = geometry.cone_radius(length, angle)
+        cone_radius = data_block.outputValue(AngleConeHelperNode.coneRadius)
+        cone_radius.setMDistance(om.MDistance(radius))
+        data_block.setClean(AngleConeHelperNode.coneRadius)
 
     @classmethod
     def creator(cls):
@@ -74,234 +145,195 @@ class AngleConeHelperNode(omui.MPxLocatorNode):
         numericFn.channelBox = True
         om.MPxNode.addAttribute(AngleConeHelperNode.colorB)
 
+        AngleConeHelperNode.subdivisions = numericFn.create(
+            "subdivisions", "sbd", om.MFnNumericData.kInt, 100
+        )
+        numericFn.setMin(3)
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleConeHelperNode.subdivisions)
 
-class AngleConeHelperDrawOverride(omr.MPxDrawOverride):
-    NAME = "AngleConeHelperDrawOverride"
-
-    subdivisions = 100
-
-    def __init__(self, obj):
-        super(AngleConeHelperDrawOverride, self).__init__(obj, None, True)
-
-    def prepareForDraw(self, obj_path, camera_path, frame_context, old_data):
-        data = old_data
-        if not isinstance(data, HelperData):
-            data = HelperData()
-
-        data.surface_color = AngleConeHelperDrawOverride._get_color(obj_path)
-        data.surface_color.a = 0.25
-        data.wire_color = AngleConeHelperDrawOverride._get_color(obj_path)
+        AngleConeHelperNode.drawShaded = numericFn.create(
+            "drawShaded", "dsh", om.MFnNumericData.kBoolean, True
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleConeHelperNode.drawShaded)
 
-        data.points.clear()
-        data.triangles_indices = []
-        data.lines_indices = []
+        AngleConeHelperNode.drawWireframe = numericFn.create(
+            "drawWireframe", "dwf", om.MFnNumericData.kBoolean, True
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleConeHelperNode.drawWireframe)
 
-        data = self._generate_points(data, obj_path)
-        data = self._generate_lines(data)
-        data = self._generate_triangles(data)
-        return data
+        matrixFn = om.MFnMatrixAttribute()
+        AngleConeHelperNode.aimMatrix = matrixFn.create("aimMatrix", "am")
+        matrixFn.writable = False
+        matrixFn.storable = False
+        om.MPxNode.addAttribute(AngleConeHelperNode.aimMatrix)
 
-    def _generate_points(self, data, obj_path):
-        origin = self._get_origin(obj_path)
-        target = self._get_target(obj_path)
-        aim_matrix = get_aim_matrix(origin, target)
-        height = self._get_height(obj_path)
+        AngleConeHelperNode.length = unitFn.create(
+            "length", "len", om.MFnUnitAttribute.kDistance
+        )
+        unitFn.writable = False
+        unitFn.storable = False
+        om.MPxNode.addAttribute(AngleConeHelperNode.length)
 
-        angle = AngleConeHelperDrawOverride._get_angle(obj_path)
-        radius = math.tan(angle.asRadians() / 2) * height
-        angle_offset = math.pi * 2 / self.subdivisions
+        AngleConeHelperNode.direction = numericFn.createPoint("direction", "dir")
+        numericFn.writable = False
+        numericFn.storable = False
+        om.MPxNode.addAttribute(AngleConeHelperNode.direction)
 
-        data.points.append(om.MPoint(0, 0, 0) * aim_matrix)
-        for i in range(self.subdivisions + 1):
-            angle = i * angle_offset
-            x = math.cos(angle) * radius
-            y = height
-            z = math.sin(angle) * radius
-            data.points.append(om.MPoint(x, y, z) * aim_matrix)
+        AngleConeHelperNode.coneRadius = unitFn.create(
+            "coneRadius", "cnr", om.MFnUnitAttribute.kDistance
+        )
+        unitFn.writable = False
+        unitFn.storable = False
+        om.MPxNode.addAttribute(AngleConeHelperNode.coneRadius)
+
+        AngleConeHelperNode.draw_outputs = [
+            AngleConeHelperNode.aimMatrix,
+            AngleConeHelperNode.length,
+            AngleConeHelperNode.direction,
+            AngleConeHelperNode.coneRadius,
+        ]
+        for output in AngleConeHelperNode.draw_outputs:
+            om.MPxNode.attributeAffects(AngleConeHelperNode.origin, output)
+            om.MPxNode.attributeAffects(AngleConeHelperNode.target, output)
+        om.MPxNode.attributeAffects(
+            AngleConeHelperNode.angle, AngleConeHelperNode.coneRadius
+        )
 
-        return data
+        AngleConeHelperNode.draw_inputs = [
+            AngleConeHelperNode.angle,
+            AngleConeHelperNode.origin,
+            AngleConeHelperNode.target,
+            AngleConeHelperNode.colorR,
+            AngleConeHelperNode.colorG,
+            AngleConeHelperNode.colorB,
+            AngleConeHelperNode.subdivisions,
+            AngleConeHelperNode.drawShaded,
+            AngleConeHelperNode.drawWireframe,
+        ]
+        AngleConeHelperNode.draw_attributes = [
+            AngleConeHelperNode.angle,
+            AngleConeHelperNode.aimMatrix,
+            AngleConeHelperNode.length,
+            AngleConeHelperNode.colorR,
+            AngleConeHelperNode.colorG,
+            AngleConeHelperNode.colorB,
+            AngleConeHelperNode.subdivisions,
+            AngleConeHelperNode.drawShaded,
+            AngleConeHelperNode.drawWireframe,
+        ]
+
+
+class AngleConeHelperInputs(HelperInputs):
+    __slots__ = (
+        "color",
+        "aim_matrix",
+        "length",
+        "angle",
+        "subdivisions",
+        "draw_shaded",
+        "draw_wireframe",
+    )
 
-    def _generate_lines(self, data):
-        for i in range(self.subdivisions):
-            data.lines_indices.append(0)
-            data.lines_indices.append(i + 1)
-            data.lines_indices.append(i + 1)
-            data.lines_indices.append(i + 2)
+    @classmethod
+    def from_plugs(cls, plugs):
+        (
+            angle,
+            aim_matrix,
+            length,
+            r,
+            g,
+            b,
+            subdivisions,
+            shaded,
+            wireframe,
+        ) = plugs
+        return cls(
+            (r.asFloat(), g.asFloat(), b.asFloat()),
+            get_matrix(aim_matrix),
+            length.asDouble(),
+            angle.asDouble(),
+            subdivisions.asInt(),
+            shaded.asBool(),
+            wireframe.asBool(),
+        )
 
-        return data
+    def bounds(self):
+        origin, target = get_aim_points(self.aim_matrix, self.length)
+        return geometry.cone_fan_bounds(origin, target, self.angle)
 
-    def _generate_triangles(self, data):
-        for i in range(self.subdivisions):
-            data.triangles_indices.append(0)
-            data.triangles_indices.append(i + 1)
-            data.triangles_indices.append(i + 2)
+    def shape(self):
+        return self.angle, self.subdivisions
 
-        return data
+    def placement(self):
+        return self.aim_matrix, self.length
 
-    def _get_height(self, obj_path):
-        origin = self._get_origin(obj_path)
-        target = self._get_target(obj_path)
+    def canonical_bounds(self):
+        """Return the bounds of the mesh before get_aim_transform is applied."""
+        return geometry.cone_fan_bounds((0, 0, 0), (0, 1, 0), self.angle)
 
-        aim_vector = om.MVector(target - origin)
+    def selection_matrix(self):
+        return self.aim_matrix
 
-        return aim_vector.length()
+    def hit_test(self, origin, direction):
+        return geometry.ray_cone_fan(origin, direction, self.length, self.angle)
 
-    def supportedDrawAPIs(self):
-        return omr.MRenderer.kAllDevices
+    def outline(self):
+        return geometry.cone_fan(self.length, self.angle, OUTLINE_SUBDIVISIONS).points
 
-    def hasUIDrawables(self):
-        return True
 
-    def isTransparent(*args, **kwargs):
-        return True
+class AngleConeHelperDrawOverride(HelperDrawOverrideBase):
+    NAME = "AngleConeHelperDrawOverride"
 
-    def addUIDrawables(self, obj_path, draw_manager, frame_context, data):
-        locatordata = data
-        if not isinstance(locatordata, HelperData):
-            return
+    def __init__(self, obj):
+        super(AngleConeHelperDrawOverride, self).__init__(
+            obj, AngleConeHelperNode.draw_attributes, AngleConeHelperInputs
+        )
+        self._aim_plugs = get_plugs(
+            obj, [AngleConeHelperNode.aimMatrix, AngleConeHelperNode.length]
+        )
 
-        draw_manager.beginDrawable()
+    def build_mesh(self, inputs, out=None):
+        # unit cone, scaled to its length by the transform
+        return geometry.cone_fan(1.0, inputs.angle, inputs.subdivisions, out=out)
 
-        draw_manager.setColor(locatordata.surface_color)
-        draw_manager.setDepthPriority(5)
+    def transform(self, obj_path, camera_path):
+        aim_matrix, length = self._aim_plugs
+        return get_aim_transform(obj_path, aim_matrix, length.asDouble())
 
-        if frame_context.getDisplayStyle() & omr.MFrameContext.kGouraudShaded:
-            draw_manager.mesh(
-                omr.MGeometry.kTriangles, locatordata.get_triangle_points()
-            )
 
-        if frame_context.getDisplayStyle() & omr.MFrameContext.kWireFrame:
-            draw_manager.setColor(locatordata.wire_color)
-            draw_manager.mesh(omr.MUIDrawManager.kLines, locatordata.get_line_points())
+class AngleConeHelperGeometryOverride(HelperGeometryOverride):
+    NAME = "AngleConeHelperGeometryOverride"
 
-        draw_manager.endDrawable()
+    def __init__(self, obj):
+        super(AngleConeHelperGeometryOverride, self).__init__(
+            obj, AngleConeHelperNode.draw_attributes, AngleConeHelperInputs
+        )
 
-    @classmethod
-    def creator(cls, obj):
-        return AngleConeHelperDrawOverride(obj)
-
-    def _get_aim_matrix(self, obj_path):
-        origin = self._get_origin(obj_path)
-        target = self._get_target(obj_path)
-
-        aim_vector = om.MVector(target - origin).normalize()
-
-        world_up = om.MGlobal.upAxis()
-        if aim_vector.isParallel(world_up):
-            world_up.x += 1
-            world_up.normalize()
-
-        up_vector = (aim_vector ^ world_up).normalize()
-        last_vector = (aim_vector ^ up_vector).normalize()
-
-        # fmt: off
-        aim_matrix = om.MMatrix(
-            [
-                up_vector.x,   up_vector.y,   up_vector.z,   0,
-                aim_vector.x,  aim_vector.y,  aim_vector.z,  0,
-                last_vector.x, last_vector.y, last_vector.z, 0,
-                origin.x,      origin.y,      origin.z,      1,
-            ]
+    def build_mesh(self, inputs, out=None):
+        # the buffers are in object space, the aim is baked in the points
+        return geometry.cone_fan(
+            inputs.length,
+            inputs.angle,
+            inputs.subdivisions,
+            inputs.aim_matrix,
+            out,
         )
-        # fmt: on
-        return aim_matrix
-
-    @staticmethod
-    def _get_angle(obj_path):
-        node = obj_path.node()
-        plug = om.MPlug(node, AngleConeHelperNode.angle)
-        value = om.MAngle(0.0)
-        if not plug.isNull:
-            value = plug.asMAngle()
-
-        return value
-
-    @staticmethod
-    def _get_origin(obj_path):
-        node = obj_path.node()
-        plug = om.MPlug(node, AngleConeHelperNode.origin)
-        x = plug.child(0).asFloat()
-        y = plug.child(1).asFloat()
-        z = plug.child(2).asFloat()
-
-        return om.MPoint((x, y, z))
-
-    @staticmethod
-    def _get_target(obj_path):
-        node = obj_path.node()
-        plug = om.MPlug(node, AngleConeHelperNode.target)
-        x = plug.child(0).asFloat()
-        y = plug.child(1).asFloat()
-        z = plug.child(2).asFloat()
-
-        return om.MPoint((x, y, z))
-
-    @staticmethod
-    def _get_color(obj_path):
-        node = obj_path.node()
-        plug_r = om.MPlug(node, AngleConeHelperNode.colorR)
-        plug_g = om.MPlug(node, AngleConeHelperNode.colorG)
-        plug_b = om.MPlug(node, AngleConeHelperNode.colorB)
-        r, g, b = (1, 0, 0)
-        if not plug_r.isNull:
-            r = plug_r.asFloat()
-        if not plug_g.isNull:
-            g = plug_g.asFloat()
-        if not plug_b.isNull:
-            b = plug_b.asFloat()
-
-        return om.MColor((r, g, b))
 
 
 def register(plugin_fn):
-    try:
-        plugin_fn.registerNode(
-            AngleConeHelperNode.TYPE_NAME,
-            AngleConeHelperNode.TYPE_ID,
-            AngleConeHelperNode.creator,
-            AngleConeHelperNode.initialize,
-            om.MPxNode.kLocatorNode,
-            AngleConeHelperNode.DRAW_CLASSIFICATION,
-        )
-    except BaseException:
-        logger.error(
-            "Failed to register node: {0}".format(AngleConeHelperNode.TYPE_NAME)
-        )
-
-    try:
-        omr.MDrawRegistry.registerDrawOverrideCreator(
-            AngleConeHelperNode.DRAW_CLASSIFICATION,
-            AngleConeHelperNode.DRAW_REGISTRANT_ID,
-            AngleConeHelperDrawOverride.creator,
-        )
-    except BaseException:
-        logger.error(
-            "Failed to register draw override: {0}".format(
-                AngleConeHelperDrawOverride.NAME
-            )
-        )
+    register_helper(
+        plugin_fn,
+        AngleConeHelperNode,
+        AngleConeHelperDrawOverride,
+        AngleConeHelperGeometryOverride,
+    )
 
 
 def deregister(plugin_fn):
-    try:
-        omr.MDrawRegistry.deregisterDrawOverrideCreator(
-            AngleConeHelperNode.DRAW_CLASSIFICATION,
-            AngleConeHelperNode.DRAW_REGISTRANT_ID,
-        )
-    except BaseException:
-        logger.error(
-            "Failed to deregister draw override: {0}".format(
-                AngleConeHelperDrawOverride.NAME
-            )
-        )
-
-    try:
-
-        plugin_fn.deregisterNode(AngleConeHelperNode.TYPE_ID)
-    except BaseException:
-        logger.error(
-            "Failed to deregister node: {0}".format(AngleConeHelperNode.TYPE_NAME)
-        )
+    deregister_helper(plugin_fn, AngleConeHelperNode, AngleConeHelperDrawOverride)
 
 
 if __name__ == "__main__":
@@ -324,4 +356,3 @@ if __name__ == "__main__":
     cmds.setAttr("angleConeHelper1.angle", 45)
     cmds.connectAttr("locator1.translate", "angleConeHelper1.origin")
     cmds.connectAttr("locator2.translate", "angleConeHelper1.target")
-
@@ -0,0 +1,322 @@
+from __future__ import print_function
+
+import logging
+
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaRender as omr
+import maya.api.OpenMayaUI as omui
+import numpy as np
+from mrh import geometry
+from mrh.plugins import (
+    GEOMETRY_OVERRIDE,
+    HelperDrawOverrideBase,
+    HelperGeometryOverride,
+    HelperInputs,
+    deregister_helper,
+    get_bounding_box,
+    get_doubles,
+    get_plugs,
+    get_points,
+    is_plug_of,
+    register_helper,
+    set_draw_dirty_on_evaluation,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AngleFieldHelperNode(omui.MPxLocatorNode):
+    TYPE_NAME = "angleFieldHelper"
+    TYPE_ID = om.MTypeId(0x00136204)
+    DRAW_CLASSIFICATION = "drawdb/geometry/angleFieldHelper"
+    DRAW_REGISTRANT_ID = "AngleFieldHelperNode"
+
+    radius1 = None
+    radius2 = None
+    angles1 = None
+    angles2 = None
+
+    origins = None
+
+    colorR = None
+    colorG = None
+    colorB = None
+
+    subdivisions = None
+    drawShaded = None
+    drawWireframe = None
+
+    draw_inputs = []
+
+    def __init__(self):
+        super(AngleFieldHelperNode, self).__init__()
+        self._plugs = []
+
+    def postConstructor(self):
+        self._plugs = get_plugs(self.thisMObject(), AngleFieldHelperNode.draw_inputs)
+
+    def isBounded(self):
+        return True
+
+    def boundingBox(self):
+        inputs = AngleFieldHelperInputs.from_plugs(self._plugs)
+        return get_bounding_box(inputs.bounds())
+
+    def setDependentsDirty(self, plug, plug_array):
+        if is_plug_of(plug, AngleFieldHelperNode.draw_inputs):
+            omr.MRenderer.setGeometryDrawDirty(self.thisMObject())
+
+    def preEvaluation(self, context, evaluation_node):
+        set_draw_dirty_on_evaluation(
+            self.thisMObject(),
+            context,
+            evaluation_node,
+            AngleFieldHelperNode.draw_inputs,
+        )
+
+    @classmethod
+    def creator(cls):
+        return AngleFieldHelperNode()
+
+    @classmethod
+    def initialize(cls):
+        unitFn = om.MFnUnitAttribute()
+        AngleFieldHelperNode.radius1 = unitFn.create(
+            "radius1", "r1", om.MFnUnitAttribute.kDistance
+        )
+        unitFn.channelBox = True
+        unitFn.default = om.MDistance(0)
+        unitFn.setMin(om.MDistance(0))
+        om.MPxNode.addAttribute(AngleFieldHelperNode.radius1)
+
+        AngleFieldHelperNode.radius2 = unitFn.create(
+            "radius2", "r2", om.MFnUnitAttribute.kDistance
+        )
+        unitFn.default = om.MDistance(1)
+        unitFn.setMin(om.MDistance(0))
+        unitFn.channelBox = True
+        om.MPxNode.addAttribute(AngleFieldHelperNode.radius2)
+
+        typedFn = om.MFnTypedAttribute()
+        pointArrayFn = om.MFnPointArrayData()
+
+        AngleFieldHelperNode.origins = typedFn.create(
+            "origins", "os", om.MFnData.kPointArray, pointArrayFn.create()
+        )
+        om.MPxNode.addAttribute(AngleFieldHelperNode.origins)
+
+        doubleArrayFn = om.MFnDoubleArrayData()
+        AngleFieldHelperNode.angles1 = typedFn.create(
+            "angles1", "as1", om.MFnData.kDoubleArray, doubleArrayFn.create()
+        )
+        om.MPxNode.addAttribute(AngleFieldHelperNode.angles1)
+
+        AngleFieldHelperNode.angles2 = typedFn.create(
+            "angles2", "as2", om.MFnData.kDoubleArray, doubleArrayFn.create()
+        )
+        om.MPxNode.addAttribute(AngleFieldHelperNode.angles2)
+
+        numericFn = om.MFnNumericAttribute()
+
+        AngleFieldHelperNode.colorR = numericFn.create(
+            "colorR", "cr", om.MFnNumericData.kFloat, 1
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleFieldHelperNode.colorR)
+
+        AngleFieldHelperNode.colorG = numericFn.create(
+            "colorG", "cg", om.MFnNumericData.kFloat, 0
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleFieldHelperNode.colorG)
+
+        AngleFieldHelperNode.colorB = numericFn.create(
+            "colorB", "cb", om.MFnNumericData.kFloat, 0
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleFieldHelperNode.colorB)
+
+        AngleFieldHelperNode.subdivisions = numericFn.create(
+            "subdivisions", "sbd", om.MFnNumericData.kInt, 16
+        )
+        numericFn.setMin(3)
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleFieldHelperNode.subdivisions)
+
+        AngleFieldHelperNode.drawShaded = numericFn.create(
+            "drawShaded", "dsh", om.MFnNumericData.kBoolean, True
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleFieldHelperNode.drawShaded)
+
+        AngleFieldHelperNode.drawWireframe = numericFn.create(
+            "drawWireframe", "dwf", om.MFnNumericData.kBoolean, True
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleFieldHelperNode.drawWireframe)
+
+        AngleFieldHelperNode.draw_inputs = [
+            AngleFieldHelperNode.radius1,
+            AngleFieldHelperNode.radius2,
+            AngleFieldHelperNode.angles1,
+            AngleFieldHelperNode.angles2,
+            AngleFieldHelperNode.origins,
+            AngleFieldHelperNode.colorR,
+            AngleFieldHelperNode.colorG,
+            AngleFieldHelperNode.colorB,
+            AngleFieldHelperNode.subdivisions,
+            AngleFieldHelperNode.drawShaded,
+            AngleFieldHelperNode.drawWireframe,
+        ]
+
+
+class AngleFieldHelperInputs(HelperInputs):
+    __slots__ = (
+        "color",
+        "origins",
+        "radius1",
+        "radius2",
+        "angles1",
+        "angles2",
+        "subdivisions",
+        "draw_shaded",
+        "draw_wireframe",
+    )
+
+    @classmethod
+    def from_plugs(cls, plugs):
+        (
+            radius1,
+            radius2,
+            angles1,
+            angles2,
+            origins,
+            r,
+            g,
+            b,
+            subdivisions,
+            shaded,
+            wireframe,
+        ) = plugs
+        origins = get_points(origins)
+        angles1 = np.radians(get_doubles(angles1))
+        angles2 = np.radians(get_doubles(angles2))
+        count = min(len(origins), len(angles2))
+        # missing start angles default to 0
+        angles1 = np.pad(angles1[:count], (0, count - len(angles1[:count])))
+        return cls(
+            (r.asFloat(), g.asFloat(), b.asFloat()),
+            origins[:count],
+            radius1.asDouble(),
+            radius2.asDouble(),
+            angles1,
+            angles2[:count],
+            subdivisions.asInt(),
+            shaded.asBool(),
+            wireframe.asBool(),
+        )
+
+    def key(self):
+        return (
+            self.color,
+            self.origins.tobytes(),
+            self.radius1,
+            self.radius2,
+            self.angles1.tobytes(),
+            self.angles2.tobytes(),
+            self.subdivisions,
+            self.draw_shaded,
+            self.draw_wireframe,
+        )
+
+    def shape(self):
+        return (
+            self.origins.tobytes(),
+            self.radius1,
+            self.radius2,
+            self.angles1.tobytes(),
+            self.angles2.tobytes(),
+            self.subdivisions,
+        )
+
+    def bounds(self):
+        return geometry.angle_arcs_bounds(self.origins, self.radius1, self.radius2)
+
+
+class AngleFieldHelperDrawOverride(HelperDrawOverrideBase):
+    NAME = "AngleFieldHelperDrawOverride"
+    LOD = False
+
+    def __init__(self, obj):
+        super(AngleFieldHelperDrawOverride, self).__init__(
+            obj, AngleFieldHelperNode.draw_inputs, AngleFieldHelperInputs
+        )
+
+    def build_mesh(self, inputs, out=None):
+        return build_mesh(inputs, out)
+
+    def wantUserSelection(self):
+        return False
+
+
+class AngleFieldHelperGeometryOverride(HelperGeometryOverride):
+    NAME = "AngleFieldHelperGeometryOverride"
+
+    def __init__(self, obj):
+        super(AngleFieldHelperGeometryOverride, self).__init__(
+            obj, AngleFieldHelperNode.draw_inputs, AngleFieldHelperInputs
+        )
+
+    def build_mesh(self, inputs, out=None):
+        return build_mesh(inputs, out)
+
+
+def build_mesh(inputs, out=None):
+    """Return the mrh.geometry.Mesh of all the arcs of the inputs, in one buffer."""
+    return geometry.angle_arcs(
+        inputs.origins,
+        inputs.radius1,
+        inputs.radius2,
+        inputs.angles1,
+        inputs.angles2,
+        inputs.subdivisions,
+        out=out,
+    )
+
+
+def register(plugin_fn):
+    # building the points of thousands of items for the draw manager on every
+    # change is too slow, the geometry override fills its buffers in one copy
+    register_helper(
+        plugin_fn,
+        AngleFieldHelperNode,
+        AngleFieldHelperDrawOverride,
+        AngleFieldHelperGeometryOverride,
+        GEOMETRY_OVERRIDE,
+    )
+
+
+def deregister(plugin_fn):
+    deregister_helper(plugin_fn, AngleFieldHelperNode, AngleFieldHelperDrawOverride)
+
+
+if __name__ == "__main__":
+    import maya.cmds as cmds
+
+    cmds.file(new=True, force=True)
+
+    plugin_name = "maya_rigging_helpers.py"
+
+    if cmds.pluginInfo(plugin_name, q=True, loaded=True):
+        cmds.unloadPlugin(plugin_name)
+    if not cmds.pluginInfo(plugin_name, q=True, loaded=True):
+        cmds.loadPlugin(plugin_name)
+
+    origins = [(i * 2, 0, 0, 1) for i in range(10)]
+    angles2 = [(i + 1) * 30 for i in range(10)]
+
+    angle_field_helper = cmds.createNode("angleFieldHelper")
+    cmds.setAttr(
+        angle_field_helper + ".origins", len(origins), *origins, type="pointArray"
+    )
+    cmds.setAttr(angle_field_helper + ".angles2", angles2, type="doubleArray")
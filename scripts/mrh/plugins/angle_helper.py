@@ -1,4 +1,4 @@
-from __future__ import print_function
+from __future__ import division, print_function
 
 import logging
 import math
@@ -6,7 +6,21 @@ import math
 import maya.api.OpenMaya as om
 import maya.api.OpenMayaRender as omr
 import maya.api.OpenMayaUI as omui
-from mrh.plugins import HelperData
+from mrh import disk_cache, geometry, labels
+from mrh.plugins import (
+    OUTLINE_SUBDIVISIONS,
+    HelperData,
+    HelperDrawOverrideBase,
+    HelperGeometryOverride,
+    HelperInputs,
+    deregister_helper,
+    get_bounding_box,
+    get_plugs,
+    is_label_visible,
+    is_plug_of,
+    register_helper,
+    set_draw_dirty_on_evaluation,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,8 +39,55 @@ class AngleHelperNode(omui.MPxLocatorNode):
     colorG = None
     colorB = None
 
+    subdivisions = None
+    drawShaded = None
+    drawWireframe = None
+
+    startPoint = None
+    endPoint = None
+
+    draw_inputs = []
+    draw_outputs = []
+
     def __init__(self):
         super(AngleHelperNode, self).__init__()
+        self._plugs = []
+
+    def postConstructor(self):
+        self._plugs = get_plugs(self.thisMObject(), AngleHelperNode.draw_inputs)
+
+    def isBounded(self):
+        return True
+
+    def boundingBox(self):
+        return get_bounding_box(AngleHelperInputs.from_plugs(self._plugs).bounds())
+
+    def setDependentsDirty(self, plug, plug_array):
+        if is_plug_of(plug, AngleHelperNode.draw_inputs):
+            omr.MRenderer.setGeometryDrawDirty(self.thisMObject())
+
+    def preEvaluation(self, context, evaluation_node):
+        set_draw_dirty_on_evaluation(
+            self.thisMObject(), context, evaluation_node, AngleHelperNode.draw_inputs
+        )
+
+    def compute(self, plug, data_block):
+        if not is_plug_of(plug, AngleHelperNode.draw_outputs):
+            return None
+
+        # the outer arc, whichever radius is the largest
+        radius = max(
+            data_block.inputValue(AngleHelperNode.radius1).asDouble(),
+            data_block.inputValue(AngleHelperNode.radius2).asDouble(),
+        )
+        for output, angle in (
+            (AngleHelperNode.startPoint, AngleHelperNode.angle1),
+            (AngleHelperNode.endPoint, AngleHelperNode.angle2),
+        ):
+            angle = data_block.inputValue(angle).asDouble()
+            point = data_block.outputValue(output)
+            point.set3Float(math.cos(angle) * radius, 0, math.sin(angle) * radius)
+            data_block.setClean(output)
 
     @staticmethod
     def creator():
@@ -84,225 +145,274 @@ class AngleHelperNode(omui.MPxLocatorNode):
         numericFn.channelBox = True
         om.MPxNode.addAttribute(AngleHelperNode.colorB)
 
+        AngleHelperNode.subdivisions = numericFn.create(
+            "subdivisions", "sbd", om.MFnNumericData.kInt, 100
+        )
+        numericFn.setMin(3)
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleHelperNode.subdivisions)
 
-class AngleHelperDrawOverride(omr.MPxDrawOverride):
-    NAME = "AngleHelperDrawOverride"
+        AngleHelperNode.drawShaded = numericFn.create(
+            "drawShaded", "dsh", om.MFnNumericData.kBoolean, True
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleHelperNode.drawShaded)
 
-    subdivisions = 100
+        AngleHelperNode.drawWireframe = numericFn.create(
+            "drawWireframe", "dwf", om.MFnNumericData.kBoolean, True
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(AngleHelperNode.drawWireframe)
+
+        AngleHelperNode.startPoint = numericFn.createPoint("startPoint", "stp")
+        numericFn.writable = False
+        numericFn.storable = False
+        om.MPxNode.addAttribute(AngleHelperNode.startPoint)
+
+        AngleHelperNode.endPoint = numericFn.createPoint("endPoint", "enp")
+        numericFn.writable = False
+        numericFn.storable = False
+        om.MPxNode.addAttribute(AngleHelperNode.endPoint)
+
+        AngleHelperNode.draw_outputs = [
+            AngleHelperNode.startPoint,
+            AngleHelperNode.endPoint,
+        ]
+        for output in AngleHelperNode.draw_outputs:
+            om.MPxNode.attributeAffects(AngleHelperNode.radius1, output)
+            om.MPxNode.attributeAffects(AngleHelperNode.radius2, output)
+        om.MPxNode.attributeAffects(AngleHelperNode.angle1, AngleHelperNode.startPoint)
+        om.MPxNode.attributeAffects(AngleHelperNode.angle2, AngleHelperNode.endPoint)
+
+        AngleHelperNode.draw_inputs = [
+            AngleHelperNode.radius1,
+            AngleHelperNode.radius2,
+            AngleHelperNode.angle1,
+            AngleHelperNode.angle2,
+            AngleHelperNode.colorR,
+            AngleHelperNode.colorG,
+            AngleHelperNode.colorB,
+            AngleHelperNode.subdivisions,
+            AngleHelperNode.drawShaded,
+            AngleHelperNode.drawWireframe,
+        ]
+
+
+class AngleHelperInputs(HelperInputs):
+    __slots__ = (
+        "color",
+        "radius1",
+        "radius2",
+        "angle1",
+        "angle2",
+        "subdivisions",
+        "draw_shaded",
+        "draw_wireframe",
+    )
+
+    @classmethod
+    def from_plugs(cls, plugs):
+        (
+            radius1,
+            radius2,
+            angle1,
+            angle2,
+            r,
+            g,
+            b,
+            subdivisions,
+            shaded,
+            wireframe,
+        ) = plugs
+        return cls(
+            (r.asFloat(), g.asFloat(), b.asFloat()),
+            radius1.asDouble(),
+            radius2.asDouble(),
+            angle1.asDouble(),
+            angle2.asDouble(),
+            subdivisions.asInt(),
+            shaded.asBool(),
+            wireframe.asBool(),
+        )
+
+    def shape(self):
+        return (
+            self.radius1,
+            self.radius2,
+            self.angle1,
+            self.angle2,
+            self.subdivisions,
+        )
+
+    def bounds(self):
+        return geometry.angle_arc_bounds(
+            self.radius1, self.radius2, self.angle1, self.angle2
+        )
+
+    def hit_test(self, origin, direction):
+        return geometry.ray_angle_arc(
+            origin, direction, self.radius1, self.radius2, self.angle1, self.angle2
+        )
+
+    def outline(self):
+        return geometry.angle_arc(
+            self.radius1, self.radius2, self.angle1, self.angle2, OUTLINE_SUBDIVISIONS
+        ).points
+
+
+class AngleHelperDrawOverride(HelperDrawOverrideBase):
+    NAME = "AngleHelperDrawOverride"
 
     def __init__(self, obj):
-        super(AngleHelperDrawOverride, self).__init__(obj, None, True)
+        super(AngleHelperDrawOverride, self).__init__(
+            obj, AngleHelperNode.draw_inputs, AngleHelperInputs
+        )
+        self._cached = False
+        labels.add()
 
-    def prepareForDraw(self, obj_path, camera_path, frame_context, old_data):
-        data = old_data
-        if not isinstance(data, HelperData):
-            data = HelperData()
-
-        data.surface_color = AngleHelperDrawOverride._get_color(obj_path)
-        data.surface_color.a = 0.25
-        data.wire_color = AngleHelperDrawOverride._get_color(obj_path)
-        data.points.clear()
-        data.triangles_indices = []
-        data.lines_indices = []
-
-        radius1 = AngleHelperDrawOverride._get_radius1(obj_path)
-        radius2 = AngleHelperDrawOverride._get_radius2(obj_path)
-        angle1 = AngleHelperDrawOverride._get_angle1(obj_path)
-        angle2 = AngleHelperDrawOverride._get_angle2(obj_path)
-        angle = angle2.asRadians() - angle1.asRadians()
-
-        subdivisions = AngleHelperDrawOverride.subdivisions
-        angle_offset = angle / subdivisions
-
-        # first circle
-        for i in range(subdivisions + 1):
-            angle = i * angle_offset + angle1.asRadians()
-            x = math.cos(angle)
-            y = 0
-            z = math.sin(angle)
-            data.points.append(om.MPoint(x, y, z) * radius1)
-
-        # second circle
-        for i in range(subdivisions + 1):
-            angle = i * angle_offset + angle1.asRadians()
-            x = math.cos(angle)
-            y = 0
-            z = math.sin(angle)
-            data.points.append(om.MPoint(x, y, z) * radius2)
-
-        data.lines_indices.append(0)
-        data.lines_indices.append(subdivisions + 1)
-        for i in range(subdivisions):
-            data.lines_indices.append(i)
-            data.lines_indices.append(i + 1)
-
-        for i in range(subdivisions):
-            data.lines_indices.append(subdivisions + i + 1)
-            data.lines_indices.append(subdivisions + i + 2)
-        data.lines_indices.append(subdivisions)
-        data.lines_indices.append(subdivisions * 2 + 1)
-
-        for i in range(subdivisions):
-            data.triangles_indices.append(i)
-            data.triangles_indices.append(i + 1)
-            data.triangles_indices.append(subdivisions + i + 1)
-
-            data.triangles_indices.append(subdivisions + i + 1)
-            data.triangles_indices.append(subdivisions + i + 2)
-            data.triangles_indices.append(i + 1)
+    def __del__(self):
+        labels.remove()
+        super(AngleHelperDrawOverride, self).__del__()
 
+    @classmethod
+    def is_always_dirty(cls):
+        # the labels' visibility depends on the camera
+        always_dirty = super(AngleHelperDrawOverride, cls).is_always_dirty()
+        return always_dirty or labels.settings.enabled
+
+    def build_mesh(self, inputs, out=None):
+        if self._cached:
+            return build_mesh(inputs, out)
+
+        # only the meshes a scene opens with go through the disk, not the ones
+        # of every frame of an animated angle
+        self._cached = True
+        return disk_cache.get_mesh(
+            (AngleHelperNode.TYPE_NAME,) + inputs.shape(),
+            lambda: build_mesh(inputs, out),
+            lambda: geometry.angle_arc_topology(inputs.subdivisions),
+        )
+
+    def prepareForDraw(self, obj_path, camera_path, frame_context, old_data):
+        previous = old_data.inputs if isinstance(old_data, HelperData) else None
+        data = super(AngleHelperDrawOverride, self).prepareForDraw(
+            obj_path, camera_path, frame_context, old_data
+        )
+        if data.inputs is not previous:
+            update_label(data, previous)
+        data.label_visible = is_label_visible(
+            obj_path, frame_context, data.label_position
+        )
         return data
 
-    def supportedDrawAPIs(self):
-        return omr.MRenderer.kAllDevices
+    def draw_annotations(self, draw_manager, data):
+        if data.label_visible:
+            draw_label(draw_manager, data)
+
+
+class AngleHelperGeometryOverride(HelperGeometryOverride):
+    NAME = "AngleHelperGeometryOverride"
+
+    def __init__(self, obj):
+        super(AngleHelperGeometryOverride, self).__init__(
+            obj, AngleHelperNode.draw_inputs, AngleHelperInputs
+        )
+        labels.add()
+
+    def __del__(self):
+        labels.remove()
+        super(AngleHelperGeometryOverride, self).__del__()
+
+    def build_mesh(self, inputs, out=None):
+        return build_mesh(inputs, out)
+
+    def updateDG(self):
+        previous = self._data.inputs
+        super(AngleHelperGeometryOverride, self).updateDG()
+        if self._data.inputs is not previous:
+            update_label(self._data, previous)
 
     def hasUIDrawables(self):
         return True
 
-    def addUIDrawables(self, obj_path, draw_manager, frame_context, data):
-        locatordata = data
-        if not isinstance(locatordata, HelperData):
+    def addUIDrawables(self, obj_path, draw_manager, frame_context):
+        data = self._data
+        if not is_label_visible(obj_path, frame_context, data.label_position):
             return
-
         draw_manager.beginDrawable()
-
-        draw_manager.setColor(locatordata.surface_color)
-        draw_manager.setDepthPriority(5)
-
-        if frame_context.getDisplayStyle() & omr.MFrameContext.kGouraudShaded:
-            draw_manager.mesh(
-                omr.MGeometry.kTriangles, locatordata.get_triangle_points()
-            )
-
-        if frame_context.getDisplayStyle() & omr.MFrameContext.kWireFrame:
-            draw_manager.setColor(locatordata.wire_color)
-            draw_manager.mesh(omr.MUIDrawManager.kLines, locatordata.get_line_points())
-
-        angle1 = AngleHelperDrawOverride._get_angle1(obj_path).asDegrees()
-        angle2 = AngleHelperDrawOverride._get_angle2(obj_path).asDegrees()
-        angle = angle2 - angle1
-
-        a = data.points[0]
-        b = data.points[AngleHelperDrawOverride.subdivisions + 2]
-        distance_to_a = a.distanceTo(om.MPoint(0, 0, 0))
-        distance_to_b = b.distanceTo(om.MPoint(0, 0, 0))
-        if distance_to_a >= distance_to_b:
-            text_pos = a
-        else:
-            text_pos = b
-
-        text_pos *= 1.1
-        text_color = om.MColor((0.1, 0.8, 0.8, 1))
-        draw_manager.setColor(text_color)
-        if angle == int(angle):
-            text = "{} degrees".format(int(angle))
-        else:
-            text = "{0:.3f} degrees".format(angle)
-        draw_manager.text(text_pos, text)
+        draw_label(draw_manager, data)
         draw_manager.endDrawable()
 
-    @classmethod
-    def creator(cls, obj):
-        return AngleHelperDrawOverride(obj)
 
-    @staticmethod
-    def _get_radius1(obj_path):
-        node = obj_path.node()
-        plug = om.MPlug(node, AngleHelperNode.radius1)
-        value = 1.0
-        if not plug.isNull:
-            value = plug.asMDistance().asCentimeters()
+def build_mesh(inputs, out=None):
+    """Return the mrh.geometry.Mesh of the arc of an AngleHelperInputs."""
+    return geometry.angle_arc(*inputs.shape(), out=out)
 
-        return value
 
-    @staticmethod
-    def _get_radius2(obj_path):
-        node = obj_path.node()
-        plug = om.MPlug(node, AngleHelperNode.radius2)
-        value = 1.0
-        if not plug.isNull:
-            value = plug.asMDistance().asCentimeters()
+#: Color of the labels of the angles.
+LABEL_COLOR = om.MColor((0.1, 0.8, 0.8, 1))
 
-        return value
 
-    @staticmethod
-    def _get_angle1(obj_path):
-        node = obj_path.node()
-        plug = om.MPlug(node, AngleHelperNode.angle1)
-        value = om.MAngle(0.0)
-        if not plug.isNull:
-            value = plug.asMAngle()
+def format_angle(angle):
+    """Return the text of the label of an angle given in radians."""
+    degrees = math.degrees(angle)
+    if degrees == int(degrees):
+        return "{} degrees".format(int(degrees))
+    return "{0:.3f} degrees".format(degrees)
 
-        return value
 
-    @staticmethod
-    def _get_angle2(obj_path):
-        node = obj_path.node()
-        plug = om.MPlug(node, AngleHelperNode.angle2)
-        value = om.MAngle(0.0)
-        if not plug.isNull:
-            value = plug.asMAngle()
+def get_label_position(inputs):
+    """Return the position of the label, past the start of the widest arc.
 
-        return value
+    Args:
+        inputs(AngleHelperInputs): inputs of the helper
+    """
+    if inputs.radius1 >= inputs.radius2:
+        radius, angle = inputs.radius1, inputs.angle1
+    else:
+        # second point of the outer arc
+        step = (inputs.angle2 - inputs.angle1) / inputs.subdivisions
+        radius, angle = inputs.radius2, inputs.angle1 + step
+    radius *= 1.1
+    return om.MPoint(math.cos(angle) * radius, 0, math.sin(angle) * radius)
+
+
+def update_label(data, previous):
+    """Update the label of a helper whose inputs changed.
+
+    The text is only formatted again when the angle changes.
+
+    Args:
+        data(HelperData): data of the helper, with its new inputs
+        previous(AngleHelperInputs): inputs the label was made for, if any
+    """
+    inputs = data.inputs
+    angle = inputs.angle2 - inputs.angle1
+    if previous is None or previous.angle2 - previous.angle1 != angle:
+        data.label = format_angle(angle)
+    if previous is None or previous.shape() != inputs.shape():
+        data.label_position = get_label_position(inputs)
 
-    @staticmethod
-    def _get_color(obj_path):
-        node = obj_path.node()
-        plug_r = om.MPlug(node, AngleHelperNode.colorR)
-        plug_g = om.MPlug(node, AngleHelperNode.colorG)
-        plug_b = om.MPlug(node, AngleHelperNode.colorB)
-        r, g, b = (1, 0, 0)
-        if not plug_r.isNull:
-            r = plug_r.asFloat()
-        if not plug_g.isNull:
-            g = plug_g.asFloat()
-        if not plug_b.isNull:
-            b = plug_b.asFloat()
-
-        return om.MColor((r, g, b))
+
+def draw_label(draw_manager, data):
+    """Draw the label made by update_label.
+
+    Args:
+        draw_manager(omr.MUIDrawManager): draw manager of the frame
+        data(HelperData): data of the helper
+    """
+    draw_manager.setColor(LABEL_COLOR)
+    draw_manager.text(data.label_position, data.label)
 
 
 def register(plugin_fn):
-    try:
-        plugin_fn.registerNode(
-            AngleHelperNode.TYPE_NAME,
-            AngleHelperNode.TYPE_ID,
-            AngleHelperNode.creator,
-            AngleHelperNode.initialize,
-            om.MPxNode.kLocatorNode,
-            AngleHelperNode.DRAW_CLASSIFICATION,
-        )
-    except Exception:
-        logger.error("Failed to register node: {0}".format(AngleHelperNode.TYPE_NAME))
-
-    try:
-        omr.MDrawRegistry.registerDrawOverrideCreator(
-            AngleHelperNode.DRAW_CLASSIFICATION,
-            AngleHelperNode.DRAW_REGISTRANT_ID,
-            AngleHelperDrawOverride.creator,
-        )
-    except Exception:
-        logger.error(
-            "Failed to register draw override: {0}".format(AngleHelperDrawOverride.NAME)
-        )
+    register_helper(
+        plugin_fn, AngleHelperNode, AngleHelperDrawOverride, AngleHelperGeometryOverride
+    )
 
 
 def deregister(plugin_fn):
-    try:
-        omr.MDrawRegistry.deregisterDrawOverrideCreator(
-            AngleHelperNode.DRAW_CLASSIFICATION, AngleHelperNode.DRAW_REGISTRANT_ID,
-        )
-    except Exception:
-        logger.error(
-            "Failed to deregister draw override: {0}".format(
-                AngleHelperDrawOverride.NAME
-            )
-        )
-
-    try:
-        plugin_fn.deregisterNode(AngleHelperNode.TYPE_ID)
-    except Exception:
-        logger.error("Failed to deregister node: {0}".format(AngleHelperNode.TYPE_NAME))
+    deregister_helper(plugin_fn, AngleHelperNode, AngleHelperDrawOverride)
 
 
 if __name__ == "__main__":
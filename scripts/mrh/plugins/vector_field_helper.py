@@ -0,0 +1,292 @@
+from __future__ import print_function
+
+import logging
+
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaRender as omr
+import maya.api.OpenMayaUI as omui
+from mrh import geometry
+from mrh.plugins import (
+    GEOMETRY_OVERRIDE,
+    HelperDrawOverrideBase,
+    HelperGeometryOverride,
+    HelperInputs,
+    deregister_helper,
+    get_bounding_box,
+    get_plugs,
+    get_points,
+    is_plug_of,
+    register_helper,
+    set_draw_dirty_on_evaluation,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class VectorFieldHelperNode(omui.MPxLocatorNode):
+    TYPE_NAME = "vectorFieldHelper"
+    TYPE_ID = om.MTypeId(0x00136203)
+    DRAW_CLASSIFICATION = "drawdb/geometry/vectorFieldHelper"
+    DRAW_REGISTRANT_ID = "VectorFieldHelperNode"
+
+    radius = None
+
+    origins = None
+    targets = None
+
+    colorR = None
+    colorG = None
+    colorB = None
+
+    subdivisions = None
+    drawShaded = None
+    drawWireframe = None
+
+    draw_inputs = []
+
+    def __init__(self):
+        super(VectorFieldHelperNode, self).__init__()
+        self._plugs = []
+
+    def postConstructor(self):
+        self._plugs = get_plugs(self.thisMObject(), VectorFieldHelperNode.draw_inputs)
+
+    def isBounded(self):
+        return True
+
+    def boundingBox(self):
+        inputs = VectorFieldHelperInputs.from_plugs(self._plugs)
+        return get_bounding_box(inputs.bounds())
+
+    def setDependentsDirty(self, plug, plug_array):
+        if is_plug_of(plug, VectorFieldHelperNode.draw_inputs):
+            omr.MRenderer.setGeometryDrawDirty(self.thisMObject())
+
+    def preEvaluation(self, context, evaluation_node):
+        set_draw_dirty_on_evaluation(
+            self.thisMObject(),
+            context,
+            evaluation_node,
+            VectorFieldHelperNode.draw_inputs,
+        )
+
+    @classmethod
+    def creator(cls):
+        return VectorFieldHelperNode()
+
+    @classmethod
+    def initialize(cls):
+        unitFn = om.MFnUnitAttribute()
+        VectorFieldHelperNode.radius = unitFn.create(
+            "radius", "r", om.MFnUnitAttribute.kDistance
+        )
+        unitFn.channelBox = True
+        unitFn.default = om.MDistance(0.1)
+        unitFn.setMin(om.MDistance(0))
+        om.MPxNode.addAttribute(VectorFieldHelperNode.radius)
+
+        typedFn = om.MFnTypedAttribute()
+        pointArrayFn = om.MFnPointArrayData()
+
+        VectorFieldHelperNode.origins = typedFn.create(
+            "origins", "os", om.MFnData.kPointArray, pointArrayFn.create()
+        )
+        om.MPxNode.addAttribute(VectorFieldHelperNode.origins)
+
+        VectorFieldHelperNode.targets = typedFn.create(
+            "targets", "ts", om.MFnData.kPointArray, pointArrayFn.create()
+        )
+        om.MPxNode.addAttribute(VectorFieldHelperNode.targets)
+
+        numericFn = om.MFnNumericAttribute()
+
+        VectorFieldHelperNode.colorR = numericFn.create(
+            "colorR", "cr", om.MFnNumericData.kFloat, 1
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(VectorFieldHelperNode.colorR)
+
+        VectorFieldHelperNode.colorG = numericFn.create(
+            "colorG", "cg", om.MFnNumericData.kFloat, 0
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(VectorFieldHelperNode.colorG)
+
+        VectorFieldHelperNode.colorB = numericFn.create(
+            "colorB", "cb", om.MFnNumericData.kFloat, 0
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(VectorFieldHelperNode.colorB)
+
+        VectorFieldHelperNode.subdivisions = numericFn.create(
+            "subdivisions", "sbd", om.MFnNumericData.kInt, 8
+        )
+        numericFn.setMin(3)
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(VectorFieldHelperNode.subdivisions)
+
+        VectorFieldHelperNode.drawShaded = numericFn.create(
+            "drawShaded", "dsh", om.MFnNumericData.kBoolean, True
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(VectorFieldHelperNode.drawShaded)
+
+        VectorFieldHelperNode.drawWireframe = numericFn.create(
+            "drawWireframe", "dwf", om.MFnNumericData.kBoolean, True
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(VectorFieldHelperNode.drawWireframe)
+
+        VectorFieldHelperNode.draw_inputs = [
+            VectorFieldHelperNode.radius,
+            VectorFieldHelperNode.origins,
+            VectorFieldHelperNode.targets,
+            VectorFieldHelperNode.colorR,
+            VectorFieldHelperNode.colorG,
+            VectorFieldHelperNode.colorB,
+            VectorFieldHelperNode.subdivisions,
+            VectorFieldHelperNode.drawShaded,
+            VectorFieldHelperNode.drawWireframe,
+        ]
+
+
+class VectorFieldHelperInputs(HelperInputs):
+    __slots__ = (
+        "color",
+        "origins",
+        "targets",
+        "radius",
+        "subdivisions",
+        "draw_shaded",
+        "draw_wireframe",
+    )
+
+    @classmethod
+    def from_plugs(cls, plugs):
+        (
+            radius,
+            origins,
+            targets,
+            r,
+            g,
+            b,
+            subdivisions,
+            shaded,
+            wireframe,
+        ) = plugs
+        origins = get_points(origins)
+        targets = get_points(targets)
+        count = min(len(origins), len(targets))
+        return cls(
+            (r.asFloat(), g.asFloat(), b.asFloat()),
+            origins[:count],
+            targets[:count],
+            radius.asDouble(),
+            subdivisions.asInt(),
+            shaded.asBool(),
+            wireframe.asBool(),
+        )
+
+    def key(self):
+        return (
+            self.color,
+            self.origins.tobytes(),
+            self.targets.tobytes(),
+            self.radius,
+            self.subdivisions,
+            self.draw_shaded,
+            self.draw_wireframe,
+        )
+
+    def shape(self):
+        return (
+            self.origins.tobytes(),
+            self.targets.tobytes(),
+            self.radius,
+            self.subdivisions,
+        )
+
+    def bounds(self):
+        return geometry.arrows_bounds(self.origins, self.targets, self.radius)
+
+
+class VectorFieldHelperDrawOverride(HelperDrawOverrideBase):
+    NAME = "VectorFieldHelperDrawOverride"
+    LOD = False
+
+    def __init__(self, obj):
+        super(VectorFieldHelperDrawOverride, self).__init__(
+            obj, VectorFieldHelperNode.draw_inputs, VectorFieldHelperInputs
+        )
+
+    def build_mesh(self, inputs, out=None):
+        return build_mesh(inputs, out)
+
+    def wantUserSelection(self):
+        return False
+
+
+class VectorFieldHelperGeometryOverride(HelperGeometryOverride):
+    NAME = "VectorFieldHelperGeometryOverride"
+
+    def __init__(self, obj):
+        super(VectorFieldHelperGeometryOverride, self).__init__(
+            obj, VectorFieldHelperNode.draw_inputs, VectorFieldHelperInputs
+        )
+
+    def build_mesh(self, inputs, out=None):
+        return build_mesh(inputs, out)
+
+
+def build_mesh(inputs, out=None):
+    """Return the mrh.geometry.Mesh of all the arrows of the inputs, in one buffer."""
+    return geometry.arrows(
+        inputs.origins,
+        inputs.targets,
+        inputs.radius,
+        inputs.subdivisions,
+        tuple(om.MGlobal.upAxis()),
+        out=out,
+    )
+
+
+def register(plugin_fn):
+    # building the points of thousands of items for the draw manager on every
+    # change is too slow, the geometry override fills its buffers in one copy
+    register_helper(
+        plugin_fn,
+        VectorFieldHelperNode,
+        VectorFieldHelperDrawOverride,
+        VectorFieldHelperGeometryOverride,
+        GEOMETRY_OVERRIDE,
+    )
+
+
+def deregister(plugin_fn):
+    deregister_helper(plugin_fn, VectorFieldHelperNode, VectorFieldHelperDrawOverride)
+
+
+if __name__ == "__main__":
+    import maya.cmds as cmds
+
+    cmds.file(new=True, force=True)
+
+    plugin_name = "maya_rigging_helpers.py"
+
+    if cmds.pluginInfo(plugin_name, q=True, loaded=True):
+        cmds.unloadPlugin(plugin_name)
+    if not cmds.pluginInfo(plugin_name, q=True, loaded=True):
+        cmds.loadPlugin(plugin_name)
+
+    sphere = cmds.polySphere(subdivisionsX=100, subdivisionsY=100)[0]
+    origins = cmds.xform(sphere + ".vtx[*]", q=True, translation=True)
+    origins = [(x, y, z, 1) for x, y, z in zip(*[iter(origins)] * 3)]
+    targets = [(x * 1.2, y * 1.2, z * 1.2, 1) for x, y, z, _ in origins]
+
+    vector_field_helper = cmds.createNode("vectorFieldHelper")
+    cmds.setAttr(
+        vector_field_helper + ".origins", len(origins), *origins, type="pointArray"
+    )
+    cmds.setAttr(
+        vector_field_helper + ".targets", len(targets), *targets, type="pointArray"
+    )
@@ -1,13 +1,27 @@
 from __future__ import print_function
 
 import logging
-import math
 
 import maya.api.OpenMaya as om
 import maya.api.OpenMayaRender as omr
 import maya.api.OpenMayaUI as omui
-from mrh.plugins import HelperData, get_aim_matrix
-
+from mrh import geometry
+from mrh.plugins import (
+    OUTLINE_SUBDIVISIONS,
+    HelperDrawOverrideBase,
+    HelperGeometryOverride,
+    HelperInputs,
+    compute_aim,
+    deregister_helper,
+    get_aim_points,
+    get_aim_transform,
+    get_bounding_box,
+    get_matrix,
+    get_plugs,
+    is_plug_of,
+    register_helper,
+    set_draw_dirty_on_evaluation,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -27,8 +41,60 @@ class VectorHelperNode(omui.MPxLocatorNode):
     colorG = None
     colorB = None
 
+    subdivisions = None
+    drawShaded = None
+    drawWireframe = None
+
+    aimMatrix = None
+    length = None
+    direction = None
+    cylinderHeight = None
+
+    draw_inputs = []
+    draw_outputs = []
+    #: Attributes read by the draw override, the aim comes from the outputs.
+    draw_attributes = []
+
     def __init__(self):
         super(VectorHelperNode, self).__init__()
+        self._plugs = []
+
+    def postConstructor(self):
+        self._plugs = get_plugs(self.thisMObject(), VectorHelperNode.draw_attributes)
+
+    def isBounded(self):
+        return True
+
+    def boundingBox(self):
+        return get_bounding_box(VectorHelperInputs.from_plugs(self._plugs).bounds())
+
+    def setDependentsDirty(self, plug, plug_array):
+        if is_plug_of(plug, VectorHelperNode.draw_inputs):
+            omr.MRenderer.setGeometryDrawDirty(self.thisMObject())
+
+    def preEvaluation(self, context, evaluation_node):
+        set_draw_dirty_on_evaluation(
+            self.thisMObject(), context, evaluation_node, VectorHelperNode.draw_inputs
+        )
+
+    def compute(self, plug, data_block):
+        if not is_plug_of(plug, VectorHelperNode.draw_outputs):
+            return None
+
+        length = compute_aim(
+            data_block,
+            VectorHelperNode.origin,
+            VectorHelperNode.target,
+            VectorHelperNode.aimMatrix,
+            VectorHelperNode.length,
+            VectorHelperNode.direction,
+        )
+
+        radius = data_block.inputValue(VectorHelperNode.radius).asDouble()
+        height = geometry.arrow_cylinder_height(length, radius)
+        cylinder_height = data_block.outputValue(VectorHelperNode.cylinderHeight)
+        cylinder_height.setMDistance(om.MDistance(height))
+        data_block.setClean(VectorHelperNode.cylinderHeight)
 
     @classmethod
     def creator(cls):
@@ -73,286 +139,196 @@ class VectorHelperNode(omui.MPxLocatorNode):
         numericFn.channelBox = True
         om.MPxNode.addAttribute(VectorHelperNode.colorB)
 
+        VectorHelperNode.subdivisions = numericFn.create(
+            "subdivisions", "sbd", om.MFnNumericData.kInt, 100
+        )
+        numericFn.setMin(3)
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(VectorHelperNode.subdivisions)
 
-class VectorHelperDrawOverride(omr.MPxDrawOverride):
-    NAME = "VectorHelperDrawOverride"
+        VectorHelperNode.drawShaded = numericFn.create(
+            "drawShaded", "dsh", om.MFnNumericData.kBoolean, True
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(VectorHelperNode.drawShaded)
 
-    subdivisions = 100
+        VectorHelperNode.drawWireframe = numericFn.create(
+            "drawWireframe", "dwf", om.MFnNumericData.kBoolean, True
+        )
+        numericFn.channelBox = True
+        om.MPxNode.addAttribute(VectorHelperNode.drawWireframe)
 
-    def __init__(self, obj):
-        super(VectorHelperDrawOverride, self).__init__(obj, None, True)
+        matrixFn = om.MFnMatrixAttribute()
+        VectorHelperNode.aimMatrix = matrixFn.create("aimMatrix", "am")
+        matrixFn.writable = False
+        matrixFn.storable = False
+        om.MPxNode.addAttribute(VectorHelperNode.aimMatrix)
 
-    def isTransparent(*args, **kwargs):
-        return True
+        VectorHelperNode.length = unitFn.create(
+            "length", "len", om.MFnUnitAttribute.kDistance
+        )
+        unitFn.writable = False
+        unitFn.storable = False
+        om.MPxNode.addAttribute(VectorHelperNode.length)
 
-    def prepareForDraw(self, obj_path, camera_path, frame_context, old_data):
-        data = old_data
-        if not isinstance(data, HelperData):
-            data = HelperData()
-
-        data.surface_color = VectorHelperDrawOverride._get_color(obj_path)
-        data.surface_color.a = 0.25
-        data.wire_color = VectorHelperDrawOverride._get_color(obj_path)
-        data.points.clear()
-        data.triangles_indices = []
-        data.lines_indices = []
-
-        data = self._generate_points(data, obj_path)
-        data = self._generate_triangles(data)
-
-        return data
-
-    def _get_height(self, obj_path):
-        origin = self._get_origin(obj_path)
-        target = self._get_target(obj_path)
-
-        aim_vector = om.MVector(target - origin)
-
-        return aim_vector.length()
-
-    def _generate_points(self, data, obj_path):
-        origin = self._get_origin(obj_path)
-        target = self._get_target(obj_path)
-        aim_matrix = get_aim_matrix(origin, target)
-        height = self._get_height(obj_path)
-
-        radius = VectorHelperDrawOverride._get_radius(obj_path)
-        subdivisions = VectorHelperDrawOverride.subdivisions
-        angle_offset = math.pi * 2 / subdivisions
-        cylinder_height = max(0, height - radius * 5)
-
-        data.points.append(om.MPoint(0, 0, 0) * aim_matrix)
-        # first circle
-        for i in range(subdivisions):
-            angle = i * angle_offset
-            x = math.cos(angle) * radius
-            y = 0
-            z = math.sin(angle) * radius
-            data.points.append(om.MPoint(x, y, z) * aim_matrix)
-
-        # second circle
-        for i in range(subdivisions):
-            angle = i * angle_offset
-            x = math.cos(angle) * radius
-            y = cylinder_height
-            z = math.sin(angle) * radius
-            data.points.append(om.MPoint(x, y, z) * aim_matrix)
-
-        # third circle
-        for i in range(subdivisions):
-            angle = i * angle_offset
-            x = math.cos(angle) * radius * 3
-            y = cylinder_height
-            z = math.sin(angle) * radius * 3
-            data.points.append(om.MPoint(x, y, z) * aim_matrix)
-
-        data.points.append(om.MPoint(0, height, 0) * aim_matrix)
-        return data
-
-    def _generate_triangles(self, data):
-        subdivisions = VectorHelperDrawOverride.subdivisions
-        for i in range(len(data.points) - 1):
-            data.lines_indices.append(i)
-            data.lines_indices.append(i + 1)
-
-        # base circle
-        for i in range(subdivisions):
-            p1 = 0
-            p2 = i + 1
-            if i == subdivisions - 1:
-                p3 = 1
-            else:
-                p3 = i + 2
-            data.triangles_indices.append(p1)
-            data.triangles_indices.append(p2)
-            data.triangles_indices.append(p3)
-
-        # body cylinder
-        for i in range(subdivisions):
-
-            p1 = i + 1
-            if i == subdivisions - 1:
-                p2 = 1
-            else:
-                p2 = i + 2
-            p3 = subdivisions + i + 1
-            data.triangles_indices.append(p1)
-            data.triangles_indices.append(p2)
-            data.triangles_indices.append(p3)
-
-            if i == subdivisions - 1:
-                p1 = 1
-                p2 = subdivisions + 1
-            else:
-                p1 = i + 2
-                p2 = subdivisions + i + 2
-            p3 = subdivisions + i + 1
-            data.triangles_indices.append(p1)
-            data.triangles_indices.append(p2)
-            data.triangles_indices.append(p3)
-
-        # body cylinder
-        for i in range(subdivisions):
-
-            p1 = subdivisions + i + 1
-            if i == subdivisions - 1:
-                p2 = subdivisions + 1
-            else:
-                p2 = subdivisions + i + 2
-            p3 = subdivisions + subdivisions + i + 1
-            data.triangles_indices.append(p1)
-            data.triangles_indices.append(p2)
-            data.triangles_indices.append(p3)
-
-            if i == subdivisions - 1:
-                p1 = subdivisions + 1
-                p2 = subdivisions + subdivisions + 1
-            else:
-                p1 = subdivisions + i + 2
-                p2 = subdivisions + subdivisions + i + 2
-            p3 = subdivisions + subdivisions + i + 1
-            data.triangles_indices.append(p1)
-            data.triangles_indices.append(p2)
-            data.triangles_indices.append(p3)
-
-        # base circle
-        for i in range(subdivisions):
-            p1 = len(data.points) - 1
-            p2 = subdivisions + subdivisions + i + 1
-            if i == subdivisions - 1:
-                p3 = subdivisions + subdivisions + 1
-            else:
-                p3 = subdivisions + subdivisions + i + 2
-            data.triangles_indices.append(p1)
-            data.triangles_indices.append(p2)
-            data.triangles_indices.append(p3)
-
-        return data
-
-    def supportedDrawAPIs(self):
-        return omr.MRenderer.kAllDevices
-
-    def hasUIDrawables(self):
-        return True
+        VectorHelperNode.direction = numericFn.createPoint("direction", "dir")
+        numericFn.writable = False
+        numericFn.storable = False
+        om.MPxNode.addAttribute(VectorHelperNode.direction)
 
-    def addUIDrawables(self, obj_path, draw_manager, frame_context, data):
-        locatordata = data
-        if not isinstance(locatordata, HelperData):
-            return
+        VectorHelperNode.cylinderHeight = unitFn.create(
+            "cylinderHeight", "cyh", om.MFnUnitAttribute.kDistance
+        )
+        unitFn.writable = False
+        unitFn.storable = False
+        om.MPxNode.addAttribute(VectorHelperNode.cylinderHeight)
+
+        VectorHelperNode.draw_outputs = [
+            VectorHelperNode.aimMatrix,
+            VectorHelperNode.length,
+            VectorHelperNode.direction,
+            VectorHelperNode.cylinderHeight,
+        ]
+        for output in VectorHelperNode.draw_outputs:
+            om.MPxNode.attributeAffects(VectorHelperNode.origin, output)
+            om.MPxNode.attributeAffects(VectorHelperNode.target, output)
+        om.MPxNode.attributeAffects(
+            VectorHelperNode.radius, VectorHelperNode.cylinderHeight
+        )
 
-        draw_manager.beginDrawable()
+        VectorHelperNode.draw_inputs = [
+            VectorHelperNode.radius,
+            VectorHelperNode.origin,
+            VectorHelperNode.target,
+            VectorHelperNode.colorR,
+            VectorHelperNode.colorG,
+            VectorHelperNode.colorB,
+            VectorHelperNode.subdivisions,
+            VectorHelperNode.drawShaded,
+            VectorHelperNode.drawWireframe,
+        ]
+        VectorHelperNode.draw_attributes = [
+            VectorHelperNode.radius,
+            VectorHelperNode.aimMatrix,
+            VectorHelperNode.length,
+            VectorHelperNode.colorR,
+            VectorHelperNode.colorG,
+            VectorHelperNode.colorB,
+            VectorHelperNode.subdivisions,
+            VectorHelperNode.drawShaded,
+            VectorHelperNode.drawWireframe,
+        ]
+
+
+class VectorHelperInputs(HelperInputs):
+    __slots__ = (
+        "color",
+        "aim_matrix",
+        "length",
+        "radius",
+        "subdivisions",
+        "draw_shaded",
+        "draw_wireframe",
+    )
 
-        draw_manager.setColor(locatordata.surface_color)
-        draw_manager.setDepthPriority(5)
+    @classmethod
+    def from_plugs(cls, plugs):
+        (
+            radius,
+            aim_matrix,
+            length,
+            r,
+            g,
+            b,
+            subdivisions,
+            shaded,
+            wireframe,
+        ) = plugs
+        return cls(
+            (r.asFloat(), g.asFloat(), b.asFloat()),
+            get_matrix(aim_matrix),
+            length.asDouble(),
+            radius.asDouble(),
+            subdivisions.asInt(),
+            shaded.asBool(),
+            wireframe.asBool(),
+        )
 
-        if frame_context.getDisplayStyle() & omr.MFrameContext.kGouraudShaded:
-            draw_manager.mesh(
-                omr.MGeometry.kTriangles, locatordata.get_triangle_points()
-            )
+    def bounds(self):
+        origin, target = get_aim_points(self.aim_matrix, self.length)
+        return geometry.arrow_bounds(origin, target, self.radius)
 
-        if frame_context.getDisplayStyle() & omr.MFrameContext.kWireFrame:
-            draw_manager.setColor(locatordata.wire_color)
-            draw_manager.mesh(omr.MUIDrawManager.kLines, locatordata.get_line_points())
+    def shape(self):
+        return self.length, self.radius, self.subdivisions
 
-        draw_manager.endDrawable()
+    def placement(self):
+        return (self.aim_matrix,)
 
-    @classmethod
-    def creator(cls, obj):
-        return VectorHelperDrawOverride(obj)
-
-    @staticmethod
-    def _get_origin(obj_path):
-        node = obj_path.node()
-        plug = om.MPlug(node, VectorHelperNode.origin)
-        x = plug.child(0).asFloat()
-        y = plug.child(1).asFloat()
-        z = plug.child(2).asFloat()
-
-        return om.MPoint((x, y, z))
-
-    @staticmethod
-    def _get_target(obj_path):
-        node = obj_path.node()
-        plug = om.MPlug(node, VectorHelperNode.target)
-        x = plug.child(0).asFloat()
-        y = plug.child(1).asFloat()
-        z = plug.child(2).asFloat()
-
-        return om.MPoint((x, y, z))
-
-    @staticmethod
-    def _get_radius(obj_path):
-        node = obj_path.node()
-        plug = om.MPlug(node, VectorHelperNode.radius)
-        value = 1.0
-        if not plug.isNull:
-            value = plug.asMDistance().asCentimeters()
-
-        return value
-
-    @staticmethod
-    def _get_color(obj_path):
-        node = obj_path.node()
-        plug_r = om.MPlug(node, VectorHelperNode.colorR)
-        plug_g = om.MPlug(node, VectorHelperNode.colorG)
-        plug_b = om.MPlug(node, VectorHelperNode.colorB)
-        r, g, b = (1, 0, 0)
-        if not plug_r.isNull:
-            r = plug_r.asFloat()
-        if not plug_g.isNull:
-            g = plug_g.asFloat()
-        if not plug_b.isNull:
-            b = plug_b.asFloat()
-
-        return om.MColor((r, g, b))
+    def canonical_bounds(self):
+        """Return the bounds of the mesh before get_aim_transform is applied."""
+        return geometry.arrow_bounds((0, 0, 0), (0, self.length, 0), self.radius)
 
+    def selection_matrix(self):
+        return self.aim_matrix
 
-def register(plugin_fn):
-    try:
-        plugin_fn.registerNode(
-            VectorHelperNode.TYPE_NAME,
-            VectorHelperNode.TYPE_ID,
-            VectorHelperNode.creator,
-            VectorHelperNode.initialize,
-            om.MPxNode.kLocatorNode,
-            VectorHelperNode.DRAW_CLASSIFICATION,
+    def hit_test(self, origin, direction):
+        return geometry.ray_arrow(origin, direction, self.length, self.radius)
+
+    def outline(self):
+        return geometry.arrow(self.length, self.radius, OUTLINE_SUBDIVISIONS).points
+
+
+class VectorHelperDrawOverride(HelperDrawOverrideBase):
+    NAME = "VectorHelperDrawOverride"
+
+    def __init__(self, obj):
+        super(VectorHelperDrawOverride, self).__init__(
+            obj, VectorHelperNode.draw_attributes, VectorHelperInputs
         )
-    except Exception:
-        logger.error("Failed to register node: {0}".format(VectorHelperNode.TYPE_NAME))
-
-    try:
-        omr.MDrawRegistry.registerDrawOverrideCreator(
-            VectorHelperNode.DRAW_CLASSIFICATION,
-            VectorHelperNode.DRAW_REGISTRANT_ID,
-            VectorHelperDrawOverride.creator,
+        self._aim_plugs = get_plugs(
+            obj, [VectorHelperNode.aimMatrix, VectorHelperNode.length]
         )
-    except Exception:
-        logger.error(
-            "Failed to register draw override: {0}".format(
-                VectorHelperDrawOverride.NAME
-            )
+
+    def build_mesh(self, inputs, out=None):
+        return geometry.arrow(
+            inputs.length, inputs.radius, inputs.subdivisions, out=out
         )
 
+    def transform(self, obj_path, camera_path):
+        aim_matrix, _ = self._aim_plugs
+        return get_aim_transform(obj_path, aim_matrix)
 
-def deregister(plugin_fn):
-    try:
-        omr.MDrawRegistry.deregisterDrawOverrideCreator(
-            VectorHelperNode.DRAW_CLASSIFICATION, VectorHelperNode.DRAW_REGISTRANT_ID,
+
+class VectorHelperGeometryOverride(HelperGeometryOverride):
+    NAME = "VectorHelperGeometryOverride"
+
+    def __init__(self, obj):
+        super(VectorHelperGeometryOverride, self).__init__(
+            obj, VectorHelperNode.draw_attributes, VectorHelperInputs
         )
-    except Exception:
-        logger.error(
-            "Failed to deregister draw override: {0}".format(
-                VectorHelperDrawOverride.NAME
-            )
+
+    def build_mesh(self, inputs, out=None):
+        # the buffers are in object space, the aim is baked in the points
+        return geometry.arrow(
+            inputs.length,
+            inputs.radius,
+            inputs.subdivisions,
+            inputs.aim_matrix,
+            out,
         )
 
-    try:
 
-        plugin_fn.deregisterNode(VectorHelperNode.TYPE_ID)
-    except Exception:
-        logger.error(
-            "Failed to deregister node: {0}".format(VectorHelperNode.TYPE_NAME)
-        )
+def register(plugin_fn):
+    register_helper(
+        plugin_fn,
+        VectorHelperNode,
+        VectorHelperDrawOverride,
+        VectorHelperGeometryOverride,
+    )
+
+
+def deregister(plugin_fn):
+    deregister_helper(plugin_fn, VectorHelperNode, VectorHelperDrawOverride)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,201 @@
+"""Opt-in profiling of the hot path of the helpers.
+
+The methods to profile are registered with :func:`watch` but are only wrapped
+while profiling is enabled, the classes are left untouched otherwise so it
+costs nothing when off. Enable it by setting the ``MRH_PROFILE`` environment
+variable to ``1`` before loading the plugin, or from the script editor::
+
+    from mrh import profiling
+    profiling.enable()
+    # ... play the scene ...
+    profiling.dump()  # or profiling.dump("/path/to/stats.json")
+    profiling.disable()
+
+Each method of each node type keeps its call count and cumulative time, and
+its last :data:`RING_SIZE` times and vertex counts in a ring buffer from which
+the percentiles are computed.
+"""
+from __future__ import division, print_function
+
+import functools
+import json
+import os
+import threading
+import timeit
+
+import numpy as np
+
+#: Number of calls of each method kept to compute the percentiles.
+RING_SIZE = 4096
+
+enabled = False
+
+_watched = []
+_originals = {}
+_stats = {}
+_local = threading.local()
+# viewport 2.0 can call the watched methods from several threads at once
+_lock = threading.Lock()
+
+
+class Stats(object):
+    """Timings of the calls of a method of a node type.
+
+    Args:
+        size(int): number of calls kept in the ring buffer
+    """
+
+    __slots__ = ("count", "total", "vertices", "_times", "_vertex_counts")
+
+    def __init__(self, size=RING_SIZE):
+        self.count = 0
+        self.total = 0.0
+        self.vertices = 0
+        self._times = [0.0] * size
+        self._vertex_counts = [0] * size
+
+    def add(self, elapsed, vertices):
+        index = self.count % len(self._times)
+        self._times[index] = elapsed
+        self._vertex_counts[index] = vertices
+        self.count += 1
+        self.total += elapsed
+        self.vertices += vertices
+
+    def summary(self):
+        """Return the stats as a dictionary, times are in microseconds."""
+        size = min(self.count, len(self._times))
+        times = np.array(self._times[:size]) * 1e6
+        vertex_counts = np.array(self._vertex_counts[:size])
+        p50, p95, p99 = np.percentile(times, [50, 95, 99]) if size else (0, 0, 0)
+        return {
+            "count": self.count,
+            "total_us": self.total * 1e6,
+            "mean_us": self.total * 1e6 / self.count if self.count else 0.0,
+            "p50_us": float(p50),
+            "p95_us": float(p95),
+            "p99_us": float(p99),
+            "vertices": self.vertices,
+            "mean_vertices": float(vertex_counts.mean()) if size else 0.0,
+        }
+
+
+def watch(cls, name, type_name=None, vertices=None):
+    """Register a method to profile.
+
+    Args:
+        cls(type): class defining the method
+        name(str): name of the method
+        type_name(str): node type the calls are recorded under, methods
+            without one are recorded under the type of the watched method
+            they are called from
+        vertices(callable): returns the number of vertices handled by a call
+            from the instance, the arguments and the result of the call
+    """
+    entry = (cls, name, type_name, vertices)
+    if any(watched[:2] == entry[:2] for watched in _watched):
+        return
+    _watched.append(entry)
+    if enabled:
+        _wrap(*entry)
+
+
+def _wrap(cls, name, type_name, vertices):
+    if (cls, name) in _originals:
+        return
+    # None for inherited methods, the wrapper is then removed instead of reset
+    _originals[(cls, name)] = cls.__dict__.get(name)
+    function = getattr(cls, name)
+
+    @functools.wraps(function)
+    def wrapper(self, *args):
+        previous = getattr(_local, "type_name", None)
+        key = (type_name or previous, name)
+        if type_name:
+            _local.type_name = type_name
+        start = timeit.default_timer()
+        try:
+            result = function(self, *args)
+        finally:
+            elapsed = timeit.default_timer() - start
+            _local.type_name = previous
+        vertex_count = vertices(self, args, result) if vertices else 0
+        with _lock:
+            stats = _stats.get(key)
+            if stats is None:
+                stats = _stats.setdefault(key, Stats())
+            stats.add(elapsed, vertex_count)
+        return result
+
+    setattr(cls, name, wrapper)
+
+
+def enable():
+    """Wrap the watched methods to record their calls."""
+    global enabled
+    enabled = True
+    for entry in _watched:
+        _wrap(*entry)
+
+
+def disable():
+    """Restore the watched methods, the recorded stats are kept."""
+    global enabled
+    enabled = False
+    for (cls, name), function in _originals.items():
+        if function is None:
+            delattr(cls, name)
+        else:
+            setattr(cls, name, function)
+    _originals.clear()
+
+
+def reset():
+    """Forget the recorded stats."""
+    with _lock:
+        _stats.clear()
+
+
+def report():
+    """Return the recorded stats as ``{type_name: {method: stats}}``."""
+    result = {}
+    with _lock:
+        for (type_name, name), stats in sorted(_stats.items(), key=str):
+            result.setdefault(str(type_name), {})[name] = stats.summary()
+    return result
+
+
+def dump(path=None):
+    """Print the recorded stats, or write them as JSON to a file.
+
+    Args:
+        path(str): file to write the stats to, printed if None
+    """
+    stats = report()
+    if path:
+        with open(path, "w") as f:
+            json.dump(stats, f, indent=2, sort_keys=True)
+        return
+
+    line = "{:<24} {:<22} {:>8} {:>12} {:>10} {:>10} {:>10} {:>10}"
+    print(
+        line.format("type", "method", "calls", "total us", "p50", "p95", "p99", "verts")
+    )
+    for type_name, methods in sorted(stats.items()):
+        for name, summary in sorted(methods.items()):
+            print(
+                line.format(
+                    type_name,
+                    name,
+                    summary["count"],
+                    "{:.0f}".format(summary["total_us"]),
+                    "{:.1f}".format(summary["p50_us"]),
+                    "{:.1f}".format(summary["p95_us"]),
+                    "{:.1f}".format(summary["p99_us"]),
+                    "{:.0f}".format(summary["mean_vertices"]),
+                )
+            )
+
+
+if os.environ.get("MRH_PROFILE") == "1":
+    enable()